@@ -0,0 +1,37 @@
+"""Add enrolled_count to events
+
+Revision ID: 0c9f3b6d2a58
+Revises: e4a8c1f7b352
+Create Date: 2026-10-18 15:21:54.107392
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0c9f3b6d2a58"
+down_revision: Union[str, None] = "e4a8c1f7b352"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "events",
+        sa.Column("enrolled_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        "UPDATE events SET enrolled_count = enrollments.count "
+        "FROM ("
+        "SELECT event_id, count(*) AS count FROM enrollments GROUP BY event_id"
+        ") AS enrollments "
+        "WHERE events.id = enrollments.event_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("events", "enrolled_count")
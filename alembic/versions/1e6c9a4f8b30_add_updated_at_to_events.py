@@ -0,0 +1,37 @@
+"""Add updated_at to events
+
+Revision ID: 1e6c9a4f8b30
+Revises: 6f1a3c8e2d75
+Create Date: 2026-10-18 21:02:17.634190
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "1e6c9a4f8b30"
+down_revision: Union[str, None] = "6f1a3c8e2d75"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # the statement time is stable within the migration, the default is kept in the catalog
+    # and existing events take the time of the migration without a rewrite
+    op.add_column(
+        "events",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("statement_timestamp()"),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("events", "updated_at")
@@ -0,0 +1,37 @@
+"""Index events by date
+
+Revision ID: 2b8e5f1c7a94
+Revises: 9d4b7e2a6c13
+Create Date: 2026-10-18 18:52:08.613947
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2b8e5f1c7a94"
+down_revision: Union[str, None] = "9d4b7e2a6c13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_events_event_date_id",
+            "events",
+            ["event_date", "id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_events_event_date_id",
+            table_name="events",
+            postgresql_concurrently=True,
+        )
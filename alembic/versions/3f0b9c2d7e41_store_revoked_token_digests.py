@@ -0,0 +1,64 @@
+"""Store revoked token digests
+
+Revision ID: 3f0b9c2d7e41
+Revises: 4516dbd76b26
+Create Date: 2026-10-18 09:12:43.516207
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f0b9c2d7e41"
+down_revision: Union[str, None] = "4516dbd76b26"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 10_000
+
+
+def upgrade() -> None:
+    op.add_column("revoked_tokens", sa.Column("digest", sa.LargeBinary()))
+
+    # every batch commits on its own so the backfill never holds row locks on the
+    # whole table, already processed rows are skipped if the migration is re-run
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while True:
+            result = bind.execute(
+                sa.text(
+                    "UPDATE revoked_tokens SET digest = sha256(convert_to(hash, 'UTF8')) "
+                    "WHERE id IN ("
+                    "SELECT id FROM revoked_tokens WHERE digest IS NULL LIMIT :batch_size"
+                    ")"
+                ),
+                {"batch_size": BACKFILL_BATCH_SIZE},
+            )
+            if result.rowcount == 0:
+                break
+
+    op.drop_index("ix_revoked_tokens_hash", table_name="revoked_tokens")
+    op.drop_column("revoked_tokens", "hash")
+    op.alter_column("revoked_tokens", "digest", new_column_name="hash", nullable=False)
+    op.create_index(
+        op.f("ix_revoked_tokens_hash"), "revoked_tokens", ["hash"], unique=True
+    )
+
+
+def downgrade() -> None:
+    # raw tokens cannot be recovered from their digests, the hex encoded digests
+    # keep the column shape but no longer match any presented token
+    op.drop_index(op.f("ix_revoked_tokens_hash"), table_name="revoked_tokens")
+    op.alter_column(
+        "revoked_tokens",
+        "hash",
+        type_=sa.String(),
+        postgresql_using="encode(hash, 'hex')",
+    )
+    op.create_index(
+        op.f("ix_revoked_tokens_hash"), "revoked_tokens", ["hash"], unique=True
+    )
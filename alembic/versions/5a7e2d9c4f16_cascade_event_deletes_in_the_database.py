@@ -0,0 +1,45 @@
+"""Cascade event deletes in the database
+
+Revision ID: 5a7e2d9c4f16
+Revises: 0c9f3b6d2a58
+Create Date: 2026-10-18 16:47:12.530918
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5a7e2d9c4f16"
+down_revision: Union[str, None] = "0c9f3b6d2a58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FOREIGN_KEYS = (
+    ("enrollments_event_id_fkey", "enrollments", "events", "event_id"),
+    ("events_organizer_id_fkey", "events", "users", "organizer_id"),
+)
+
+
+def upgrade() -> None:
+    _replace_foreign_keys(ondelete="CASCADE")
+
+
+def downgrade() -> None:
+    _replace_foreign_keys(ondelete="NO ACTION")
+
+
+def _replace_foreign_keys(ondelete: str) -> None:
+    # each constraint is swapped in a single statement as NOT VALID, which only
+    # needs a short lock, and validated on its own so existing rows are checked
+    # without blocking writes
+    with op.get_context().autocommit_block():
+        for name, source, referent, column in FOREIGN_KEYS:
+            op.execute(
+                f"ALTER TABLE {source} DROP CONSTRAINT {name}, "
+                f"ADD CONSTRAINT {name} FOREIGN KEY ({column}) "
+                f"REFERENCES {referent} (id) ON DELETE {ondelete} NOT VALID"
+            )
+            op.execute(f"ALTER TABLE {source} VALIDATE CONSTRAINT {name}")
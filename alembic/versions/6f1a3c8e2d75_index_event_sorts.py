@@ -0,0 +1,36 @@
+"""Index event sorts
+
+Revision ID: 6f1a3c8e2d75
+Revises: 2b8e5f1c7a94
+Create Date: 2026-10-18 20:14:41.305528
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6f1a3c8e2d75"
+down_revision: Union[str, None] = "2b8e5f1c7a94"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES: tuple[tuple[str, list[str | sa.TextClause]], ...] = (
+    ("ix_events_title_id", ["title", "id"]),
+    ("ix_events_sort_price_id", [sa.text("coalesce(price, 0)"), "id"]),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(name, "events", columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(name, table_name="events", postgresql_concurrently=True)
@@ -0,0 +1,50 @@
+"""Add xact_id to revoked_tokens
+
+Revision ID: 7c3d8f1a5e62
+Revises: 1e6c9a4f8b30
+Create Date: 2026-10-19 09:12:44.507318
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7c3d8f1a5e62"
+down_revision: Union[str, None] = "1e6c9a4f8b30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # a constant default is stored without a table rewrite, tokens revoked so far
+    # are loaded by the first rebuild of every cache anyway
+    op.add_column(
+        "revoked_tokens",
+        sa.Column("xact_id", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.alter_column(
+        "revoked_tokens",
+        "xact_id",
+        server_default=sa.text("pg_current_xact_id()::text::bigint"),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f("ix_revoked_tokens_xact_id"),
+            "revoked_tokens",
+            ["xact_id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f("ix_revoked_tokens_xact_id"),
+            table_name="revoked_tokens",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("revoked_tokens", "xact_id")
@@ -0,0 +1,46 @@
+"""Add expires_at to revoked tokens
+
+Revision ID: 8c5e1d4a9b27
+Revises: 3f0b9c2d7e41
+Create Date: 2026-10-18 10:03:18.204951
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.auth.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8c5e1d4a9b27"
+down_revision: Union[str, None] = "3f0b9c2d7e41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # tokens revoked so far expire at the latest one refresh token lifetime from
+    # now, now() is stable so Postgres stores the default without a table rewrite
+    op.add_column(
+        "revoked_tokens",
+        sa.Column(
+            "expires_at",
+            sa.DateTime(),
+            nullable=False,
+            server_default=sa.text(
+                f"now() + interval '{settings.REFRESH_TOKEN_EXPIRE_MINUTES} minutes'"
+            ),
+        ),
+    )
+    op.alter_column("revoked_tokens", "expires_at", server_default=None)
+    op.create_index(
+        op.f("ix_revoked_tokens_expires_at"), "revoked_tokens", ["expires_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_revoked_tokens_expires_at"), table_name="revoked_tokens")
+    op.drop_column("revoked_tokens", "expires_at")
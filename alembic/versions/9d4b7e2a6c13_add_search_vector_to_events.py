@@ -0,0 +1,56 @@
+"""Add search_vector to events
+
+Revision ID: 9d4b7e2a6c13
+Revises: 5a7e2d9c4f16
+Create Date: 2026-10-18 17:36:12.480215
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4b7e2a6c13"
+down_revision: Union[str, None] = "5a7e2d9c4f16"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # adding a stored generated column rewrites the table under an exclusive
+    # lock, the index is then built without blocking writes
+    op.add_column(
+        "events",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', title), 'A') || "
+                "setweight(to_tsvector('english', description), 'B')",
+                persisted=True,
+            ),
+            nullable=False,
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_events_search_vector",
+            "events",
+            ["search_vector"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_events_search_vector",
+            table_name="events",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("events", "search_vector")
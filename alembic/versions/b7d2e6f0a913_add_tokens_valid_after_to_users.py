@@ -0,0 +1,27 @@
+"""Add tokens_valid_after to users
+
+Revision ID: b7d2e6f0a913
+Revises: 8c5e1d4a9b27
+Create Date: 2026-10-18 11:26:09.318452
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d2e6f0a913"
+down_revision: Union[str, None] = "8c5e1d4a9b27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("tokens_valid_after", sa.DateTime()))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "tokens_valid_after")
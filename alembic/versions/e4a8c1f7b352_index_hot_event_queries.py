@@ -0,0 +1,39 @@
+"""Index hot event queries
+
+Revision ID: e4a8c1f7b352
+Revises: b7d2e6f0a913
+Create Date: 2026-10-18 14:02:37.841266
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a8c1f7b352"
+down_revision: Union[str, None] = "b7d2e6f0a913"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ("ix_events_organizer_id_id", "events", ["organizer_id", "id"]),
+    ("ix_events_price", "events", ["price"]),
+    ("ix_enrollments_event_id", "enrollments", ["event_id"]),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps the tables writable while the indexes are built, it
+    # cannot run inside a transaction, an index left invalid by a failed build
+    # has to be dropped before re-running the migration
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,38 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.dependencies import get_async_db
+from .caches import principal_cache, revocation_cache
+from .config import settings
+from .dependencies import (
+    authentication_timer,
+    authorize_principal,
+    cache_principal,
+    principal_query,
+    revoked_token_query,
+    verify_access_token,
+)
+from .exceptions import InvalidTokenException
+from .schemas import Principal
+
+
+async def authenticate_user_from_token(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(settings.OAUTH2_SCHEME),
+) -> Principal:
+    digest, user_id, payload = verify_access_token(token)
+
+    with authentication_timer.measure("revocation"):
+        if revocation_cache.might_be_revoked(digest):
+            if await db.scalar(revoked_token_query(digest)) is not None:
+                raise InvalidTokenException()
+
+    with authentication_timer.measure("principal"):
+        principal = principal_cache.get(user_id)
+
+        if principal is None:
+            user = (await db.execute(principal_query(user_id))).one_or_none()
+            principal = cache_principal(user_id, user)
+
+    return authorize_principal(payload, principal)
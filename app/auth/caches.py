@@ -0,0 +1,222 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, TypeVar
+
+from sqlalchemy import BigInteger, Select, event, literal_column, select
+from sqlalchemy.orm import Session
+
+from app.metrics.services import register_metrics
+from app.users.models import User
+from .config import settings
+from .models import RevokedToken
+from .schemas import Principal, RepresentPayload
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# every transaction still running when a snapshot is taken has an id at or above
+# the snapshot's xmin, rows reloaded from there on cover the commits that land
+# after a sync however long ago they were inserted, re-adding a key is a no-op
+SNAPSHOT_XMIN: Select[tuple[int]] = select(
+    literal_column("pg_snapshot_xmin(pg_current_snapshot())::text::bigint", BigInteger)
+)
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, false_positive_rate: float):
+        self.capacity = capacity
+        self.size = max(
+            8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray(math.ceil(self.size / 8))
+
+    def add(self, item: bytes) -> None:
+        positions = self._positions(item)
+        if self._contains(positions):
+            return
+
+        for position in positions:
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: bytes) -> bool:
+        return self._contains(self._positions(item))
+
+    def _contains(self, positions: list[int]) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7)) for position in positions
+        )
+
+    def _positions(self, item: bytes) -> list[int]:
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+
+class RevocationCache:
+    def __init__(
+        self,
+        capacity: int,
+        max_capacity: int,
+        false_positive_rate: float,
+        rebuild_seconds: int,
+    ):
+        self.capacity = capacity
+        self.max_capacity = max(capacity, max_capacity)
+        self.false_positive_rate = false_positive_rate
+        self.rebuild_seconds = rebuild_seconds
+        self._lock = threading.Lock()
+        self.clear()
+
+    @property
+    def loaded(self) -> bool:
+        return self._rebuilt_at is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._filter = self._new_filter(self.capacity)
+            self._pending: list[bytes] | None = None
+            self._xmin = 0
+            self._rebuilt_at: float | None = None
+
+    def might_be_revoked(self, key: bytes) -> bool:
+        return not self.loaded or key in self._filter
+
+    def add(self, key: bytes) -> None:
+        with self._lock:
+            self._filter.add(key)
+            if self._pending is not None:
+                self._pending.append(key)
+
+    def sync(self, db: Session) -> None:
+        rebuild = (
+            self._rebuilt_at is None
+            or time.monotonic() - self._rebuilt_at >= self.rebuild_seconds
+            or (
+                self._filter.count >= self._filter.capacity
+                and self._filter.capacity < self.max_capacity
+            )
+        )
+
+        if rebuild:
+            self._rebuild(db)
+        else:
+            self._load_since(db, self._xmin)
+
+    def _rebuild(self, db: Session) -> None:
+        with self._lock:
+            self._pending = []
+
+        rebuilt_at = time.monotonic()
+        # a filter that filled up is rebuilt with room to spare, otherwise every
+        # resync after it would rebuild it again, one at its maximum size stays
+        # there and only gets more false positives, which the database answers
+        bloom_filter = self._new_filter(
+            min(self.max_capacity, max(self.capacity, 2 * self._filter.count))
+        )
+        # read before the rows so that anything committed after them is reloaded
+        xmin = db.execute(SNAPSHOT_XMIN).scalar_one()
+        rows = db.execute(select(RevokedToken.hash)).yield_per(10_000)
+        for (digest,) in rows:
+            bloom_filter.add(digest)
+
+        with self._lock:
+            for key in self._pending or []:
+                bloom_filter.add(key)
+            self._filter = bloom_filter
+            self._pending = None
+            self._xmin = xmin
+            self._rebuilt_at = rebuilt_at
+
+    def _load_since(self, db: Session, xmin: int) -> None:
+        next_xmin = db.execute(SNAPSHOT_XMIN).scalar_one()
+        rows = db.execute(
+            select(RevokedToken.hash).where(RevokedToken.xact_id >= xmin)
+        ).yield_per(10_000)
+        for (digest,) in rows:
+            self.add(digest)
+        self._xmin = next_xmin
+
+    def _new_filter(self, capacity: int) -> BloomFilter:
+        return BloomFilter(capacity, self.false_positive_rate)
+
+
+class TTLCache(Generic[K, V]):
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._items: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._items[key]
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: K, value: V, ttl_seconds: float | None = None) -> None:
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._items[key] = (time.monotonic() + ttl_seconds, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def metrics(self) -> dict[str, Any]:
+        return {"size": len(self._items), "hits": self.hits, "misses": self.misses}
+
+
+revocation_cache = RevocationCache(
+    capacity=settings.REVOCATION_CACHE_CAPACITY,
+    max_capacity=settings.REVOCATION_CACHE_MAX_CAPACITY,
+    false_positive_rate=settings.REVOCATION_CACHE_FALSE_POSITIVE_RATE,
+    rebuild_seconds=settings.REVOCATION_CACHE_REBUILD_SECONDS,
+)
+
+principal_cache: TTLCache[int, Principal] = TTLCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+# verified access token payloads keyed by token digest, every entry is stored with
+# the token's remaining lifetime as its ttl
+payload_cache: TTLCache[bytes, RepresentPayload] = TTLCache(
+    max_size=settings.TOKEN_PAYLOAD_CACHE_MAX_SIZE,
+    ttl_seconds=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+register_metrics("principal_cache", principal_cache.metrics)
+register_metrics("token_payload_cache", payload_cache.metrics)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def invalidate_principal(_mapper: Any, _connection: Any, user: User) -> None:
+    principal_cache.invalidate(user.id)
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from fastapi.security import OAuth2PasswordBearer
 
@@ -14,6 +16,23 @@ class Settings(BaseSettings):
     AUTH_TOKEN_URL: str = "/auth/token"
     OAUTH2_SCHEME: OAuth2PasswordBearer = OAuth2PasswordBearer(tokenUrl=AUTH_TOKEN_URL)
     PASSWORD_CONTEXT: CryptContext = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    PASSWORD_HASHER_WORKERS: int = 2
+    PASSWORD_HASHER_MAX_QUEUE: int = 64
+    PASSWORD_HASHER_EXECUTOR: Literal["process", "thread"] = "process"
+    REVOCATION_CACHE_CAPACITY: int = 1_000_000
+    # the filter grows up to this many keys, about 14 MB at the default rate,
+    # past it the false positive rate rises and more lookups reach the database
+    REVOCATION_CACHE_MAX_CAPACITY: int = 8_000_000
+    REVOCATION_CACHE_FALSE_POSITIVE_RATE: float = 0.001
+    REVOCATION_CACHE_RESYNC_SECONDS: int = 30
+    REVOCATION_CACHE_REBUILD_SECONDS: int = 60 * 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10_000
+    # cached principals carry the sessions watermark, this is also how long
+    # workers other than the revoking one keep accepting revoked sessions
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    TOKEN_PAYLOAD_CACHE_MAX_SIZE: int = 10_000
+    REVOKED_TOKENS_PURGE_SECONDS: int = 60 * 10
+    REVOKED_TOKENS_PURGE_BATCH_SIZE: int = 5_000
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -9,23 +9,43 @@ from .schemas import (
     DataFromRefreshToken,
     RefreshTokenParams,
     RepresentPayload,
+    Principal,
 )
 from jose import jwt, JWTError
 from .config import settings
 from datetime import datetime
 from .models import RevokedToken
+from .caches import payload_cache, principal_cache, revocation_cache
+from .utils import token_digest
+from .hashers import password_hasher
+from app.metrics.collectors import StageTimer
+from app.metrics.services import register_metrics
 
-from sqlalchemy import select
+from sqlalchemy import Row, Select, select
 
+authentication_timer = StageTimer()
+register_metrics("authentication", authentication_timer.snapshot)
 
-def get_user_id_from_credentials(
+
+def get_user_from_credentials(
     *,
     params: OAuth2PasswordRequestForm = Depends(OAuth2PasswordRequestForm),
     db: Session = Depends(get_db),
-) -> int:
+) -> User | None:
     user = db.scalar(select(User).where(User.username == params.username))
 
-    if user and settings.PASSWORD_CONTEXT.verify(params.password, user.hashed_password):
+    # hand the connection back to the pool before queueing for the password hasher
+    db.close()
+
+    return user
+
+
+async def get_user_id_from_credentials(
+    *,
+    params: OAuth2PasswordRequestForm = Depends(OAuth2PasswordRequestForm),
+    user: User | None = Depends(get_user_from_credentials),
+) -> int:
+    if user and await password_hasher.verify(params.password, user.hashed_password):
         return user.id
 
     raise InvalidCredentialsException()
@@ -33,40 +53,92 @@ def get_user_id_from_credentials(
 
 def authenticate_user_from_token(
     *, db: Session = Depends(get_db), token: str = Depends(settings.OAUTH2_SCHEME)
-) -> User:
+) -> Principal:
+    # checks run from the cheapest to the most expensive one, so garbage and
+    # expired tokens are rejected before any database round trip
+    digest, user_id, payload = verify_access_token(token)
+
+    with authentication_timer.measure("revocation"):
+        if revocation_cache.might_be_revoked(digest):
+            if db.scalar(revoked_token_query(digest)) is not None:
+                raise InvalidTokenException()
+
+    with authentication_timer.measure("principal"):
+        principal = principal_cache.get(user_id)
+
+        if principal is None:
+            user = db.execute(principal_query(user_id)).one_or_none()
+            principal = cache_principal(user_id, user)
+
+    return authorize_principal(payload, principal)
+
+
+def verify_access_token(token: str) -> tuple[bytes, int, RepresentPayload]:
+    ### HELPER FUNCTIONS ###
+    def _decode(digest: bytes) -> RepresentPayload:
+        payload = payload_cache.get(digest)
+
+        if payload is None:
+            payload = RepresentPayload(
+                **jwt.decode(
+                    token,
+                    settings.JWT_SECRET_KEY,
+                    algorithms=[settings.ALGORITHM],
+                )
+            )
+            payload_cache.set(digest, payload, __seconds_until_expiry(payload))
+
+        return payload
+
+    ### MAIN LOGIC ###
     try:
-        if __is_revoked(token, db=db):
-            raise InvalidTokenException()
+        digest = token_digest(token)
 
-        payload = RepresentPayload(
-            **jwt.decode(
-                token,
-                settings.JWT_SECRET_KEY,
-                algorithms=[settings.ALGORITHM],
-            )
-        )
+        with authentication_timer.measure("decode"):
+            payload = _decode(digest)
+            user_id = int(payload.sub)
 
-        if __is_expired(payload):
-            raise InvalidTokenException()
+        with authentication_timer.measure("expiry"):
+            if __is_expired(payload):
+                raise InvalidTokenException()
 
-        user = db.scalar(select(User).where(User.id == int(payload.sub)))
+    except (JWTError, ValidationError, ValueError):
+        raise InvalidTokenException()
 
-        if user is None:
-            raise InvalidTokenException()
+    return digest, user_id, payload
+
+
+def revoked_token_query(digest: bytes) -> Select:
+    return select(RevokedToken.id).where(RevokedToken.hash == digest)
 
-        return user
 
-    except (JWTError, ValidationError):
+def principal_query(user_id: int) -> Select:
+    return select(User.id, User.role, User.tokens_valid_after).where(User.id == user_id)
+
+
+def cache_principal(user_id: int, user: Row | None) -> Principal:
+    if user is None:
         raise InvalidTokenException()
 
+    principal = Principal.model_validate(user)
+    principal_cache.set(user_id, principal)
+
+    return principal
+
+
+def authorize_principal(payload: RepresentPayload, principal: Principal) -> Principal:
+    # the watermark travels with the cached principal, so checking it costs no
+    # extra query
+    if __is_issued_before(payload, principal.tokens_valid_after):
+        raise InvalidTokenException()
+
+    return principal
+
 
 def get_payload_from_refresh_token(
     params: RefreshTokenParams, *, db: Session = Depends(get_db)
 ) -> DataFromRefreshToken:
     try:
-        if __is_revoked(params.refresh_token, db):
-            raise InvalidTokenException()
-
         refresh_payload = RepresentPayload(
             **jwt.decode(
                 params.refresh_token,
@@ -78,9 +150,6 @@ def get_payload_from_refresh_token(
         if __is_expired(refresh_payload):
             raise InvalidTokenException()
 
-        if __is_revoked(refresh_payload.sub, db):
-            raise InvalidTokenException()
-
         access_payload = RepresentPayload(
             **jwt.decode(
                 refresh_payload.sub,
@@ -88,7 +157,30 @@ def get_payload_from_refresh_token(
                 algorithms=[settings.ALGORITHM],
             )
         )
-    except (JWTError, ValidationError):
+
+        # the refresh token and the access token it embeds share a single lookup,
+        # which also reads the sessions watermark of their user
+        digests = [
+            token_digest(params.refresh_token),
+            token_digest(refresh_payload.sub),
+        ]
+        user = db.execute(
+            select(
+                User.tokens_valid_after,
+                select(RevokedToken.id)
+                .where(RevokedToken.hash.in_(digests))
+                .exists()
+                .label("is_revoked"),
+            ).where(User.id == int(access_payload.sub))
+        ).one_or_none()
+
+        if (
+            user is None
+            or user.is_revoked
+            or __is_issued_before(refresh_payload, user.tokens_valid_after)
+        ):
+            raise InvalidTokenException()
+    except (JWTError, ValidationError, ValueError):
         raise InvalidTokenException()
 
     return DataFromRefreshToken(
@@ -101,9 +193,21 @@ def get_payload_from_refresh_token(
 ### COMMON HELPER FUNCTIONS ###
 
 
-def __is_revoked(token: str, db: Session) -> bool:
-    return db.scalar(select(RevokedToken).where(RevokedToken.hash == token)) is not None
-
-
 def __is_expired(payload: RepresentPayload) -> bool:
     return payload.expires_at.replace(tzinfo=None) < datetime.now()
+
+
+def __is_issued_before(
+    payload: RepresentPayload, tokens_valid_after: datetime | None
+) -> bool:
+    if tokens_valid_after is None:
+        return False
+
+    if payload.issued_at is None:
+        return True
+
+    return payload.issued_at.astimezone().replace(tzinfo=None) < tokens_valid_after
+
+
+def __seconds_until_expiry(payload: RepresentPayload) -> float:
+    return (payload.expires_at.replace(tzinfo=None) - datetime.now()).total_seconds()
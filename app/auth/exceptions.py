@@ -13,3 +13,11 @@ class InvalidTokenException(HTTPException):
         status_code = status.HTTP_401_UNAUTHORIZED
         detail = "Token invalid, expired or revoked."
         super().__init__(status_code=status_code, detail=detail)
+
+
+class PasswordHasherOverloadedException(HTTPException):
+    def __init__(self):
+        status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        detail = "Too many authentication requests, try again later."
+        headers = {"Retry-After": "1"}
+        super().__init__(status_code=status_code, detail=detail, headers=headers)
@@ -0,0 +1,86 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.metrics.collectors import Histogram
+from app.metrics.services import register_metrics
+from .config import settings
+from .exceptions import PasswordHasherOverloadedException
+
+
+def _hash(password: str) -> str:
+    return settings.PASSWORD_CONTEXT.hash(password)
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return settings.PASSWORD_CONTEXT.verify(password, hashed_password)
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, max_queue: int, executor: str):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.executor = executor
+        self.latency = Histogram()
+        self.rejected = 0
+        self._in_flight = 0
+        self._executor: Executor | None = None
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._submit(_verify, password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "in_flight": self._in_flight,
+            "queue_depth": max(0, self._in_flight - self.workers),
+            "rejected": self.rejected,
+            "latency_seconds": self.latency.snapshot(),
+        }
+
+    async def _submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        # only ever touched from the event loop, so the counter needs no lock
+        if self._in_flight >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise PasswordHasherOverloadedException()
+
+        self._in_flight += 1
+        started_at = time.perf_counter()
+        try:
+            return await asyncio.wrap_future(self._get_executor().submit(fn, *args))
+        finally:
+            self._in_flight -= 1
+            self.latency.observe(time.perf_counter() - started_at)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hasher"
+                )
+
+        return self._executor
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASHER_WORKERS,
+    max_queue=settings.PASSWORD_HASHER_MAX_QUEUE,
+    executor=settings.PASSWORD_HASHER_EXECUTOR,
+)
+
+register_metrics("password_hasher", password_hasher.metrics)
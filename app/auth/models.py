@@ -2,7 +2,7 @@ from datetime import datetime
 
 from app.database.model import Base
 
-from sqlalchemy import Integer, DateTime, String
+from sqlalchemy import BigInteger, Integer, DateTime, LargeBinary, text
 from sqlalchemy.orm import mapped_column, Mapped
 
 
@@ -10,7 +10,18 @@ class RevokedToken(Base):
     __tablename__ = "revoked_tokens"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    hash: Mapped[str] = mapped_column(String, nullable=False, index=True, unique=True)
+    hash: Mapped[bytes] = mapped_column(
+        LargeBinary(32), nullable=False, index=True, unique=True
+    )
     revoked_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.now(), nullable=False
+        DateTime, default=datetime.now, nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    # id of the inserting transaction, ids are handed out when a transaction
+    # starts writing so they bound the rows a later commit can still add
+    xact_id: Mapped[int] = mapped_column(
+        BigInteger,
+        server_default=text("pg_current_xact_id()::text::bigint"),
+        nullable=False,
+        index=True,
     )
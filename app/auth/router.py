@@ -1,35 +1,73 @@
 from fastapi import APIRouter, Depends, status, Response
 from .schemas import RepresentJWT
-from .services import generate_jtw_data, refresh_token, revoke_token
+from .services import (
+    generate_jtw_data,
+    refresh_token,
+    revoke_current_user_sessions,
+    revoke_many_tokens,
+    revoke_token,
+)
 from .config import settings
+from app.database.instrumentation import query_budget
+from app.responses import RepresentationAdapter
 
 router = APIRouter(prefix=settings.AUTH_TOKEN_URL, tags=["Auth"])
 
+jwt_representation = RepresentationAdapter(RepresentJWT)
+
 
 @router.post(
     "",
     response_model=RepresentJWT,
     status_code=status.HTTP_201_CREATED,
     summary="Create access and refresh tokens",
+    dependencies=[Depends(query_budget(1))],
 )
 async def create(jwt_data: RepresentJWT = Depends(generate_jtw_data)):
-    return jwt_data
+    return jwt_representation.response(jwt_data, status.HTTP_201_CREATED)
 
 
 @router.post(
     "/revoke",
     status_code=status.HTTP_200_OK,
     summary="Revoke access and refresh tokens",
+    dependencies=[Depends(query_budget(1))],
 )
 async def revoke(_: None = Depends(revoke_token)):
     return Response(status_code=status.HTTP_200_OK)
 
 
+@router.post(
+    "/revoke/bulk",
+    status_code=status.HTTP_200_OK,
+    summary="Revoke many access and refresh tokens at once",
+    dependencies=[Depends(query_budget(1))],
+)
+async def revoke_bulk(_: None = Depends(revoke_many_tokens)):
+    return Response(status_code=status.HTTP_200_OK)
+
+
+@router.post(
+    "/revoke/sessions",
+    status_code=status.HTTP_200_OK,
+    summary="Revoke every token of the current user issued before a moment",
+    description=(
+        "Takes effect at once on the worker handling the request, other workers "
+        f"reject the revoked sessions within {settings.PRINCIPAL_CACHE_TTL_SECONDS} "
+        "seconds."
+    ),
+    dependencies=[Depends(query_budget(3))],
+)
+async def revoke_sessions(_: None = Depends(revoke_current_user_sessions)):
+    return Response(status_code=status.HTTP_200_OK)
+
+
 @router.post(
     "/refresh",
     response_model=RepresentJWT,
     status_code=status.HTTP_201_CREATED,
     summary="Refresh access token",
+    dependencies=[Depends(query_budget(2))],
 )
 async def refresh(new_jwt_data: RepresentJWT = Depends(refresh_token)):
-    return new_jwt_data
+    return jwt_representation.response(new_jwt_data, status.HTTP_201_CREATED)
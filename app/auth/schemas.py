@@ -1,10 +1,26 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
+from typing import Optional
+from app.users.enums import UserRole
+
+
+REVOKE_TOKENS_MAX_BATCH_SIZE = 1000
 
 
 class RepresentPayload(BaseModel):
     expires_at: datetime
     sub: str
+    issued_at: Optional[datetime] = None
+
+
+class Principal(BaseModel):
+    id: int
+    role: UserRole
+    tokens_valid_after: Optional[datetime] = None
+
+    class Config:
+        frozen = True
+        from_attributes = True
 
 
 class RepresentJWT(BaseModel):
@@ -18,6 +34,14 @@ class RevokeTokenParams(BaseModel):
     token: str
 
 
+class RevokeTokensParams(BaseModel):
+    tokens: list[str] = Field(min_length=1, max_length=REVOKE_TOKENS_MAX_BATCH_SIZE)
+
+
+class RevokeSessionsParams(BaseModel):
+    issued_before: Optional[datetime] = None
+
+
 class RefreshTokenParams(BaseModel):
     refresh_token: str
 
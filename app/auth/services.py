@@ -5,16 +5,24 @@ from .schemas import (
     RepresentPayload,
     DataFromRefreshToken,
     RevokeTokenParams,
+    RevokeTokensParams,
+    RevokeSessionsParams,
+    Principal,
 )
-from .dependencies import get_user_id_from_credentials
+from .dependencies import authenticate_user_from_token, get_user_id_from_credentials
 from .models import RevokedToken
+from .caches import principal_cache, revocation_cache
+from .exceptions import InvalidTokenException
+from .utils import token_digest, token_expires_at
 from .config import settings
 from datetime import datetime, timedelta
 from jose import jwt
-from .validators import validate_token_revoke
 
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from app.database.dependencies import get_db
+from app.users.models import User
 
 from .dependencies import get_payload_from_refresh_token
 
@@ -24,18 +32,27 @@ def generate_jtw_data(
 ) -> RepresentJWT:
     ### HELPER FUNCTIONS ###
     def _create_payload(subject: int | str, timedelta_minutes: int) -> RepresentPayload:
-        expires_at = datetime.now() + timedelta(minutes=timedelta_minutes)
-        payload = {"expires_at": expires_at, "sub": str(subject)}
+        expires_at = issued_at + timedelta(minutes=timedelta_minutes)
+        payload = {
+            "expires_at": expires_at,
+            "sub": str(subject),
+            "issued_at": issued_at,
+        }
         return RepresentPayload(**payload)
 
     def _encode_payload(payload: RepresentPayload, key: str) -> str:
         return jwt.encode(
-            {"expires_at": str(payload.expires_at.timestamp()), "sub": payload.sub},
+            {
+                "expires_at": str(payload.expires_at.timestamp()),
+                "sub": payload.sub,
+                "issued_at": str(issued_at.timestamp()),
+            },
             key,
             algorithm=settings.ALGORITHM,
         )
 
     ### MAIN LOGIC ###
+    issued_at = datetime.now()
     access_payload = _create_payload(user_id, settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = _encode_payload(access_payload, settings.JWT_SECRET_KEY)
     refresh_payload = _create_payload(
@@ -57,15 +74,18 @@ def refresh_token(
         get_payload_from_refresh_token
     ),
 ) -> RepresentJWT:
-    ### HELPER FUNCTIONS ###
-    def _revoke(token: str) -> None:
-        return revoke_token(RevokeTokenParams(token=token), db=db, commit_session=False)
+    revoked = revoke_tokens(
+        [
+            data_from_refresh_token.refresh_payload.sub,  # old access token
+            data_from_refresh_token.received_refresh_token,  # used refresh token
+        ],
+        db=db,
+    )
+    # a concurrent refresh with the same token passed the revocation check as
+    # well, only the request whose insert revoked the refresh token rotates it
+    if token_digest(data_from_refresh_token.received_refresh_token) not in revoked:
+        raise InvalidTokenException()
 
-    ### MAIN LOGIC ###
-    _revoke(data_from_refresh_token.refresh_payload.sub)  # revokes old access token
-    _revoke(
-        data_from_refresh_token.received_refresh_token
-    )  # revokes used refresh token
     new_tokens = generate_jtw_data(
         user_id=int(data_from_refresh_token.access_payload.sub)
     )
@@ -73,15 +93,77 @@ def refresh_token(
     return new_tokens
 
 
-@validate_token_revoke
 def revoke_token(
     params: RevokeTokenParams,
     *,
     db: Session = Depends(get_db),
     commit_session: bool = True,
 ) -> None:
-    revoked_token = RevokedToken(hash=params.token)
-    db.add(revoked_token)
+    revoke_tokens([params.token], db=db)
     if commit_session:
         db.commit()
     return None
+
+
+def revoke_many_tokens(
+    params: RevokeTokensParams, *, db: Session = Depends(get_db)
+) -> None:
+    revoke_tokens(params.tokens, db=db)
+    db.commit()
+    return None
+
+
+def revoke_current_user_sessions(
+    params: RevokeSessionsParams,
+    *,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(authenticate_user_from_token),
+) -> None:
+    revoke_user_sessions([current_user.id], db=db, issued_before=params.issued_before)
+    db.commit()
+    return None
+
+
+def revoke_user_sessions(
+    user_ids: list[int], *, db: Session, issued_before: datetime | None = None
+) -> None:
+    # a watermark in the future would also reject tokens issued later on, and
+    # GREATEST ignores NULL so the watermark only ever moves forward
+    now = datetime.now()
+    watermark = (
+        min(issued_before.astimezone().replace(tzinfo=None), now)
+        if issued_before
+        else now
+    )
+    db.execute(
+        update(User)
+        .where(User.id.in_(user_ids))
+        .values(tokens_valid_after=func.greatest(User.tokens_valid_after, watermark)),
+        execution_options={"synchronize_session": False},
+    )
+    # only this worker's cache is invalidated, the others read the new watermark
+    # once their cached principal expires after PRINCIPAL_CACHE_TTL_SECONDS
+    for user_id in user_ids:
+        principal_cache.invalidate(user_id)
+
+
+def revoke_tokens(tokens: list[str], *, db: Session) -> set[bytes]:
+    # already revoked tokens are skipped by the unique hash index, so no
+    # existence check is needed before the insert, the digests it returns are
+    # the ones revoked by this call
+    digests = [token_digest(token) for token in tokens]
+    revoked = db.scalars(
+        insert(RevokedToken)
+        .values(
+            [
+                {"hash": digest, "expires_at": token_expires_at(token)}
+                for digest, token in zip(digests, tokens)
+            ]
+        )
+        .on_conflict_do_nothing(index_elements=[RevokedToken.hash])
+        .returning(RevokedToken.hash)
+    )
+    for digest in digests:
+        revocation_cache.add(digest)
+
+    return set(revoked)
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Callable, cast
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import CursorResult, delete, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.database.connection import SessionLocal
+from .caches import revocation_cache
+from .config import settings
+from .models import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+def purge_expired_revoked_tokens(
+    db: Session, *, batch_size: int = settings.REVOKED_TOKENS_PURGE_BATCH_SIZE
+) -> int:
+    purged = 0
+
+    while True:
+        # SKIP LOCKED lets several workers purge at the same time without
+        # waiting on each other's batches
+        expired_ids = (
+            select(RevokedToken.id)
+            .where(RevokedToken.expires_at < datetime.now())
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = db.execute(
+            delete(RevokedToken).where(RevokedToken.id.in_(expired_ids)),
+            execution_options={"synchronize_session": False},
+        )
+        deleted = cast(CursorResult, result).rowcount
+        db.commit()
+
+        purged += deleted
+        if deleted < batch_size:
+            return purged
+
+
+def sync_revocation_cache() -> None:
+    try:
+        with SessionLocal() as db:
+            revocation_cache.sync(db)
+    except SQLAlchemyError:
+        logger.exception("Revoked tokens cache sync failed")
+
+
+def purge_revoked_tokens() -> None:
+    try:
+        with SessionLocal() as db:
+            purged = purge_expired_revoked_tokens(db)
+        logger.info("Purged %s expired revoked tokens", purged)
+    except SQLAlchemyError:
+        logger.exception("Revoked tokens purge failed")
+
+
+@asynccontextmanager
+async def auth_background_tasks() -> AsyncIterator[None]:
+    ### HELPER FUNCTIONS ###
+    async def _run_periodically(fn: Callable[[], None], seconds: int) -> None:
+        while True:
+            await asyncio.sleep(seconds)
+            await run_in_threadpool(fn)
+
+    ### MAIN LOGIC ###
+    await run_in_threadpool(sync_revocation_cache)
+    tasks = [
+        asyncio.create_task(
+            _run_periodically(
+                sync_revocation_cache, settings.REVOCATION_CACHE_RESYNC_SECONDS
+            )
+        ),
+        asyncio.create_task(
+            _run_periodically(
+                purge_revoked_tokens, settings.REVOKED_TOKENS_PURGE_SECONDS
+            )
+        ),
+    ]
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+if __name__ == "__main__":
+    with SessionLocal() as db:
+        print(f"Purged {purge_expired_revoked_tokens(db)} expired revoked tokens")
@@ -0,0 +1,22 @@
+import hashlib
+from datetime import datetime, timedelta
+
+from jose import JWTError, jwt
+from pydantic import ValidationError
+
+from .config import settings
+from .schemas import RepresentPayload
+
+
+def token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def token_expires_at(token: str) -> datetime:
+    # the signature is irrelevant here, a token only authenticates when its
+    # signature matches exactly these claims, so they bound its lifetime
+    try:
+        payload = RepresentPayload(**jwt.get_unverified_claims(token))
+        return payload.expires_at.replace(tzinfo=None)
+    except (JWTError, ValidationError):
+        return datetime.now() + timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
@@ -1,6 +1,11 @@
-from sqlalchemy import create_engine
+from itertools import cycle
+
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from app.metrics.services import register_metrics
 from .config import settings
+from .pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool, pool_metrics
 
 DATABASE_URL = "postgresql+psycopg2://{user}:{password}@{host}:{port}/{name}".format(
     user=settings.DATABASE_USER,
@@ -9,6 +14,76 @@ DATABASE_URL = "postgresql+psycopg2://{user}:{password}@{host}:{port}/{name}".fo
     port=settings.DATABASE_PORT,
     name=settings.DATABASE_NAME,
 )
+ASYNC_DATABASE_URL = DATABASE_URL.replace("+psycopg2", "+asyncpg", 1)
+
+POOL_OPTIONS = {
+    "pool_size": settings.DATABASE_POOL_SIZE,
+    "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+    "pool_timeout": settings.DATABASE_POOL_TIMEOUT_SECONDS,
+    "pool_recycle": settings.DATABASE_POOL_RECYCLE_SECONDS,
+    "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+}
 
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, poolclass=InstrumentedQueuePool, **POOL_OPTIONS)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, poolclass=InstrumentedAsyncAdaptedQueuePool, **POOL_OPTIONS
+)
+AsyncSessionLocal = async_sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=async_engine
+)
+
+read_engines = [
+    create_engine(
+        make_url(url).set(drivername="postgresql+psycopg2"),
+        poolclass=InstrumentedQueuePool,
+        connect_args={
+            "connect_timeout": settings.DATABASE_REPLICA_CONNECT_TIMEOUT_SECONDS
+        },
+        **POOL_OPTIONS,
+    )
+    for url in settings.DATABASE_REPLICA_URLS
+]
+async_read_engines = [
+    create_async_engine(
+        make_url(url).set(drivername="postgresql+asyncpg"),
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        connect_args={"timeout": settings.DATABASE_REPLICA_CONNECT_TIMEOUT_SECONDS},
+        **POOL_OPTIONS,
+    )
+    for url in settings.DATABASE_REPLICA_URLS
+]
+
+# without replicas reads simply go to the primary
+read_session_factories = cycle(
+    [
+        sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+        for read_engine in read_engines
+    ]
+    or [SessionLocal]
+)
+async_read_session_factories = cycle(
+    [
+        async_sessionmaker(
+            autocommit=False, autoflush=False, expire_on_commit=False, bind=read_engine
+        )
+        for read_engine in async_read_engines
+    ]
+    or [AsyncSessionLocal]
+)
+
+register_metrics(
+    "database_pool",
+    lambda: {
+        "sync": pool_metrics(engine.pool),
+        "async": pool_metrics(async_engine.sync_engine.pool),
+        "replicas": [
+            {
+                "sync": pool_metrics(read_engine.pool),
+                "async": pool_metrics(async_read_engine.sync_engine.pool),
+            }
+            for read_engine, async_read_engine in zip(read_engines, async_read_engines)
+        ],
+    },
+)
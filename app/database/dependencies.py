@@ -1,4 +1,23 @@
-from .connection import SessionLocal
+import logging
+import time
+from typing import Any, AsyncIterator
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .connection import (
+    AsyncSessionLocal,
+    SessionLocal,
+    async_read_session_factories,
+    read_session_factories,
+)
+
+logger = logging.getLogger(__name__)
+
+# replica engines that failed to connect, with the moment they are tried again
+replicas_down_until: dict[Any, float] = {}
 
 
 def get_db():
@@ -7,3 +26,76 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    db = __read_session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db() -> AsyncIterator[AsyncSession]:
+    async with await __async_read_session() as db:
+        yield db
+
+
+def __read_session() -> Session:
+    db = next(read_session_factories)()
+
+    if db.bind is SessionLocal.kw["bind"]:
+        return db
+
+    # a replica that just failed is skipped instead of paying another attempt
+    if __is_down(db.bind):
+        db.close()
+        return SessionLocal()
+
+    try:
+        db.connection()
+    except OperationalError:
+        __mark_down(db.bind)
+        db.close()
+        return SessionLocal()
+
+    return db
+
+
+async def __async_read_session() -> AsyncSession:
+    db = next(async_read_session_factories)()
+
+    if db.bind is AsyncSessionLocal.kw["bind"]:
+        return db
+
+    if __is_down(db.bind):
+        await db.close()
+        return AsyncSessionLocal()
+
+    try:
+        await db.connection()
+    except (OperationalError, OSError, TimeoutError):
+        __mark_down(db.bind)
+        await db.close()
+        return AsyncSessionLocal()
+
+    return db
+
+
+def __is_down(bind: Any) -> bool:
+    return replicas_down_until.get(bind, 0) > time.monotonic()
+
+
+def __mark_down(bind: Any) -> None:
+    logger.warning(
+        "Database replica unavailable, reading from the primary for %ss",
+        settings.DATABASE_REPLICA_COOLDOWN_SECONDS,
+    )
+    replicas_down_until[bind] = (
+        time.monotonic() + settings.DATABASE_REPLICA_COOLDOWN_SECONDS
+    )
@@ -0,0 +1,130 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Callable
+
+from sqlalchemy import Engine, event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+from .slow_queries import slow_query_log
+
+logger = logging.getLogger(__name__)
+
+_query_stats: ContextVar["QueryStats | None"] = ContextVar("query_stats", default=None)
+
+
+class QueryBudgetExceededError(AssertionError):
+    pass
+
+
+class QueryStats:
+    def __init__(self, endpoint: str) -> None:
+        self.endpoint = endpoint
+        self.count = 0
+        self.duration = 0.0
+        self.budget: int | None = None
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    def check(self) -> None:
+        if self.budget is not None and self.count > self.budget:
+            raise QueryBudgetExceededError(
+                f"{self.endpoint} ran {self.count} statements, its budget is {self.budget}"
+            )
+
+        # the same statement shape twice in one request is almost always a
+        # query issued from a loop
+        repeated = [
+            statement for statement, count in self.statements.items() if count > 1
+        ]
+        if repeated:
+            raise QueryBudgetExceededError(
+                f"{self.endpoint} repeated statements: {repeated}"
+            )
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.2f};desc="{self.count} statements"'
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(f"{scope['method']} {scope['path']}")
+
+        async def _send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                logger.info(
+                    "%s: %s statements in %.2f ms",
+                    stats.endpoint,
+                    stats.count,
+                    stats.duration * 1000,
+                )
+
+                if settings.DATABASE_QUERY_BUDGET_ENFORCED:
+                    stats.check()
+
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing())
+
+            await send(message)
+
+        token = _query_stats.set(stats)
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            _query_stats.reset(token)
+
+
+def query_budget(statements: int) -> Callable[[], Any]:
+    async def _declare_query_budget() -> None:
+        stats = _query_stats.get()
+
+        if stats is not None:
+            stats.budget = statements
+
+    return _declare_query_budget
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.query_started_at = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not hasattr(context, "query_started_at"):
+        return
+
+    duration = time.perf_counter() - context.query_started_at
+    stats = _query_stats.get()
+
+    if stats is not None:
+        stats.record(statement, duration)
+
+    if (
+        settings.DATABASE_SLOW_QUERY_SECONDS is not None
+        and duration >= settings.DATABASE_SLOW_QUERY_SECONDS
+        and not executemany
+        and context.execution_options.get("slow_query_log", True)
+    ):
+        slow_query_log.capture(
+            conn,
+            statement,
+            parameters,
+            duration,
+            stats.endpoint if stats is not None else None,
+        )
@@ -0,0 +1,87 @@
+import time
+from typing import Any
+
+from sqlalchemy import Pool, event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.metrics.collectors import Histogram
+
+CHECKOUT_WAIT_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self.checkout_wait = Histogram(CHECKOUT_WAIT_BUCKETS)
+        self.checkout_timeouts = 0
+        self.connections_opened = 0
+        self.connections_invalidated = 0
+
+
+class InstrumentedQueuePool(QueuePool):
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+        # recreate() hands the listeners of the previous pool over in _dispatch
+        if "_dispatch" not in kwargs:
+            _listen(self, self.metrics)
+
+    def connect(self):  # type: ignore[no-untyped-def]
+        started_at = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.metrics.checkout_timeouts += 1
+            raise
+        finally:
+            self.metrics.checkout_wait.observe(time.perf_counter() - started_at)
+
+    # engine.dispose() swaps in a recreated pool, its metrics carry over
+    def recreate(self) -> QueuePool:
+        pool = super().recreate()
+        pool.metrics = self.metrics  # type: ignore[attr-defined]
+        return pool
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_metrics(pool: Pool) -> dict[str, Any]:
+    if not isinstance(pool, InstrumentedQueuePool):
+        return {}
+
+    return {
+        "size": pool.size(),
+        "in_use": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(0, pool.overflow()),
+        "checkout_timeouts": pool.metrics.checkout_timeouts,
+        "connections_opened": pool.metrics.connections_opened,
+        "connections_invalidated": pool.metrics.connections_invalidated,
+        "checkout_wait_seconds": pool.metrics.checkout_wait.snapshot(),
+    }
+
+
+def _listen(pool: Pool, metrics: PoolMetrics) -> None:
+    def _on_connect(*_: Any) -> None:
+        metrics.connections_opened += 1
+
+    def _on_invalidate(*_: Any) -> None:
+        metrics.connections_invalidated += 1
+
+    event.listen(pool, "connect", _on_connect)
+    event.listen(pool, "invalidate", _on_invalidate)
@@ -0,0 +1,21 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, status
+from app.dependencies import verify_internal_token
+from .slow_queries import slow_query_log
+
+router = APIRouter(
+    prefix="/internal/slow-queries",
+    tags=["Internal"],
+    dependencies=[Depends(verify_internal_token)],
+)
+
+
+@router.get(
+    "",
+    status_code=status.HTTP_200_OK,
+    summary="Get recently captured slow statements",
+    include_in_schema=False,
+)
+async def slow_queries() -> list[dict[str, Any]]:
+    return slow_query_log.entries()
@@ -0,0 +1,213 @@
+import asyncio
+import logging
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import URL, Connection, NullPool, create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+EXPLAINABLE_STATEMENTS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+REDACTED = "[redacted]"
+
+
+class SlowQueryLog:
+    def __init__(
+        self,
+        *,
+        size: int,
+        explain_interval_seconds: float,
+        max_concurrent_explains: int,
+        redacted_tables: list[str],
+    ):
+        self.explain_interval_seconds = explain_interval_seconds
+        self.max_concurrent_explains = max_concurrent_explains
+        # password hashes and token digests are bound as parameters, the plan is
+        # still captured with them but the log only keeps their shape
+        self._redacted_tables = re.compile(
+            rf"\b({'|'.join(map(re.escape, redacted_tables))})\b", re.IGNORECASE
+        )
+        self._entries: deque[dict[str, Any]] = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._explained_at: dict[str, float] = {}
+        self._explains_in_flight = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_explains, thread_name_prefix="slow-query-explain"
+        )
+        self._engines: dict[str, Any] = {}
+
+    def capture(
+        self,
+        conn: Connection,
+        statement: str,
+        parameters: Any,
+        duration: float,
+        endpoint: str | None,
+    ) -> None:
+        entry = {
+            "captured_at": datetime.now().isoformat(),
+            "endpoint": endpoint,
+            "duration_seconds": duration,
+            "statement": statement,
+            "parameters": (
+                _redacted(parameters)
+                if self._redacted_tables.search(statement)
+                else _jsonable(parameters)
+            ),
+            "explain": "sampled_out",
+            "plan": None,
+        }
+        self._entries.append(entry)
+        logger.warning(
+            "Slow statement (%.1f ms) in %s: %s", duration * 1000, endpoint, statement
+        )
+
+        if statement.lstrip().upper().startswith(EXPLAINABLE_STATEMENTS) and (
+            self._admit(statement)
+        ):
+            entry["explain"] = "pending"
+            self._explain(conn.engine.url, conn.dialect.is_async, entry, parameters)
+
+    def entries(self) -> list[dict[str, Any]]:
+        return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._explained_at.clear()
+
+    def _admit(self, statement: str) -> bool:
+        # every statement shape is explained at most once per interval and only
+        # a few plans are captured at a time, so a burst of slow queries cannot
+        # pile up extra load on the database
+        now = time.monotonic()
+        with self._lock:
+            # kept in the order statements were explained, so the ones out of
+            # their interval are at the front, every IN list length is a
+            # statement of its own and the dict would otherwise only grow
+            while self._explained_at:
+                explained, explained_at = next(iter(self._explained_at.items()))
+                if now - explained_at < self.explain_interval_seconds:
+                    break
+                del self._explained_at[explained]
+
+            if statement in self._explained_at:
+                return False
+
+            if self._explains_in_flight >= self.max_concurrent_explains:
+                return False
+
+            self._explained_at[statement] = now
+            self._explains_in_flight += 1
+            return True
+
+    def _explain(
+        self, url: URL, is_async: bool, entry: dict[str, Any], parameters: Any
+    ) -> None:
+        explain = f"EXPLAIN (FORMAT JSON) {entry['statement']}"
+
+        # a shut down executor or a missing event loop would otherwise keep the
+        # admitted slot taken for the rest of the process
+        try:
+            if not is_async:
+                self._executor.submit(
+                    self._explain_sync, url, explain, parameters, entry
+                )
+                return
+
+            # asyncpg connections belong to the event loop, the plan is captured
+            # by a task on that loop instead of a worker thread
+            loop = asyncio.get_running_loop()
+            loop.create_task(self._explain_async(url, explain, parameters, entry))
+        except Exception:
+            self._fail(entry)
+
+    def _explain_sync(
+        self, url: URL, explain: str, parameters: Any, entry: dict[str, Any]
+    ) -> None:
+        try:
+            with self._engine(url).connect() as connection:
+                plan = connection.exec_driver_sql(explain, parameters).scalar()
+            self._finish(entry, plan)
+        except Exception:
+            self._fail(entry)
+
+    async def _explain_async(
+        self, url: URL, explain: str, parameters: Any, entry: dict[str, Any]
+    ) -> None:
+        try:
+            engine: AsyncEngine = self._engine(url)
+            async with engine.connect() as connection:
+                plan = (await connection.exec_driver_sql(explain, parameters)).scalar()
+            self._finish(entry, plan)
+        except Exception:
+            self._fail(entry)
+
+    def _engine(self, url: URL) -> Any:
+        # a dedicated connection, the explain never waits on the request pools
+        key = url.render_as_string(hide_password=False)
+        with self._lock:
+            if key in self._engines:
+                return self._engines[key]
+
+            options: dict[str, Any] = {
+                "poolclass": NullPool,
+                "execution_options": {"slow_query_log": False},
+            }
+            if url.get_dialect().is_async:
+                self._engines[key] = create_async_engine(url, **options)
+            else:
+                self._engines[key] = create_engine(url, **options)
+
+            return self._engines[key]
+
+    def _finish(self, entry: dict[str, Any], plan: Any) -> None:
+        entry["plan"] = plan
+        entry["explain"] = "done"
+        with self._lock:
+            self._explains_in_flight -= 1
+
+    def _fail(self, entry: dict[str, Any]) -> None:
+        logger.exception("Capturing the plan of a slow statement failed")
+        entry["explain"] = "failed"
+        with self._lock:
+            self._explains_in_flight -= 1
+
+
+def _redacted(parameters: Any) -> Any:
+    if isinstance(parameters, dict):
+        return {key: _redacted(value) for key, value in parameters.items()}
+
+    if isinstance(parameters, (list, tuple)):
+        return [_redacted(value) for value in parameters]
+
+    return REDACTED
+
+
+def _jsonable(parameters: Any) -> Any:
+    if isinstance(parameters, dict):
+        return {key: _jsonable(value) for key, value in parameters.items()}
+
+    if isinstance(parameters, (list, tuple)):
+        return [_jsonable(value) for value in parameters]
+
+    if parameters is None or isinstance(parameters, (str, int, float, bool)):
+        return parameters
+
+    return repr(parameters)
+
+
+slow_query_log = SlowQueryLog(
+    size=settings.DATABASE_SLOW_QUERY_LOG_SIZE,
+    explain_interval_seconds=settings.DATABASE_SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS,
+    max_concurrent_explains=settings.DATABASE_SLOW_QUERY_MAX_CONCURRENT_EXPLAINS,
+    redacted_tables=settings.DATABASE_SLOW_QUERY_REDACTED_TABLES,
+)
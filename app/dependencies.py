@@ -0,0 +1,16 @@
+import secrets
+
+from fastapi import Depends
+from fastapi.security import APIKeyHeader
+
+from app.config import settings
+from app.exceptions import AccessForbiddenException
+
+internal_token_header = APIKeyHeader(name="X-Internal-Token", auto_error=False)
+
+
+def verify_internal_token(token: str | None = Depends(internal_token_header)) -> None:
+    expected = settings.INTERNAL_API_TOKEN
+
+    if expected is None or token is None or not secrets.compare_digest(token, expected):
+        raise AccessForbiddenException("invalid internal token")
@@ -0,0 +1,43 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Depends, Request
+from sqlalchemy import Row
+from app.database.dependencies import get_async_db, get_async_read_db
+
+from app.exceptions import NotFoundException
+from app.responses import is_conditional, is_not_modified, version_headers
+from .models import Event
+from .queries import event_by_id_query, event_version_query
+
+
+async def get_event_by_id(
+    event_id: int,
+    *,
+    db: AsyncSession = Depends(get_async_db),
+):
+    event: Event | None = await db.scalar(event_by_id_query(event_id))
+
+    if event is None:
+        raise NotFoundException(Event.__name__)
+
+    return event
+
+
+async def get_read_event_or_version(
+    event_id: int,
+    request: Request,
+    *,
+    db: AsyncSession = Depends(get_async_read_db),
+) -> Event | Row:
+    # a conditional request is answered from the event's version while the
+    # client's copy is current, the event is loaded only when it is stale
+    if is_conditional(request):
+        version = (await db.execute(event_version_query(event_id))).one_or_none()
+
+        if version is None:
+            raise NotFoundException(Event.__name__)
+
+        headers = version_headers(event_id, last_modified=version.updated_at)
+        if is_not_modified(request, headers):
+            return version
+
+    return await get_event_by_id(event_id, db=db)
@@ -0,0 +1,250 @@
+from app.events.filters import get_events_filters
+from app.pagination.enums import SortFieldEnum
+from app.pagination.services import paginate_query_async, sort_keys
+from .schemas import (
+    CreateEventParams,
+    EventFilters,
+    UpdateEventParams,
+    RepresentEvent,
+    RepresentEventMatch,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Depends
+from app.database.dependencies import get_async_db, get_async_read_db
+from .models import Event
+from app.auth.schemas import Principal
+from app.auth.async_dependencies import authenticate_user_from_token
+from .authorizers import (
+    current_user_role_is_organizer,
+    event_belongs_to_organizer,
+    current_user_role_is_participant,
+)
+from app.pagination.schemas import PaginatedResponse, PaginationParams
+from app.pagination.dependencies import pagination_params
+from .async_dependencies import (
+    get_event_by_id,
+    get_read_event_or_version,
+)
+from .exceptions import (
+    AlreadyEnrolledException,
+    EventFullException,
+    EventNotBelongToUserException,
+    NotEnrolledException,
+)
+from app.exceptions import NotFoundException, NotModifiedException
+from app.responses import version_headers
+from typing import cast
+from sqlalchemy import Label, Row, delete
+from sqlalchemy.exc import IntegrityError
+from .queries import (
+    EVENTS_SORT_KEYS,
+    OWN_EVENTS_SORT_KEYS,
+    cancel_enrollment_query,
+    enroll_query,
+    event_organizer_query,
+    events_query,
+    organizer_events_query,
+    participant_events_query,
+    update_event_query,
+)
+
+
+@current_user_role_is_organizer
+async def create_event(
+    params: CreateEventParams,
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(authenticate_user_from_token),
+) -> Event:
+    event = Event(
+        title=params.title,
+        description=params.description,
+        price=params.price,
+        max_capacity=params.max_capacity,
+        event_date=params.event_date,
+        organizer_id=current_user.id,
+    )
+
+    db.add(event)
+    await db.commit()
+
+    return event
+
+
+@current_user_role_is_participant
+async def enroll_for_event(
+    event_id: int,
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(authenticate_user_from_token),
+) -> None:
+    try:
+        event_exists, enrolled, already_enrolled = (
+            await db.execute(enroll_query(current_user.id, event_id))
+        ).one()
+    except IntegrityError:
+        # a concurrent enrollment of the same participant won the insert
+        await db.rollback()
+        raise AlreadyEnrolledException()
+
+    if not event_exists:
+        raise NotFoundException(Event.__name__)
+
+    if already_enrolled:
+        raise AlreadyEnrolledException()
+
+    if not enrolled:
+        raise EventFullException()
+
+    await db.commit()
+
+    return None
+
+
+@current_user_role_is_organizer
+async def get_organizer_events(
+    *,
+    pagination: PaginationParams = Depends(pagination_params),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(authenticate_user_from_token),
+) -> PaginatedResponse[RepresentEvent]:
+    query = organizer_events_query(current_user.id)
+    order_by = sort_keys(pagination, OWN_EVENTS_SORT_KEYS)
+
+    return await paginate_query_async(db, query, pagination, RepresentEvent, order_by)
+
+
+@current_user_role_is_participant
+async def get_participant_events(
+    *,
+    pagination: PaginationParams = Depends(pagination_params),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(authenticate_user_from_token),
+) -> PaginatedResponse[RepresentEvent]:
+    query = participant_events_query(current_user.id)
+    order_by = sort_keys(pagination, OWN_EVENTS_SORT_KEYS)
+
+    return await paginate_query_async(db, query, pagination, RepresentEvent, order_by)
+
+
+@current_user_role_is_participant
+async def get_events(
+    *,
+    filters: EventFilters = Depends(get_events_filters),
+    pagination: PaginationParams = Depends(pagination_params),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(authenticate_user_from_token),
+) -> PaginatedResponse[RepresentEvent] | PaginatedResponse[RepresentEventMatch]:
+    query = events_query(filters)
+
+    if filters.q and pagination.sort is None:
+        # best matches first, the id keeps equally ranked events in order
+        rank = cast(Label, query.selected_columns.rank)
+        return await paginate_query_async(
+            db, query, pagination, RepresentEventMatch, (rank, Event.id)
+        )
+
+    # upcoming events and date ranges come back in date order unless another
+    # sort is asked for
+    default_sort = (
+        SortFieldEnum.ID
+        if filters.include_past and not (filters.date_from or filters.date_to)
+        else SortFieldEnum.EVENT_DATE
+    )
+    order_by = sort_keys(pagination, EVENTS_SORT_KEYS, default_sort)
+
+    if filters.q:
+        return await paginate_query_async(
+            db, query, pagination, RepresentEventMatch, order_by
+        )
+
+    return await paginate_query_async(db, query, pagination, RepresentEvent, order_by)
+
+
+@current_user_role_is_organizer
+@event_belongs_to_organizer
+async def get_organizer_event(
+    *,
+    current_user: Principal = Depends(authenticate_user_from_token),
+    event: Event | Row = Depends(get_read_event_or_version),
+) -> Event:
+    return _event_or_not_modified(event)
+
+
+@current_user_role_is_organizer
+async def update_event(
+    params: UpdateEventParams,
+    event_id: int,
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(authenticate_user_from_token),
+) -> Event:
+    query = update_event_query(
+        event_id, current_user.id, params.model_dump(exclude_unset=True)
+    )
+    event = await db.scalar(query, execution_options={"populate_existing": True})
+
+    if event is None:
+        # only a missed update pays for telling a missing event from a foreign one
+        if await db.scalar(event_organizer_query(event_id)) is None:
+            raise NotFoundException(Event.__name__)
+
+        raise EventNotBelongToUserException()
+
+    await db.commit()
+
+    return event
+
+
+@current_user_role_is_participant
+async def get_event(
+    *,
+    current_user: Principal = Depends(authenticate_user_from_token),
+    event: Event | Row = Depends(get_read_event_or_version),
+) -> Event:
+    return _event_or_not_modified(event)
+
+
+@current_user_role_is_organizer
+@event_belongs_to_organizer
+async def delete_event(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(authenticate_user_from_token),
+    event: Event = Depends(get_event_by_id),
+) -> None:
+    # the enrollments go with the event through ON DELETE CASCADE
+    await db.execute(delete(Event).where(Event.id == event.id))
+    await db.commit()
+
+
+@current_user_role_is_participant
+async def remove_enrollment(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(authenticate_user_from_token),
+    event: Event = Depends(get_event_by_id),
+):
+    cancelled = await db.scalar(
+        cancel_enrollment_query(current_user.id, event.id),
+        execution_options={"synchronize_session": False},
+    )
+
+    if cancelled is None:
+        raise NotEnrolledException()
+
+    await db.commit()
+
+
+### HELPER FUNCTIONS ###
+
+
+def _event_or_not_modified(event: Event | Row) -> Event:
+    # a version is only left in place of the event when the client's copy is
+    # current, it is answered once the event's authorizers have passed
+    if isinstance(event, Row):
+        raise NotModifiedException(
+            version_headers(event.id, last_modified=event.updated_at)
+        )
+
+    return event
@@ -1,95 +1,65 @@
 from functools import wraps
+from inspect import iscoroutinefunction
+from typing import Any, Callable
 from .exceptions import (
-    AlreadyEnrolledException,
     EventNotBelongToUserException,
-    NotEnrolledException,
     UserNotOrganizerException,
     UserNotParticipantException,
 )
-from app.users.models import User
+from app.auth.schemas import Principal
 from app.users.enums import UserRole
-from .models import Event, Enrollment
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from .models import Event
 
 
 def current_user_role_is_organizer(fn):
-    @wraps(fn)
-    def wrapper(*args, **kwargs):
-        user: User = kwargs.get("current_user")
+    def _check(kwargs: dict[str, Any]) -> None:
+        user: Principal = kwargs["current_user"]
 
         if user.role != UserRole.ORGANIZER:
             raise UserNotOrganizerException()
 
-        return fn(*args, **kwargs)
-
-    return wrapper
+    return _authorize(fn, _check)
 
 
 def current_user_role_is_participant(fn):
-    @wraps(fn)
-    def wrapper(*args, **kwargs):
-        user: User = kwargs.get("current_user")
+    def _check(kwargs: dict[str, Any]) -> None:
+        user: Principal = kwargs["current_user"]
 
         if user.role != UserRole.PARTICIPANT:
             raise UserNotParticipantException()
 
-        return fn(*args, **kwargs)
-
-    return wrapper
+    return _authorize(fn, _check)
 
 
 def event_belongs_to_organizer(fn):
-    @wraps(fn)
-    def wrapper(*args, **kwargs):
-        user: User = kwargs.get("current_user")
-        event: Event = kwargs.get("event")
+    def _check(kwargs: dict[str, Any]) -> None:
+        user: Principal = kwargs["current_user"]
+        event: Event = kwargs["event"]
 
         if event.organizer_id != user.id:
             raise EventNotBelongToUserException()
 
-        return fn(*args, **kwargs)
+    return _authorize(fn, _check)
 
-    return wrapper
 
+### COMMON HELPER FUNCTIONS ###
 
-def participant_is_not_enrolled(fn):
-    @wraps(fn)
-    def wrapper(*args, **kwargs):
-        user: User = kwargs.get("current_user")
-        event: Event = kwargs.get("event")
-        db: Session = kwargs.get("db")
 
-        enrollemnt = db.scalar(
-            select(Enrollment).where(
-                Enrollment.participant_id == user.id, Enrollment.event_id == event.id
-            )
-        )
+def _authorize(fn, check: Callable[[dict[str, Any]], None]):
+    # FastAPI awaits coroutine dependencies itself, so async services need an
+    # async wrapper to keep running on the event loop
+    if iscoroutinefunction(fn):
 
-        if enrollemnt is not None:
-            raise AlreadyEnrolledException()
+        @wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            check(kwargs)
+            return await fn(*args, **kwargs)
 
-        return fn(*args, **kwargs)
+        return async_wrapper
 
-    return wrapper
-
-
-def participant_is_enrolled(fn):
     @wraps(fn)
     def wrapper(*args, **kwargs):
-        user: User = kwargs.get("current_user")
-        event: Event = kwargs.get("event")
-        db: Session = kwargs.get("db")
-
-        enrollemnt = db.scalar(
-            select(Enrollment).where(
-                Enrollment.participant_id == user.id, Enrollment.event_id == event.id
-            )
-        )
-
-        if enrollemnt is None:
-            raise NotEnrolledException()
-
+        check(kwargs)
         return fn(*args, **kwargs)
 
     return wrapper
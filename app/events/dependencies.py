@@ -1,10 +1,12 @@
 from sqlalchemy.orm import Session
-from fastapi import Depends
-from app.database.dependencies import get_db
-from sqlalchemy import select
+from fastapi import Depends, Request
+from sqlalchemy import Row
+from app.database.dependencies import get_db, get_read_db
 
 from app.exceptions import NotFoundException
+from app.responses import is_conditional, is_not_modified, version_headers
 from .models import Event
+from .queries import event_by_id_query, event_version_query
 
 
 def get_event_by_id(
@@ -12,9 +14,30 @@ def get_event_by_id(
     *,
     db: Session = Depends(get_db),
 ):
-    event: Event | None = db.scalar(select(Event).where(Event.id == event_id))
+    event: Event | None = db.scalar(event_by_id_query(event_id))
 
     if event is None:
         raise NotFoundException(Event.__name__)
 
     return event
+
+
+def get_read_event_or_version(
+    event_id: int,
+    request: Request,
+    *,
+    db: Session = Depends(get_read_db),
+) -> Event | Row:
+    # a conditional request is answered from the event's version while the
+    # client's copy is current, the event is loaded only when it is stale
+    if is_conditional(request):
+        version = db.execute(event_version_query(event_id)).one_or_none()
+
+        if version is None:
+            raise NotFoundException(Event.__name__)
+
+        headers = version_headers(event_id, last_modified=version.updated_at)
+        if is_not_modified(request, headers):
+            return version
+
+    return get_event_by_id(event_id, db=db)
@@ -16,6 +16,13 @@ class NotEnrolledException(HTTPException):
         super().__init__(status_code=status_code, detail=detail)
 
 
+class EventFullException(HTTPException):
+    def __init__(self):
+        status_code = status.HTTP_409_CONFLICT
+        detail = "The event has no seats left"
+        super().__init__(status_code=status_code, detail=detail)
+
+
 class UserNotOrganizerException(AccessForbiddenException):
     def __init__(self):
         super().__init__(reason="User role is not organizer")
@@ -1,8 +1,23 @@
 from .schemas import EventFilters
+from datetime import datetime
 from typing import Optional
 
 
 def get_events_filters(
-    min_price: Optional[int] = None, max_price: Optional[int] = None
+    min_price: Optional[int] = None,
+    max_price: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    q: Optional[str] = None,
+    highlight: bool = False,
+    include_past: bool = False,
 ):
-    return EventFilters(min_price=min_price, max_price=max_price)
+    return EventFilters(
+        min_price=min_price,
+        max_price=max_price,
+        date_from=date_from,
+        date_to=date_to,
+        q=q,
+        highlight=highlight,
+        include_past=include_past,
+    )
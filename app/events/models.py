@@ -1,7 +1,18 @@
 from app.database.model import Base
 
-from sqlalchemy import Integer, String, ForeignKey, DateTime, UniqueConstraint
-from sqlalchemy.orm import mapped_column, Mapped, relationship
+from sqlalchemy import (
+    Computed,
+    Integer,
+    func,
+    literal_column,
+    String,
+    ForeignKey,
+    DateTime,
+    Index,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import column_property, mapped_column, Mapped, relationship
 from datetime import datetime
 
 from typing import TYPE_CHECKING
@@ -9,6 +20,10 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:  # pragma: no cover
     from app.users.models import User
 
+# text search configuration of the stored search vector, queries have to use
+# the same one to match it
+SEARCH_CONFIG = "english"
+
 
 class Event(Base):
     __tablename__ = "events"
@@ -16,26 +31,80 @@ class Event(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     title: Mapped[str] = mapped_column(String)
     description: Mapped[str] = mapped_column(String)
-    price: Mapped[int] = mapped_column(Integer, nullable=True)
+    price: Mapped[int] = mapped_column(Integer, nullable=True, index=True)
+    # unpriced events are free, sorting by price counts them as the cheapest
+    # since a NULL never compares to a cursor
+    sort_price: Mapped[int] = column_property(
+        func.coalesce(price, literal_column("0")), deferred=True
+    )
     max_capacity: Mapped[int] = mapped_column(Integer, nullable=True)
+    # kept in step with the enrollments so capacity checks never count them
+    enrolled_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
     event_date: Mapped[datetime] = mapped_column(DateTime)
-    organizer_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    # versions the event's representation for conditional requests, every
+    # UPDATE of the row moves it unless the statement sets it itself, the
+    # statement time tells apart writes made in one transaction
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.statement_timestamp(),
+        onupdate=func.statement_timestamp(),
+        nullable=False,
+    )
+    organizer_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE")
+    )
     organizer: Mapped["User"] = relationship(back_populates="events_as_organizer")
+    # kept up to date by the database, titles weigh more than descriptions,
+    # deferred so loading an event never drags the vector along
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', title), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', description), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
     enrollments: Mapped[list["Enrollment"]] = relationship(
-        "Enrollment", back_populates="event", cascade="all, delete-orphan"
+        "Enrollment",
+        back_populates="event",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
+    __table_args__ = (
+        # organizer lists filter on the organizer and are paginated by id
+        Index("ix_events_organizer_id_id", "organizer_id", "id"),
+        # date ranges are walked in date order, the id breaks ties for cursors
+        Index("ix_events_event_date_id", "event_date", "id"),
+        Index("ix_events_title_id", "title", "id"),
+        Index("ix_events_search_vector", "search_vector", postgresql_using="gin"),
+    )
+    # inserts would otherwise return the freshly computed search vector
+    __mapper_args__ = {"eager_defaults": False}
+
+
+# sorts by price walk this index, the id breaks ties for cursors
+Index("ix_events_sort_price_id", Event.sort_price.expression, Event.id)
+
 
 class Enrollment(Base):
     __tablename__ = "enrollments"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     participant_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
-    event_id: Mapped[int] = mapped_column(ForeignKey("events.id"))
+    # the database removes the enrollments of a deleted event through this
+    # index, the relationship never loads them just to delete them
+    event_id: Mapped[int] = mapped_column(
+        ForeignKey("events.id", ondelete="CASCADE"), index=True
+    )
 
     participant: Mapped["User"] = relationship("User", back_populates="enrollments")
     event: Mapped["Event"] = relationship("Event", back_populates="enrollments")
 
+    # the unique pair also serves lookups by participant_id alone
     __table_args__ = (
         UniqueConstraint("participant_id", "event_id", name="unique_enrollment"),
     )
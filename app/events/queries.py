@@ -0,0 +1,197 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import (
+    Select,
+    Update,
+    and_,
+    cast,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    null,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import (
+    DOUBLE_PRECISION,
+    ts_headline,
+    websearch_to_tsquery,
+)
+
+from app.pagination.enums import SortFieldEnum
+from app.pagination.services import SortKey
+from .models import SEARCH_CONFIG, Enrollment, Event
+from .schemas import EventFilters
+
+# every sort is served by an index on its keys
+EVENTS_SORT_KEYS: dict[SortFieldEnum, tuple[SortKey, ...]] = {
+    SortFieldEnum.ID: (Event.id,),
+    SortFieldEnum.EVENT_DATE: (Event.event_date, Event.id),
+    SortFieldEnum.PRICE: (Event.sort_price, Event.id),
+    SortFieldEnum.TITLE: (Event.title, Event.id),
+}
+# organizer and participant lists filter on a column of their own first, only
+# the id follows it in their indexes
+OWN_EVENTS_SORT_KEYS: dict[SortFieldEnum, tuple[SortKey, ...]] = {
+    SortFieldEnum.ID: (Event.id,),
+}
+
+
+def event_by_id_query(event_id: int) -> Select:
+    return select(Event).where(Event.id == event_id)
+
+
+def event_organizer_query(event_id: int) -> Select:
+    return select(Event.organizer_id).where(Event.id == event_id)
+
+
+def event_version_query(event_id: int) -> Select:
+    return select(Event.id, Event.organizer_id, Event.updated_at).where(
+        Event.id == event_id
+    )
+
+
+def update_event_query(
+    event_id: int, organizer_id: int, values: dict[str, Any]
+) -> Select | Update:
+    # ownership is part of the statement, an event of another organizer is
+    # simply not matched
+    owned_event = (Event.id == event_id, Event.organizer_id == organizer_id)
+
+    # an UPDATE needs at least one column to set
+    if not values:
+        return select(Event).where(*owned_event)
+
+    return update(Event).where(*owned_event).values(**values).returning(Event)
+
+
+def enroll_query(participant_id: int, event_id: int) -> Select:
+    # one round trip takes a seat and inserts the enrollment, the row lock of
+    # the update serializes concurrent enrollments of the event and re-checks
+    # its capacity, a participant enrolled before the statement takes no seat
+    enrolled_before = exists(
+        select(Enrollment.id).where(
+            Enrollment.participant_id == participant_id,
+            Enrollment.event_id == event_id,
+        )
+    )
+    seat = (
+        update(Event)
+        .where(
+            Event.id == event_id,
+            or_(
+                Event.max_capacity.is_(None),
+                Event.enrolled_count < Event.max_capacity,
+            ),
+            ~enrolled_before,
+        )
+        # seats are not part of any representation, taking one keeps the
+        # cached copies of the event valid
+        .values(enrolled_count=Event.enrolled_count + 1, updated_at=Event.updated_at)
+        .returning(Event.id)
+        .cte("seat")
+    )
+    # the postgresql insert construct with ON CONFLICT is never cached by
+    # SQLAlchemy and compiling this statement costs more than running it, a
+    # concurrent duplicate surfaces as a unique violation instead
+    enrollment = (
+        insert(Enrollment)
+        .from_select(
+            [Enrollment.participant_id, Enrollment.event_id],
+            select(literal(participant_id), seat.c.id),
+        )
+        .returning(Enrollment.id)
+        .cte("enrollment")
+    )
+
+    # the event is not loaded up front, a missing one is reported here
+    return select(
+        exists(select(Event.id).where(Event.id == event_id)).label("event_exists"),
+        exists(enrollment.select()).label("enrolled"),
+        enrolled_before.label("already_enrolled"),
+    )
+
+
+def cancel_enrollment_query(participant_id: int, event_id: int) -> Update:
+    enrollment = (
+        delete(Enrollment)
+        .where(
+            Enrollment.participant_id == participant_id,
+            Enrollment.event_id == event_id,
+        )
+        .returning(Enrollment.event_id)
+        .cte("enrollment")
+    )
+
+    return (
+        update(Event)
+        .where(Event.id.in_(select(enrollment.c.event_id)))
+        .values(enrolled_count=Event.enrolled_count - 1, updated_at=Event.updated_at)
+        .returning(Event.id)
+    )
+
+
+def organizer_events_query(organizer_id: int) -> Select:
+    return select(Event).where(Event.organizer_id == organizer_id)
+
+
+def participant_events_query(participant_id: int) -> Select:
+    return (
+        select(Event)
+        .join(Enrollment, Enrollment.event_id == Event.id)
+        .where(Enrollment.participant_id == participant_id)
+    )
+
+
+def events_query(filters: EventFilters) -> Select:
+    query = select(Event)
+    price_range = []
+
+    if filters.min_price:
+        price_range.append(Event.price >= filters.min_price)
+
+    if filters.max_price:
+        price_range.append(Event.price <= filters.max_price)
+
+    # a single OR of the whole range and the unpriced events keeps the row
+    # estimate sane and lets the planner combine both on the price index
+    if price_range:
+        query = query.where(or_(and_(*price_range), Event.price.is_(None)))
+
+    # the listing shows upcoming events unless a start date or past events
+    # are asked for
+    if filters.date_from:
+        query = query.where(Event.event_date >= filters.date_from)
+    elif not filters.include_past:
+        query = query.where(Event.event_date >= datetime.now())
+
+    if filters.date_to:
+        query = query.where(Event.event_date <= filters.date_to)
+
+    if filters.q:
+        query = _matching_events_query(query, filters.q, filters.highlight)
+
+    return query
+
+
+### COMMON HELPER FUNCTIONS ###
+
+
+def _matching_events_query(query: Select, q: str, highlight: bool) -> Select:
+    # the match runs on the GIN index, ranking and highlighting only touch the
+    # matching rows, ts_headline re-parses the text and is left out unless asked
+    search = websearch_to_tsquery(SEARCH_CONFIG, q)
+    # ts_rank returns a real, as a double it survives the round trip through
+    # a cursor and compares equal to itself
+    rank = cast(func.ts_rank(Event.search_vector, search), DOUBLE_PRECISION)
+    headline = (
+        ts_headline(SEARCH_CONFIG, Event.description, search) if highlight else null()
+    )
+
+    return query.add_columns(rank.label("rank"), headline.label("headline")).where(
+        Event.search_vector.bool_op("@@")(search)
+    )
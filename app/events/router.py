@@ -1,54 +1,64 @@
-from fastapi import APIRouter, Response, status, Depends
+from fastapi import APIRouter, Request, Response, status, Depends
 from .schemas import RepresentEventDetails
-from .services import create_event, get_organizer_events
 from .models import Event
 from app.pagination.schemas import PaginatedResponse
-from .schemas import RepresentEvent
-from .services import (
-    get_organizer_event,
-    update_event,
-    delete_event,
-    get_events,
-    get_event,
-    enroll_for_event,
-    get_participant_events,
-    remove_enrollment,
-)
+from .schemas import RepresentEvent, RepresentEventMatch
+from app.database.config import settings as database_settings
+from app.database.instrumentation import query_budget
+from app.responses import RepresentationAdapter, version_headers
+
+if database_settings.DATABASE_ASYNC:
+    from . import async_services as services
+else:
+    from . import services  # type: ignore[no-redef]
 
 router = APIRouter(tags=["Event"])
 
+event_details_representation = RepresentationAdapter(RepresentEventDetails)
+events_page_representation = RepresentationAdapter(PaginatedResponse[RepresentEvent])
+# searches return ranked matches, the match goes first so its extra fields
+# are kept
+searchable_events_page_representation = RepresentationAdapter(
+    PaginatedResponse[RepresentEventMatch | RepresentEvent]
+)
+
 
 @router.post(
     "/events",
     response_model=RepresentEventDetails,
     status_code=status.HTTP_201_CREATED,
     summary="Create event",
+    dependencies=[Depends(query_budget(4))],
 )
-async def create(event: Event = Depends(create_event)):
-    return event
+async def create(event: Event = Depends(services.create_event)):
+    return event_details_representation.response(event, status.HTTP_201_CREATED)
 
 
 @router.post(
     "/events/{event_id}/enroll",
     status_code=status.HTTP_201_CREATED,
     summary="Enroll for the event",
+    dependencies=[Depends(query_budget(3))],
 )
 async def enroll(
-    _: None = Depends(enroll_for_event),
+    _: None = Depends(services.enroll_for_event),
 ):
     return Response(status_code=status.HTTP_201_CREATED)
 
 
 @router.get(
     "/events",
-    response_model=PaginatedResponse[RepresentEvent],
+    response_model=PaginatedResponse[RepresentEventMatch | RepresentEvent],
     status_code=status.HTTP_200_OK,
     summary="List of events",
+    dependencies=[Depends(query_budget(3))],
 )
 async def get_all_events(
-    events: PaginatedResponse[RepresentEvent] = Depends(get_events),
+    request: Request,
+    events: PaginatedResponse[RepresentEvent]
+    | PaginatedResponse[RepresentEventMatch] = Depends(services.get_events),
 ):
-    return events
+    return searchable_events_page_representation.conditional_response(request, events)
 
 
 @router.get(
@@ -56,11 +66,14 @@ async def get_all_events(
     response_model=RepresentEventDetails,
     status_code=status.HTTP_200_OK,
     summary="Get event details",
+    dependencies=[Depends(query_budget(4))],
 )
 async def event_details(
-    event: Event = Depends(get_event),
+    event: Event = Depends(services.get_event),
 ):
-    return event
+    return event_details_representation.response(
+        event, headers=version_headers(event.id, last_modified=event.updated_at)
+    )
 
 
 @router.patch(
@@ -68,11 +81,17 @@ async def event_details(
     response_model=RepresentEventDetails,
     status_code=status.HTTP_200_OK,
     summary="Update event's data",
+    dependencies=[Depends(query_budget(4))],
 )
 async def update(
-    updated_event: Event = Depends(update_event),
+    updated_event: Event = Depends(services.update_event),
 ):
-    return updated_event
+    return event_details_representation.response(
+        updated_event,
+        headers=version_headers(
+            updated_event.id, last_modified=updated_event.updated_at
+        ),
+    )
 
 
 @router.delete(
@@ -80,9 +99,10 @@ async def update(
     response_model=RepresentEventDetails,
     status_code=status.HTTP_200_OK,
     summary="Delete event",
+    dependencies=[Depends(query_budget(4))],
 )
 async def delete(
-    _: None = Depends(delete_event),
+    _: None = Depends(services.delete_event),
 ):
     return Response(status_code=status.HTTP_200_OK)
 
@@ -92,11 +112,13 @@ async def delete(
     response_model=PaginatedResponse[RepresentEvent],
     status_code=status.HTTP_200_OK,
     summary="Get organizer's events",
+    dependencies=[Depends(query_budget(3))],
 )
 async def organizer_events(
-    events: PaginatedResponse[RepresentEvent] = Depends(get_organizer_events),
+    request: Request,
+    events: PaginatedResponse[RepresentEvent] = Depends(services.get_organizer_events),
 ):
-    return events
+    return events_page_representation.conditional_response(request, events)
 
 
 @router.get(
@@ -104,20 +126,25 @@ async def organizer_events(
     response_model=PaginatedResponse[RepresentEvent],
     status_code=status.HTTP_200_OK,
     summary="Get participant's events",
+    dependencies=[Depends(query_budget(3))],
 )
 async def participant_events(
-    events: PaginatedResponse[RepresentEvent] = Depends(get_participant_events),
+    request: Request,
+    events: PaginatedResponse[RepresentEvent] = Depends(
+        services.get_participant_events
+    ),
 ):
-    return events
+    return events_page_representation.conditional_response(request, events)
 
 
 @router.delete(
     "/participant/events/{event_id}/cancel",
     status_code=status.HTTP_200_OK,
     summary="Cancel participant's enrollment",
+    dependencies=[Depends(query_budget(4))],
 )
 async def cancel_enrollment(
-    _: None = Depends(remove_enrollment),
+    _: None = Depends(services.remove_enrollment),
 ):
     return Response(status_code=status.HTTP_200_OK)
 
@@ -127,8 +154,11 @@ async def cancel_enrollment(
     response_model=RepresentEventDetails,
     status_code=status.HTTP_200_OK,
     summary="Get organizer's event details",
+    dependencies=[Depends(query_budget(4))],
 )
 async def organizer_event_details(
-    event: Event = Depends(get_organizer_event),
+    event: Event = Depends(services.get_organizer_event),
 ):
-    return event
+    return event_details_representation.response(
+        event, headers=version_headers(event.id, last_modified=event.updated_at)
+    )
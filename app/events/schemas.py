@@ -13,6 +13,11 @@ class RepresentEvent(BaseModel):
         from_attributes = True
 
 
+class RepresentEventMatch(RepresentEvent):
+    rank: float
+    headline: str | None
+
+
 class RepresentEventDetails(BaseModel):
     id: int
     title: str
@@ -44,3 +49,8 @@ class UpdateEventParams(BaseModel):
 class EventFilters(BaseModel):
     min_price: Optional[int] = Field(default=None)
     max_price: Optional[int] = Field(default=None)
+    date_from: Optional[datetime] = Field(default=None)
+    date_to: Optional[datetime] = Field(default=None)
+    q: Optional[str] = Field(default=None)
+    highlight: bool = Field(default=False)
+    include_past: bool = Field(default=False)
@@ -1,23 +1,52 @@
 from app.events.filters import get_events_filters
-from app.pagination.services import paginate_query
-from .schemas import CreateEventParams, EventFilters, UpdateEventParams, RepresentEvent
+from app.pagination.enums import SortFieldEnum
+from app.pagination.services import paginate_query, sort_keys
+from .schemas import (
+    CreateEventParams,
+    EventFilters,
+    UpdateEventParams,
+    RepresentEvent,
+    RepresentEventMatch,
+)
 from sqlalchemy.orm import Session
 from fastapi import Depends
-from app.database.dependencies import get_db
-from .models import Event, Enrollment
-from app.users.models import User
+from app.database.dependencies import get_db, get_read_db
+from .models import Event
+from app.auth.schemas import Principal
 from app.auth.dependencies import authenticate_user_from_token
 from .authorizers import (
     current_user_role_is_organizer,
     event_belongs_to_organizer,
     current_user_role_is_participant,
-    participant_is_not_enrolled,
-    participant_is_enrolled,
 )
 from app.pagination.schemas import PaginatedResponse, PaginationParams
 from app.pagination.dependencies import pagination_params
-from sqlalchemy import select, or_
-from .dependencies import get_event_by_id
+from .dependencies import (
+    get_event_by_id,
+    get_read_event_or_version,
+)
+from .exceptions import (
+    AlreadyEnrolledException,
+    EventFullException,
+    EventNotBelongToUserException,
+    NotEnrolledException,
+)
+from app.exceptions import NotFoundException, NotModifiedException
+from app.responses import version_headers
+from typing import cast
+from sqlalchemy import Label, Row, delete
+from sqlalchemy.exc import IntegrityError
+from .queries import (
+    EVENTS_SORT_KEYS,
+    OWN_EVENTS_SORT_KEYS,
+    cancel_enrollment_query,
+    enroll_query,
+    event_organizer_query,
+    events_query,
+    organizer_events_query,
+    participant_events_query,
+    update_event_query,
+)
 
 
 @current_user_role_is_organizer
@@ -25,7 +54,7 @@ def create_event(
     params: CreateEventParams,
     *,
     db: Session = Depends(get_db),
-    current_user: User = Depends(authenticate_user_from_token),
+    current_user: Principal = Depends(authenticate_user_from_token),
 ) -> Event:
     event = Event(
         title=params.title,
@@ -43,19 +72,30 @@ def create_event(
 
 
 @current_user_role_is_participant
-@participant_is_not_enrolled
 def enroll_for_event(
+    event_id: int,
     *,
     db: Session = Depends(get_db),
-    current_user: User = Depends(authenticate_user_from_token),
-    event: Event = Depends(get_event_by_id),
+    current_user: Principal = Depends(authenticate_user_from_token),
 ) -> None:
-    enrollment = Enrollment(
-        participant_id=current_user.id,
-        event_id=event.id,
-    )
+    try:
+        event_exists, enrolled, already_enrolled = (
+            db.execute(enroll_query(current_user.id, event_id))
+        ).one()
+    except IntegrityError:
+        # a concurrent enrollment of the same participant won the insert
+        db.rollback()
+        raise AlreadyEnrolledException()
+
+    if not event_exists:
+        raise NotFoundException(Event.__name__)
+
+    if already_enrolled:
+        raise AlreadyEnrolledException()
+
+    if not enrolled:
+        raise EventFullException()
 
-    db.add(enrollment)
     db.commit()
 
     return None
@@ -65,28 +105,26 @@ def enroll_for_event(
 def get_organizer_events(
     *,
     pagination: PaginationParams = Depends(pagination_params),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(authenticate_user_from_token),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(authenticate_user_from_token),
 ) -> PaginatedResponse[RepresentEvent]:
-    query = select(Event).where(Event.organizer_id == current_user.id)
+    query = organizer_events_query(current_user.id)
+    order_by = sort_keys(pagination, OWN_EVENTS_SORT_KEYS)
 
-    return paginate_query(db, query, pagination, RepresentEvent, Event.id)
+    return paginate_query(db, query, pagination, RepresentEvent, order_by)
 
 
 @current_user_role_is_participant
 def get_participant_events(
     *,
     pagination: PaginationParams = Depends(pagination_params),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(authenticate_user_from_token),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(authenticate_user_from_token),
 ) -> PaginatedResponse[RepresentEvent]:
-    query = (
-        select(Event)
-        .join(Enrollment, Enrollment.event_id == Event.id)
-        .where(Enrollment.participant_id == current_user.id)
-    )
+    query = participant_events_query(current_user.id)
+    order_by = sort_keys(pagination, OWN_EVENTS_SORT_KEYS)
 
-    return paginate_query(db, query, pagination, RepresentEvent, Event.id)
+    return paginate_query(db, query, pagination, RepresentEvent, order_by)
 
 
 @current_user_role_is_participant
@@ -94,50 +132,67 @@ def get_events(
     *,
     filters: EventFilters = Depends(get_events_filters),
     pagination: PaginationParams = Depends(pagination_params),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(authenticate_user_from_token),
-) -> PaginatedResponse[RepresentEvent]:
-    query = select(Event)
-
-    if filters.min_price:
-        query = query.where(
-            or_(Event.price >= filters.min_price, Event.price.is_(None))
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(authenticate_user_from_token),
+) -> PaginatedResponse[RepresentEvent] | PaginatedResponse[RepresentEventMatch]:
+    query = events_query(filters)
+
+    if filters.q and pagination.sort is None:
+        # best matches first, the id keeps equally ranked events in order
+        rank = cast(Label, query.selected_columns.rank)
+        return paginate_query(
+            db, query, pagination, RepresentEventMatch, (rank, Event.id)
         )
 
-    if filters.max_price:
-        query = query.where(
-            or_(Event.price <= filters.max_price, Event.price.is_(None))
-        )
+    # upcoming events and date ranges come back in date order unless another
+    # sort is asked for
+    default_sort = (
+        SortFieldEnum.ID
+        if filters.include_past and not (filters.date_from or filters.date_to)
+        else SortFieldEnum.EVENT_DATE
+    )
+    order_by = sort_keys(pagination, EVENTS_SORT_KEYS, default_sort)
+
+    if filters.q:
+        return paginate_query(db, query, pagination, RepresentEventMatch, order_by)
 
-    return paginate_query(db, query, pagination, RepresentEvent, Event.id)
+    return paginate_query(db, query, pagination, RepresentEvent, order_by)
 
 
 @current_user_role_is_organizer
 @event_belongs_to_organizer
 def get_organizer_event(
     *,
-    current_user: User = Depends(authenticate_user_from_token),
-    event: Event = Depends(get_event_by_id),
+    current_user: Principal = Depends(authenticate_user_from_token),
+    event: Event | Row = Depends(get_read_event_or_version),
 ) -> Event:
-    return event
+    return _event_or_not_modified(event)
 
 
 @current_user_role_is_organizer
-@event_belongs_to_organizer
 def update_event(
     params: UpdateEventParams,
+    event_id: int,
     *,
     db: Session = Depends(get_db),
-    current_user: User = Depends(authenticate_user_from_token),
-    event: Event = Depends(get_event_by_id),
+    current_user: Principal = Depends(authenticate_user_from_token),
 ) -> Event:
-    update_data = params.model_dump(exclude_unset=True)
+    query = update_event_query(
+        event_id, current_user.id, params.model_dump(exclude_unset=True)
+    )
+    event = db.scalar(query, execution_options={"populate_existing": True})
 
-    for field, value in update_data.items():
-        setattr(event, field, value)
+    if event is None:
+        # only a missed update pays for telling a missing event from a foreign one
+        if db.scalar(event_organizer_query(event_id)) is None:
+            raise NotFoundException(Event.__name__)
 
+        raise EventNotBelongToUserException()
+
+    # detached from the session the committed event keeps the returned values
+    # instead of expiring and being loaded again
+    db.expunge(event)
     db.commit()
-    db.refresh(event)
 
     return event
 
@@ -145,10 +200,10 @@ def update_event(
 @current_user_role_is_participant
 def get_event(
     *,
-    current_user: User = Depends(authenticate_user_from_token),
-    event: Event = Depends(get_event_by_id),
+    current_user: Principal = Depends(authenticate_user_from_token),
+    event: Event | Row = Depends(get_read_event_or_version),
 ) -> Event:
-    return event
+    return _event_or_not_modified(event)
 
 
 @current_user_role_is_organizer
@@ -156,25 +211,41 @@ def get_event(
 def delete_event(
     *,
     db: Session = Depends(get_db),
-    current_user: User = Depends(authenticate_user_from_token),
+    current_user: Principal = Depends(authenticate_user_from_token),
     event: Event = Depends(get_event_by_id),
 ) -> None:
-    return db.delete(event)
+    # the enrollments go with the event through ON DELETE CASCADE
+    db.execute(delete(Event).where(Event.id == event.id))
+    db.commit()
 
 
 @current_user_role_is_participant
-@participant_is_enrolled
 def remove_enrollment(
     *,
     db: Session = Depends(get_db),
-    current_user: User = Depends(authenticate_user_from_token),
+    current_user: Principal = Depends(authenticate_user_from_token),
     event: Event = Depends(get_event_by_id),
 ):
-    enrollment = db.execute(
-        select(Enrollment).where(
-            Enrollment.event_id == event.id,
-            Enrollment.participant_id == current_user.id,
+    cancelled = db.scalar(
+        cancel_enrollment_query(current_user.id, event.id),
+        execution_options={"synchronize_session": False},
+    )
+
+    if cancelled is None:
+        raise NotEnrolledException()
+
+    db.commit()
+
+
+### HELPER FUNCTIONS ###
+
+
+def _event_or_not_modified(event: Event | Row) -> Event:
+    # a version is only left in place of the event when the client's copy is
+    # current, it is answered once the event's authorizers have passed
+    if isinstance(event, Row):
+        raise NotModifiedException(
+            version_headers(event.id, last_modified=event.updated_at)
         )
-    ).scalar_one()
 
-    return db.delete(enrollment)
+    return event
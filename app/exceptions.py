@@ -21,3 +21,9 @@ class NotFoundException(HTTPException):
         status_code = status.HTTP_404_NOT_FOUND
         detail = f"The {key} is not found"
         super().__init__(status_code=status_code, detail=detail)
+
+
+class NotModifiedException(HTTPException):
+    def __init__(self, headers: dict[str, str]):
+        status_code = status.HTTP_304_NOT_MODIFIED
+        super().__init__(status_code=status_code, headers=headers)
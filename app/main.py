@@ -1,7 +1,26 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from app.router import router
 from app.config import settings
+from app.auth.tasks import auth_background_tasks
+from app.auth.hashers import password_hasher
+from app.database.connection import async_engine
+from app.database.instrumentation import QueryStatsMiddleware
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    try:
+        async with auth_background_tasks():
+            yield
+    finally:
+        password_hasher.shutdown()
+        await async_engine.dispose()
+
 
-app = FastAPI(title=settings.PROJECT_NAME)
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
 
+app.add_middleware(QueryStatsMiddleware)
 app.include_router(router)
@@ -0,0 +1,76 @@
+import bisect
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1)
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self._sum = 0.0
+            self._count = 0
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            cumulative, buckets = 0, {}
+            for bound, count in zip([*self.buckets, "+Inf"], self._counts):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+
+            return {"count": self._count, "sum": self._sum, "buckets": buckets}
+
+
+class StageTimer:
+    def __init__(self, buckets: tuple[float, ...] = FAST_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._histograms: dict[str, Histogram] = {}
+        self._failures: Counter[str] = Counter()
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            with self._lock:
+                self._failures[stage] += 1
+            raise
+        finally:
+            self._histogram(stage).observe(time.perf_counter() - started_at)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            histograms = dict(self._histograms)
+            failures = dict(self._failures)
+
+        return {
+            stage: {
+                "seconds": histogram.snapshot(),
+                "failures": failures.get(stage, 0),
+            }
+            for stage, histogram in histograms.items()
+        }
+
+    def _histogram(self, stage: str) -> Histogram:
+        with self._lock:
+            if stage not in self._histograms:
+                self._histograms[stage] = Histogram(self.buckets)
+            return self._histograms[stage]
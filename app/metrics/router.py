@@ -0,0 +1,21 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, status
+from app.dependencies import verify_internal_token
+from .services import collect_metrics
+
+router = APIRouter(
+    prefix="/internal/metrics",
+    tags=["Internal"],
+    dependencies=[Depends(verify_internal_token)],
+)
+
+
+@router.get(
+    "",
+    status_code=status.HTTP_200_OK,
+    summary="Get worker metrics",
+    include_in_schema=False,
+)
+async def metrics() -> dict[str, dict[str, Any]]:
+    return collect_metrics()
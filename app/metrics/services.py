@@ -0,0 +1,11 @@
+from typing import Any, Callable
+
+_collectors: dict[str, Callable[[], dict[str, Any]]] = {}
+
+
+def register_metrics(name: str, collect: Callable[[], dict[str, Any]]) -> None:
+    _collectors[name] = collect
+
+
+def collect_metrics() -> dict[str, dict[str, Any]]:
+    return {name: collect() for name, collect in _collectors.items()}
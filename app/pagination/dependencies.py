@@ -1,7 +1,20 @@
+from typing import Optional
+from .enums import SortFieldEnum
 from .schemas import SortEnum, PaginationParams
+from .services import decode_cursor
 
 
 def pagination_params(
-    page: int = 1, per_page: int = 10, order: SortEnum = SortEnum.DESC
+    page: int = 1,
+    per_page: int = 10,
+    order: SortEnum = SortEnum.DESC,
+    sort: Optional[SortFieldEnum] = None,
+    cursor: Optional[str] = None,
 ):
-    return PaginationParams(page=page, per_page=per_page, order=order.value)
+    return PaginationParams(
+        page=page,
+        per_page=per_page,
+        order=order.value,
+        sort=sort,
+        cursor=decode_cursor(cursor) if cursor else None,
+    )
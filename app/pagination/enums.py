@@ -4,3 +4,15 @@ from enum import Enum
 class SortEnum(Enum):
     ASC = "asc"
     DESC = "desc"
+
+
+class SortFieldEnum(Enum):
+    ID = "id"
+    EVENT_DATE = "event_date"
+    PRICE = "price"
+    TITLE = "title"
+
+
+class CursorDirectionEnum(Enum):
+    NEXT = "next"
+    PREV = "prev"
@@ -0,0 +1,17 @@
+from fastapi import HTTPException, status
+
+
+class InvalidCursorException(HTTPException):
+    def __init__(self):
+        status_code = status.HTTP_400_BAD_REQUEST
+        detail = "Invalid pagination cursor."
+        super().__init__(status_code=status_code, detail=detail)
+
+
+class UnsupportedSortException(HTTPException):
+    def __init__(self, supported: list[str]):
+        status_code = status.HTTP_400_BAD_REQUEST
+        detail = (
+            f"Unsupported sort, this list can be sorted by: {', '.join(supported)}."
+        )
+        super().__init__(status_code=status_code, detail=detail)
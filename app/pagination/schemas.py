@@ -1,18 +1,29 @@
 from pydantic import BaseModel
 
-from typing import Generic, TypeVar
-from .enums import SortEnum
+from typing import Any, Generic, Optional, TypeVar
+from .enums import CursorDirectionEnum, SortEnum, SortFieldEnum
 
 T = TypeVar("T")
 
 
+class Cursor(BaseModel):
+    values: list[Any]
+    # digest of the sort keys that produced the values
+    sort: str
+    direction: CursorDirectionEnum
+
+
 class PaginationParams(BaseModel):
     per_page: int
     page: int
     order: SortEnum
+    sort: Optional[SortFieldEnum] = None
+    cursor: Optional[Cursor] = None
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
-    page: int
+    page: Optional[int]
     per_page: int
     items: list[T]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
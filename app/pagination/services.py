@@ -1,36 +1,212 @@
-from pydantic import BaseModel
+import base64
+import hashlib
+from typing import Any, Mapping, Sequence
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import Select, asc, desc
+from sqlalchemy import Row, Select, asc, desc, tuple_
+from sqlalchemy.sql.elements import KeyedColumnElement
 
-from app.pagination.enums import SortEnum
-from app.pagination.schemas import PaginatedResponse, PaginationParams
+from app.pagination.enums import CursorDirectionEnum, SortEnum, SortFieldEnum
+from app.pagination.exceptions import InvalidCursorException, UnsupportedSortException
+from app.pagination.schemas import Cursor, PaginatedResponse, PaginationParams
 from sqlalchemy.orm.attributes import InstrumentedAttribute
 
+# mapped columns or labeled expressions, the last one has to be unique so the
+# order is total
+SortKey = InstrumentedAttribute | KeyedColumnElement
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    return base64.urlsafe_b64encode(cursor.model_dump_json().encode()).decode()
+
+
+def decode_cursor(raw_cursor: str) -> Cursor:
+    try:
+        return Cursor.model_validate_json(base64.urlsafe_b64decode(raw_cursor))
+    except (ValueError, ValidationError):
+        raise InvalidCursorException()
+
+
+def sort_keys(
+    pagination: PaginationParams,
+    supported: Mapping[SortFieldEnum, Sequence[SortKey]],
+    default: SortFieldEnum = SortFieldEnum.ID,
+) -> Sequence[SortKey]:
+    # lists only offer the sorts an index can serve, anything else would sort
+    # the whole list on every page
+    sort = pagination.sort or default
+
+    if sort not in supported:
+        raise UnsupportedSortException([field.value for field in supported])
+
+    return supported[sort]
+
+
+def sort_digest(order_by: Sequence[SortKey]) -> str:
+    # values of one sort coerce silently into the types of another, the
+    # digest covers the bound parameters too so a ranked cursor is tied to
+    # its search query
+    digest = hashlib.sha256()
+
+    for key in order_by:
+        compiled = key.compile()
+        digest.update(str(compiled).encode())
+        digest.update(repr(sorted(compiled.params.items())).encode())
+
+    return digest.hexdigest()[:16]
+
 
 def paginate_query[T: BaseModel](
     db: Session,
     query: Select,
     pagination: PaginationParams,
     representer: type[T],
-    order_by_column: InstrumentedAttribute,
+    order_by: Sequence[SortKey],
 ) -> PaginatedResponse[T]:
-    order = (
-        asc(order_by_column)
-        if pagination.order == SortEnum.ASC
-        else desc(order_by_column)
-    )
+    projected_query = _projected_query(query, representer, order_by)
+
+    if projected_query is None:
+        paginated_query = _paginated_query(query, pagination, order_by)
+        items: list[Any] = list(db.scalars(paginated_query))
+    else:
+        paginated_query = _paginated_query(projected_query, pagination, order_by)
+        items = list(db.execute(paginated_query))
+
+    return _paginated_response(items, pagination, representer, order_by)
+
+
+async def paginate_query_async[T: BaseModel](
+    db: AsyncSession,
+    query: Select,
+    pagination: PaginationParams,
+    representer: type[T],
+    order_by: Sequence[SortKey],
+) -> PaginatedResponse[T]:
+    projected_query = _projected_query(query, representer, order_by)
+
+    if projected_query is None:
+        paginated_query = _paginated_query(query, pagination, order_by)
+        items: list[Any] = list(await db.scalars(paginated_query))
+    else:
+        paginated_query = _paginated_query(projected_query, pagination, order_by)
+        items = list(await db.execute(paginated_query))
 
-    paginated_query = (
-        query.order_by(order)
-        .limit(pagination.per_page)
-        .offset((pagination.page - 1) * pagination.per_page)
+    return _paginated_response(items, pagination, representer, order_by)
+
+
+def _projected_query(
+    query: Select,
+    representer: type[BaseModel],
+    order_by: Sequence[SortKey],
+) -> Select | None:
+    # selecting only the representer's columns skips loading unused columns
+    # and building ORM objects, representers with anything but plain or
+    # labeled columns of the query keep loading whole entities
+    columns = query.selected_columns
+    names = [*representer.model_fields]
+
+    if any(name not in columns for name in names):
+        return None
+
+    # sort keys the representer does not show are still needed for cursors
+    return query.with_only_columns(
+        *(columns[name] for name in names),
+        *(key for key in order_by if key.key not in names),
+        maintain_column_froms=True,
     )
 
-    items = db.scalars(paginated_query)
-    represent_items = [representer.model_validate(event) for event in items]
+
+def _paginated_query(
+    query: Select,
+    pagination: PaginationParams,
+    order_by: Sequence[SortKey],
+) -> Select:
+    ### HELPER FUNCTIONS ###
+    def _cursor_value(key: SortKey, value: Any) -> Any:
+        try:
+            return TypeAdapter(key.type.python_type).validate_python(value)
+        except ValidationError:
+            raise InvalidCursorException()
+
+    ### MAIN LOGIC ###
+    cursor = pagination.cursor
+    descending = (pagination.order == SortEnum.DESC) != _is_backward(pagination)
+
+    paginated_query = query.order_by(
+        *(desc(key) if descending else asc(key) for key in order_by)
+    ).limit(pagination.per_page + 1)
+
+    if cursor is None:
+        return paginated_query.offset((pagination.page - 1) * pagination.per_page)
+
+    if cursor.sort != sort_digest(order_by) or len(cursor.values) != len(order_by):
+        raise InvalidCursorException()
+
+    # a row comparison continues after the cursor across all sort keys
+    keys = tuple_(*order_by)
+    values = tuple_(*map(_cursor_value, order_by, cursor.values))
+    return paginated_query.where(keys < values if descending else keys > values)
+
+
+def _paginated_response[T: BaseModel](
+    items: list[Any],
+    pagination: PaginationParams,
+    representer: type[T],
+    order_by: Sequence[SortKey],
+) -> PaginatedResponse[T]:
+    ### HELPER FUNCTIONS ###
+    def _build_cursor(item: Any, direction: CursorDirectionEnum) -> str:
+        return encode_cursor(
+            Cursor(
+                values=[getattr(item, key.key) for key in order_by],
+                sort=sort,
+                direction=direction,
+            )
+        )
+
+    ### MAIN LOGIC ###
+    cursor = pagination.cursor
+    sort = sort_digest(order_by)
+    backward = _is_backward(pagination)
+    has_more = len(items) > pagination.per_page
+    items = items[: pagination.per_page]
+
+    if backward:
+        items.reverse()
+
+    if cursor is None:
+        has_next, has_prev = has_more, pagination.page > 1
+    elif backward:
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, True
+
+    represent_items = [
+        representer.model_validate(item._asdict() if isinstance(item, Row) else item)
+        for item in items
+    ]
 
     return PaginatedResponse[T](
         per_page=pagination.per_page,
-        page=pagination.page,
+        page=pagination.page if cursor is None else None,
         items=represent_items,
+        next_cursor=(
+            _build_cursor(items[-1], CursorDirectionEnum.NEXT)
+            if has_next and items
+            else None
+        ),
+        prev_cursor=(
+            _build_cursor(items[0], CursorDirectionEnum.PREV)
+            if has_prev and items
+            else None
+        ),
+    )
+
+
+def _is_backward(pagination: PaginationParams) -> bool:
+    return (
+        pagination.cursor is not None
+        and pagination.cursor.direction == CursorDirectionEnum.PREV
     )
@@ -0,0 +1,86 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from hashlib import blake2b
+from typing import Any, Generic, Mapping, TypeVar
+
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+
+T = TypeVar("T")
+
+
+# validates a route's result once and dumps it straight to JSON, the route's
+# response_model is then only used to document the body
+class RepresentationAdapter(Generic[T]):
+    def __init__(self, representer: type[T]):
+        self.adapter: TypeAdapter[T] = TypeAdapter(representer)
+
+    def response(
+        self,
+        content: Any,
+        status_code: int = status.HTTP_200_OK,
+        headers: Mapping[str, str] | None = None,
+    ) -> Response:
+        return Response(
+            content=self._dump(content),
+            status_code=status_code,
+            headers=headers,
+            media_type="application/json",
+        )
+
+    def conditional_response(self, request: Request, content: Any) -> Response:
+        # the body is its own version, a matching tag still saves sending it
+        body = self._dump(content)
+        headers = {"ETag": entity_tag(body)}
+
+        if is_not_modified(request, headers):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        return Response(content=body, headers=headers, media_type="application/json")
+
+    def _dump(self, content: Any) -> bytes:
+        # already validated representations pass through as they are, ORM
+        # objects are read through their attributes
+        representation = self.adapter.validate_python(content, from_attributes=True)
+
+        return self.adapter.dump_json(representation)
+
+
+def entity_tag(data: bytes) -> str:
+    return f'"{blake2b(data, digest_size=16).hexdigest()}"'
+
+
+def version_headers(*key: object, last_modified: datetime) -> dict[str, str]:
+    # the tag keeps the sub-second precision that Last-Modified drops
+    last_modified = last_modified.astimezone(timezone.utc)
+
+    return {
+        "ETag": entity_tag(repr((*key, last_modified.isoformat())).encode()),
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+    }
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, headers: Mapping[str, str]) -> bool:
+    # If-None-Match wins over If-Modified-Since, tags compare weakly on GET
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or headers["ETag"] in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or "Last-Modified" not in headers:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        # an invalid date is ignored
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+
+    return parsedate_to_datetime(headers["Last-Modified"]) <= since
@@ -1,3 +1,5 @@
+from unittest.mock import Mock, patch
+from app.metrics.services import collect_metrics
 from app.auth.dependencies import authenticate_user_from_token
 from sqlalchemy.orm import Session
 from app.tests.factories import UserFactory, RevokedTokenFactory
@@ -6,6 +8,7 @@ from app.auth.exceptions import InvalidTokenException
 from datetime import datetime, timedelta
 from jose import jwt
 from app.auth.config import settings
+from app.auth.schemas import Principal
 
 
 def test_token_is_invalid(db_session: Session):
@@ -25,7 +28,7 @@ def test_token_is_revoked(db_session: Session):
         settings.JWT_SECRET_KEY,
     )
 
-    RevokedTokenFactory(hash=access_token)
+    RevokedTokenFactory(token=access_token)
 
     with pytest.raises(InvalidTokenException):
         authenticate_user_from_token(db=db_session, token=access_token)
@@ -77,4 +80,55 @@ def test_everything_is_fine(db_session: Session):
 
     returned_value = authenticate_user_from_token(db=db_session, token=access_token)
 
-    assert returned_value == user
+    assert returned_value == Principal(id=user.id, role=user.role)
+
+
+def test_invalid_tokens_are_rejected_without_database_access():
+    db = Mock(spec=Session)
+    expired_token = jwt.encode(
+        {"expires_at": str(datetime.now() - timedelta(minutes=60)), "sub": "1"},
+        settings.JWT_SECRET_KEY,
+    )
+
+    for token in ("invalid", expired_token):
+        with pytest.raises(InvalidTokenException):
+            authenticate_user_from_token(db=db, token=token)
+
+    db.execute.assert_not_called()
+    db.scalar.assert_not_called()
+
+
+def test_verified_payload_is_memoized(db_session: Session):
+    user = UserFactory()
+    access_token = jwt.encode(
+        {
+            "expires_at": str(datetime.now() + timedelta(minutes=60)),
+            "sub": str(user.id),
+        },
+        settings.JWT_SECRET_KEY,
+    )
+
+    authenticate_user_from_token(db=db_session, token=access_token)
+
+    with patch("app.auth.dependencies.jwt.decode") as decode:
+        principal = authenticate_user_from_token(db=db_session, token=access_token)
+
+    decode.assert_not_called()
+    assert principal.id == user.id
+
+
+def test_authentication_stages_are_timed(db_session: Session):
+    user = UserFactory()
+    access_token = jwt.encode(
+        {
+            "expires_at": str(datetime.now() + timedelta(minutes=60)),
+            "sub": str(user.id),
+        },
+        settings.JWT_SECRET_KEY,
+    )
+
+    authenticate_user_from_token(db=db_session, token=access_token)
+
+    stages = collect_metrics()["authentication"]
+    assert {"decode", "expiry", "revocation", "principal"} <= stages.keys()
+    assert stages["principal"]["seconds"]["count"] >= 1
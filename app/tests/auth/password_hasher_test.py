@@ -0,0 +1,64 @@
+import asyncio
+import pytest
+from httpx import AsyncClient
+from app.auth.config import settings
+from app.auth.exceptions import PasswordHasherOverloadedException
+from app.auth.hashers import PasswordHasher, password_hasher
+from app.auth.router import router as auth_router
+from app.tests.factories import UserFactory
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("executor", ["process", "thread"])
+async def test_hash_and_verify(executor: str):
+    hasher = PasswordHasher(workers=1, max_queue=1, executor=executor)
+
+    try:
+        hashed_password = await hasher.hash("Password100!")
+
+        assert await hasher.verify("Password100!", hashed_password)
+        assert not await hasher.verify("Password100$", hashed_password)
+    finally:
+        hasher.shutdown()
+
+    metrics = hasher.metrics()
+
+    assert metrics["in_flight"] == 0
+    assert metrics["latency_seconds"]["count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_is_full():
+    hasher = PasswordHasher(workers=1, max_queue=1, executor="thread")
+    hashed_password = settings.PASSWORD_CONTEXT.hash("Password100!")
+
+    try:
+        results = await asyncio.gather(
+            *[hasher.verify("Password100!", hashed_password) for _ in range(3)],
+            return_exceptions=True,
+        )
+    finally:
+        hasher.shutdown()
+
+    assert results[:2] == [True, True]
+    assert isinstance(results[2], PasswordHasherOverloadedException)
+    assert hasher.metrics()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_login_returns_503_when_overloaded(
+    async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    user = UserFactory(hashed_password=settings.PASSWORD_CONTEXT.hash("Password100!"))
+    monkeypatch.setattr(password_hasher, "max_queue", -password_hasher.workers)
+
+    json_data = {"username": user.username, "password": "Password100!"}
+
+    response = await async_client.post(auth_router.prefix, data=json_data)
+    response_data = response.json()
+
+    expected_exception = PasswordHasherOverloadedException()
+
+    assert response.status_code == expected_exception.status_code
+    assert response_data["detail"] == expected_exception.detail
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,63 @@
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+from app.auth.caches import TTLCache
+from app.auth.dependencies import authenticate_user_from_token
+from app.tests import utils
+from app.tests.factories import UserFactory
+from app.users.enums import UserRole
+from app.users.models import User
+
+
+def _token(user_id: int) -> str:
+    return utils.generate_user_auth_header(user_id)["Authorization"].split()[1]
+
+
+def test_ttl_cache_expires_items():
+    cache: TTLCache[int, str] = TTLCache(max_size=10, ttl_seconds=0)
+
+    cache.set(1, "value")
+
+    assert cache.get(1) is None
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache: TTLCache[int, str] = TTLCache(max_size=2, ttl_seconds=60)
+
+    cache.set(1, "one")
+    cache.set(2, "two")
+    cache.get(1)
+    cache.set(3, "three")
+
+    assert cache.get(1) == "one"
+    assert cache.get(2) is None
+    assert cache.get(3) == "three"
+
+
+def test_authenticated_principal_is_cached(db_session: Session):
+    user = UserFactory()
+    token = _token(user.id)
+
+    principal = authenticate_user_from_token(db=db_session, token=token)
+
+    # bypasses the ORM events, so only a cache hit can still resolve the user
+    db_session.execute(delete(User).where(User.id == user.id))
+
+    assert authenticate_user_from_token(db=db_session, token=token) == principal
+
+
+def test_user_update_invalidates_cached_principal(db_session: Session):
+    user = UserFactory(role=UserRole.ORGANIZER)
+    token = _token(user.id)
+
+    assert (
+        authenticate_user_from_token(db=db_session, token=token).role
+        == UserRole.ORGANIZER
+    )
+
+    user.role = UserRole.PARTICIPANT
+    db_session.flush()
+
+    assert (
+        authenticate_user_from_token(db=db_session, token=token).role
+        == UserRole.PARTICIPANT
+    )
@@ -0,0 +1,26 @@
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.auth.models import RevokedToken
+from app.auth.tasks import purge_expired_revoked_tokens
+from app.tests.factories import RevokedTokenFactory
+
+
+def test_nothing_to_purge(db_session: Session):
+    RevokedTokenFactory()
+
+    assert purge_expired_revoked_tokens(db_session) == 0
+    assert len(db_session.scalars(select(RevokedToken)).all()) == 1
+
+
+def test_purges_only_expired_tokens_in_batches(db_session: Session):
+    expired_at = datetime.now() - timedelta(minutes=1)
+    RevokedTokenFactory.create_batch(5, expires_at=expired_at)
+    valid_tokens = RevokedTokenFactory.create_batch(2)
+
+    purged = purge_expired_revoked_tokens(db_session, batch_size=2)
+
+    remaining_ids = db_session.scalars(select(RevokedToken.id)).all()
+
+    assert purged == 5
+    assert set(remaining_ids) == {token.id for token in valid_tokens}
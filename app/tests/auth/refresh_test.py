@@ -1,7 +1,8 @@
 from pydantic import ValidationError
 import pytest
 from httpx import AsyncClient
-from app.auth.schemas import RepresentJWT
+from app.auth.dependencies import get_payload_from_refresh_token
+from app.auth.schemas import DataFromRefreshToken, RefreshTokenParams, RepresentJWT
 from app.tests.factories import RevokedTokenFactory
 from app.auth.router import router as auth_router
 from fastapi import status
@@ -10,9 +11,12 @@ from app.tests.factories import UserFactory
 from datetime import datetime, timedelta
 from jose import jwt
 from app.auth.config import settings
+from app.database.config import settings as database_settings
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
+from sqlalchemy import event, select, func
 from app.auth.models import RevokedToken
+from app.auth.utils import token_digest
+from app.main import app
 
 REFRESH_URL = f"{auth_router.prefix}/refresh"
 
@@ -53,7 +57,7 @@ async def test_refresh_token_is_revoked(async_client: AsyncClient):
         settings.JWT_REFRESH_SECRET_KEY,
     )
 
-    RevokedTokenFactory(hash=refresh_token)
+    RevokedTokenFactory(token=refresh_token)
 
     json_data = {"refresh_token": refresh_token}
 
@@ -87,7 +91,7 @@ async def test_access_token_is_revoked(async_client: AsyncClient):
         settings.JWT_REFRESH_SECRET_KEY,
     )
 
-    RevokedTokenFactory(hash=access_token)
+    RevokedTokenFactory(token=access_token)
 
     json_data = {"refresh_token": refresh_token}
 
@@ -198,9 +202,111 @@ async def test_everything_is_fine(db_session: Session, async_client: AsyncClient
     db_revoked_hashes = db_session.scalars(select(RevokedToken.hash)).all()
 
     assert response.status_code == status.HTTP_201_CREATED
-    assert set(db_revoked_hashes) == set([access_token, refresh_token])
+    assert set(db_revoked_hashes) == {
+        token_digest(access_token),
+        token_digest(refresh_token),
+    }
 
     try:
         RepresentJWT(**response_data)
     except ValidationError as e:
         pytest.fail(str(e))
+
+
+@pytest.mark.asyncio
+async def test_refresh_takes_two_statements(
+    db_session: Session, async_client: AsyncClient
+):
+    user = UserFactory()
+
+    access_payload = {
+        "expires_at": str(datetime.now() + timedelta(minutes=60)),
+        "sub": str(user.id),
+    }
+    access_token = jwt.encode(
+        access_payload,
+        settings.JWT_SECRET_KEY,
+    )
+    refresh_payload = {
+        "expires_at": str(datetime.now() + timedelta(minutes=60)),
+        "sub": access_token,
+    }
+    refresh_token = jwt.encode(
+        refresh_payload,
+        settings.JWT_REFRESH_SECRET_KEY,
+    )
+
+    db_session.flush()
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    connection = db_session.connection()
+    event.listen(connection, "before_cursor_execute", _count)
+    try:
+        response = await async_client.post(
+            REFRESH_URL, json={"refresh_token": refresh_token}
+        )
+    finally:
+        event.remove(connection, "before_cursor_execute", _count)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert len(statements) == 2
+    assert statements[0].startswith("SELECT")
+    assert statements[1].startswith("INSERT")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refresh_with_the_same_token(
+    db_session: Session, async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    # the competing revocation runs on the request's connection
+    monkeypatch.setattr(database_settings, "DATABASE_QUERY_BUDGET_ENFORCED", False)
+
+    user = UserFactory()
+
+    access_payload = {
+        "expires_at": str(datetime.now() + timedelta(minutes=60)),
+        "sub": str(user.id),
+    }
+    access_token = jwt.encode(
+        access_payload,
+        settings.JWT_SECRET_KEY,
+    )
+    refresh_payload = {
+        "expires_at": str(datetime.now() + timedelta(minutes=60)),
+        "sub": access_token,
+    }
+    refresh_token = jwt.encode(
+        refresh_payload,
+        settings.JWT_REFRESH_SECRET_KEY,
+    )
+
+    # another refresh with the same token revokes it between the check and
+    # the insert of this one
+    def _replayed(params: RefreshTokenParams) -> DataFromRefreshToken:
+        data = get_payload_from_refresh_token(params, db=db_session)
+        db_session.add(
+            RevokedToken(
+                hash=token_digest(refresh_token),
+                expires_at=datetime.now() + timedelta(minutes=60),
+            )
+        )
+        db_session.flush()
+        return data
+
+    app.dependency_overrides[get_payload_from_refresh_token] = _replayed
+    try:
+        response = await async_client.post(
+            REFRESH_URL, json={"refresh_token": refresh_token}
+        )
+    finally:
+        del app.dependency_overrides[get_payload_from_refresh_token]
+
+    response_data = response.json()
+
+    expected_exception = InvalidTokenException()
+
+    assert response.status_code == expected_exception.status_code
+    assert response_data["detail"] == expected_exception.detail
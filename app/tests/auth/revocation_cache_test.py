@@ -0,0 +1,181 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import Engine, delete, insert
+from sqlalchemy.orm import Session
+from app.auth.caches import BloomFilter, RevocationCache, revocation_cache
+from app.auth.dependencies import authenticate_user_from_token
+from app.auth.exceptions import InvalidTokenException
+from app.auth.models import RevokedToken
+from app.auth.router import router as auth_router
+from app.tests import utils
+from app.tests.factories import RevokedTokenFactory, UserFactory
+
+REVOKE_URL = f"{auth_router.prefix}/revoke"
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom_filter = BloomFilter(capacity=1_000, false_positive_rate=0.01)
+    keys = [f"token-{i}".encode() for i in range(1_000)]
+
+    for key in keys:
+        bloom_filter.add(key)
+
+    assert all(key in bloom_filter for key in keys)
+
+
+def test_bloom_filter_false_positive_rate():
+    bloom_filter = BloomFilter(capacity=1_000, false_positive_rate=0.01)
+
+    for i in range(1_000):
+        bloom_filter.add(f"revoked-{i}".encode())
+
+    false_positives = sum(
+        f"not-revoked-{i}".encode() in bloom_filter for i in range(10_000)
+    )
+
+    assert false_positives / 10_000 < 0.02
+
+
+def test_bloom_filter_counts_distinct_keys():
+    bloom_filter = BloomFilter(capacity=100, false_positive_rate=0.01)
+
+    bloom_filter.add(b"token")
+    bloom_filter.add(b"token")
+
+    assert bloom_filter.count == 1
+
+
+def test_cache_not_loaded_defers_to_database():
+    cache = RevocationCache(
+        capacity=100, max_capacity=100, false_positive_rate=0.01, rebuild_seconds=60
+    )
+
+    assert not cache.loaded
+    assert cache.might_be_revoked(b"token")
+
+
+def test_sync_loads_revoked_tokens(db_session: Session):
+    revoked_token = RevokedTokenFactory()
+    cache = RevocationCache(
+        capacity=100, max_capacity=100, false_positive_rate=0.01, rebuild_seconds=60
+    )
+
+    cache.sync(db_session)
+
+    assert cache.loaded
+    assert cache.might_be_revoked(revoked_token.hash)
+    assert not cache.might_be_revoked(b"not-revoked")
+
+
+def test_resync_picks_up_tokens_revoked_by_other_workers(db_session: Session):
+    cache = RevocationCache(
+        capacity=100, max_capacity=100, false_positive_rate=0.01, rebuild_seconds=60
+    )
+    cache.sync(db_session)
+
+    revoked_token = RevokedTokenFactory()
+    assert not cache.might_be_revoked(revoked_token.hash)
+
+    cache.sync(db_session)
+    assert cache.might_be_revoked(revoked_token.hash)
+
+
+def test_sync_rebuilds_when_over_capacity(db_session: Session):
+    cache = RevocationCache(
+        capacity=2, max_capacity=8, false_positive_rate=0.01, rebuild_seconds=60
+    )
+    cache.sync(db_session)
+
+    for i in range(3):
+        cache.add(f"expired-{i}".encode())
+
+    revoked_token = RevokedTokenFactory()
+    cache.sync(db_session)
+
+    assert cache.might_be_revoked(revoked_token.hash)
+    assert not cache.might_be_revoked(b"expired-0")
+
+
+def test_resync_picks_up_tokens_committed_after_newer_ones(
+    db_session: Session, database_engine: Engine
+):
+    cache = RevocationCache(
+        capacity=100, max_capacity=100, false_positive_rate=0.01, rebuild_seconds=60
+    )
+    late_token = RevokedTokenFactory.build()
+
+    # the late revocation takes its id first but commits after a sync and after
+    # tokens revoked later on
+    with database_engine.connect() as late:
+        late.execute(
+            insert(RevokedToken).values(
+                hash=late_token.hash, expires_at=late_token.expires_at
+            )
+        )
+        cache.sync(db_session)
+        for _ in range(3):
+            RevokedTokenFactory()
+        cache.sync(db_session)
+        late.commit()
+
+    try:
+        cache.sync(db_session)
+
+        assert cache.might_be_revoked(late_token.hash)
+    finally:
+        with database_engine.begin() as cleanup:
+            cleanup.execute(
+                delete(RevokedToken).where(RevokedToken.hash == late_token.hash)
+            )
+
+
+def test_full_filter_grows_instead_of_rebuilding_on_every_resync(
+    db_session: Session,
+):
+    cache = RevocationCache(
+        capacity=2, max_capacity=8, false_positive_rate=0.01, rebuild_seconds=60
+    )
+    for _ in range(3):
+        RevokedTokenFactory()
+
+    cache.sync(db_session)
+    cache.sync(db_session)
+    # a key only this worker knows survives as long as no rebuild drops it
+    cache.add(b"revoked-here")
+    cache.sync(db_session)
+
+    assert cache.might_be_revoked(b"revoked-here")
+
+
+def test_filter_stops_growing_at_max_capacity(db_session: Session):
+    cache = RevocationCache(
+        capacity=2, max_capacity=4, false_positive_rate=0.01, rebuild_seconds=60
+    )
+    revoked_tokens = [RevokedTokenFactory() for _ in range(6)]
+
+    cache.sync(db_session)
+    cache.sync(db_session)
+    rebuilt_at = cache._rebuilt_at
+    cache.sync(db_session)
+
+    assert cache._filter.capacity == 4
+    assert cache._rebuilt_at == rebuilt_at
+    assert all(cache.might_be_revoked(token.hash) for token in revoked_tokens)
+
+
+@pytest.mark.asyncio
+async def test_revoked_token_is_rejected_with_loaded_cache(
+    db_session: Session, async_client: AsyncClient
+):
+    user = UserFactory()
+    headers = utils.generate_user_auth_header(user.id)
+    token = headers["Authorization"].removeprefix("Bearer ")
+
+    revocation_cache.sync(db_session)
+
+    assert authenticate_user_from_token(db=db_session, token=token).id == user.id
+
+    await async_client.post(REVOKE_URL, json={"token": token})
+
+    with pytest.raises(InvalidTokenException):
+        authenticate_user_from_token(db=db_session, token=token)
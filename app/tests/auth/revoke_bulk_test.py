@@ -0,0 +1,101 @@
+import pytest
+from httpx import AsyncClient
+from app.tests.factories import RevokedTokenFactory, UserFactory
+from app.auth.router import router as auth_router
+from app.auth.dependencies import authenticate_user_from_token
+from app.auth.exceptions import InvalidTokenException
+from app.auth.services import generate_jtw_data, revoke_user_sessions
+from app.tests import utils
+from fastapi import status
+from sqlalchemy.orm import Session
+from app.auth.models import RevokedToken
+from sqlalchemy import select
+from app.auth.utils import token_digest
+from datetime import datetime, timedelta
+
+REVOKE_BULK_URL = f"{auth_router.prefix}/revoke/bulk"
+REVOKE_SESSIONS_URL = f"{auth_router.prefix}/revoke/sessions"
+REFRESH_URL = f"{auth_router.prefix}/refresh"
+
+
+@pytest.mark.asyncio
+async def test_revoke_tokens(db_session: Session, async_client: AsyncClient):
+    RevokedTokenFactory(token="revoked")
+    tokens = ["revoked", "first", "second"]
+
+    response = await async_client.post(REVOKE_BULK_URL, json={"tokens": tokens})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert set(db_session.scalars(select(RevokedToken.hash)).all()) == {
+        token_digest(token) for token in tokens
+    }
+
+
+@pytest.mark.asyncio
+async def test_revoke_no_tokens(async_client: AsyncClient):
+    response = await async_client.post(REVOKE_BULK_URL, json={"tokens": []})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_revoke_sessions_requires_authentication(async_client: AsyncClient):
+    response = await async_client.post(REVOKE_SESSIONS_URL, json={})
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_revoke_sessions(db_session: Session, async_client: AsyncClient):
+    user = UserFactory()
+    jwt_data = generate_jtw_data(user_id=user.id)
+
+    response = await async_client.post(
+        REVOKE_SESSIONS_URL, json={}, headers=utils.auth_header(jwt_data.access_token)
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    with pytest.raises(InvalidTokenException):
+        authenticate_user_from_token(db=db_session, token=jwt_data.access_token)
+
+    response = await async_client.post(
+        REFRESH_URL, json={"refresh_token": jwt_data.refresh_token}
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    new_token = generate_jtw_data(user_id=user.id).access_token
+
+    assert authenticate_user_from_token(db=db_session, token=new_token).id == user.id
+
+
+@pytest.mark.asyncio
+async def test_revoke_sessions_issued_before(
+    db_session: Session, async_client: AsyncClient
+):
+    user = UserFactory()
+    token = generate_jtw_data(user_id=user.id).access_token
+    issued_before = datetime.now() - timedelta(minutes=5)
+
+    response = await async_client.post(
+        REVOKE_SESSIONS_URL,
+        json={"issued_before": issued_before.isoformat()},
+        headers=utils.auth_header(token),
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert authenticate_user_from_token(db=db_session, token=token).id == user.id
+
+
+def test_revoke_user_sessions_invalidates_cached_principals(db_session: Session):
+    users = UserFactory.create_batch(3)
+    tokens = [generate_jtw_data(user_id=user.id).access_token for user in users]
+
+    for token in tokens:
+        authenticate_user_from_token(db=db_session, token=token)
+
+    revoke_user_sessions([user.id for user in users], db=db_session)
+
+    for token in tokens:
+        with pytest.raises(InvalidTokenException):
+            authenticate_user_from_token(db=db_session, token=token)
@@ -6,6 +6,10 @@ from fastapi import status
 from sqlalchemy.orm import Session
 from app.auth.models import RevokedToken
 from sqlalchemy import select, func
+from app.auth.utils import token_digest
+from app.auth.services import generate_jtw_data
+from app.auth.config import settings
+from datetime import datetime, timedelta
 
 REVOKE_URL = f"{auth_router.prefix}/revoke"
 
@@ -29,15 +33,15 @@ async def test_missing_params(async_client: AsyncClient):
 async def test_revoke_already_revoked_token(
     db_session: Session, async_client: AsyncClient
 ):
-    revoked_token = RevokedTokenFactory()
+    RevokedTokenFactory(token="token")
 
-    json_data = {"token": revoked_token.hash}
+    json_data = {"token": "token"}
 
     assert (
         db_session.scalar(
             select(func.count())
             .select_from(RevokedToken)
-            .where(RevokedToken.hash == json_data["token"])
+            .where(RevokedToken.hash == token_digest(json_data["token"]))
         )
         == 1
     )
@@ -49,7 +53,7 @@ async def test_revoke_already_revoked_token(
         db_session.scalar(
             select(func.count())
             .select_from(RevokedToken)
-            .where(RevokedToken.hash == json_data["token"])
+            .where(RevokedToken.hash == token_digest(json_data["token"]))
         )
         == 1
     )
@@ -68,7 +72,44 @@ async def test_revoke_token(db_session: Session, async_client: AsyncClient):
         db_session.scalar(
             select(func.count())
             .select_from(RevokedToken)
-            .where(RevokedToken.hash == json_data["token"])
+            .where(RevokedToken.hash == token_digest(json_data["token"]))
         )
         == 1
     )
+
+
+@pytest.mark.asyncio
+async def test_revoke_token_stores_expiry_from_payload(
+    db_session: Session, async_client: AsyncClient
+):
+    token = generate_jtw_data(user_id=1)
+
+    response = await async_client.post(REVOKE_URL, json={"token": token.refresh_token})
+
+    revoked_token = db_session.execute(
+        select(RevokedToken).where(
+            RevokedToken.hash == token_digest(token.refresh_token)
+        )
+    ).scalar_one()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert revoked_token.expires_at == token.refresh_token_expires_at
+    assert revoked_token.revoked_at > datetime.now() - timedelta(minutes=1)
+
+
+@pytest.mark.asyncio
+async def test_revoke_malformed_token_expires_after_max_lifetime(
+    db_session: Session, async_client: AsyncClient
+):
+    response = await async_client.post(REVOKE_URL, json={"token": "malformed"})
+
+    revoked_token = db_session.execute(
+        select(RevokedToken).where(RevokedToken.hash == token_digest("malformed"))
+    ).scalar_one()
+
+    max_lifetime = timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert revoked_token.expires_at > datetime.now() + max_lifetime - timedelta(
+        minutes=1
+    )
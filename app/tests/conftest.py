@@ -1,13 +1,15 @@
 import pytest
-from sqlalchemy import create_engine, text
+from sqlalchemy import NullPool, create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from httpx import ASGITransport, AsyncClient
+from httpx import ASGITransport, AsyncClient, Request, Response
 import pytest_asyncio
 
 from app.main import app
 from app.database.model import Base
 from app.database.config import settings
 from app.tests.factories import setup_factories
+from app.auth.caches import payload_cache, principal_cache, revocation_cache
 
 TEST_DB_NAME = f"{settings.DATABASE_NAME}_test"
 
@@ -17,6 +19,7 @@ DATABASE_URL = "postgresql+psycopg2://{user}:{password}@{host}:{port}".format(
     host=settings.DATABASE_HOST,
     port=settings.DATABASE_PORT,
 )
+ASYNC_DATABASE_URL = DATABASE_URL.replace("+psycopg2", "+asyncpg", 1)
 
 
 @pytest.fixture(scope="session")
@@ -47,7 +50,20 @@ def connection(database_engine):
 
 
 @pytest.fixture
-def db_session(connection):
+def db_session(connection, database_engine):
+    # the async stack runs on its own connections and cannot see an uncommitted
+    # outer transaction, so there factories commit and tables are truncated
+    if settings.DATABASE_ASYNC:
+        session = sessionmaker(bind=database_engine)()
+        setup_factories(session, persistence="commit")
+        yield session
+        session.close()
+
+        with database_engine.begin() as truncate_connection:
+            tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+            truncate_connection.execute(text(f"TRUNCATE {tables} CASCADE"))
+        return
+
     transaction = connection.begin()
     session_factory = sessionmaker(bind=connection)
 
@@ -57,14 +73,66 @@ def db_session(connection):
     transaction.rollback()
 
 
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "DATABASE_QUERY_BUDGET_ENFORCED", True)
+
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    yield
+    revocation_cache.clear()
+    principal_cache.clear()
+    payload_cache.clear()
+
+
 @pytest_asyncio.fixture
 async def async_client(db_session):
     from app import main
-    from app.database.dependencies import get_db
+    from app.database.dependencies import (
+        get_async_db,
+        get_async_read_db,
+        get_db,
+        get_read_db,
+    )
 
     main.app.dependency_overrides[get_db] = lambda: db_session
+    main.app.dependency_overrides[get_read_db] = lambda: db_session
+
+    # every test runs on a fresh event loop, asyncpg connections must not outlive it
+    async_engine = create_async_engine(
+        f"{ASYNC_DATABASE_URL}/{TEST_DB_NAME}", poolclass=NullPool
+    )
+    async_session_factory = async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
+
+    async def _get_async_db():
+        async with async_session_factory() as db:
+            yield db
+
+    main.app.dependency_overrides[get_async_db] = _get_async_db
+    main.app.dependency_overrides[get_async_read_db] = _get_async_db
+
+    # rows changed by the async stack are reloaded instead of read from the
+    # identity map of the test session
+    async def _expire_test_session(_: Response) -> None:
+        db_session.expire_all()
+
+    # pending factory rows are written up front, so they do not count against
+    # the statements of the request
+    async def _flush_test_session(_: Request) -> None:
+        db_session.flush()
+
+    event_hooks: dict[str, list] = {"request": [_flush_test_session]}
+    if settings.DATABASE_ASYNC:
+        event_hooks["response"] = [_expire_test_session]
 
     async with AsyncClient(
-        transport=ASGITransport(app=app), base_url="http://test"
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+        event_hooks=event_hooks,
     ) as ac:
         yield ac
+
+    await async_engine.dispose()
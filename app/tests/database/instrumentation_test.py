@@ -0,0 +1,40 @@
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from app.database.instrumentation import QueryBudgetExceededError, QueryStats
+from app.tests import utils
+from app.tests.factories import UserFactory
+from app.users.enums import UserRole
+
+
+def test_query_budget_exceeded():
+    stats = QueryStats("GET /")
+    stats.budget = 1
+
+    stats.record("SELECT 1", 0.001)
+    stats.record("SELECT 2", 0.001)
+
+    with pytest.raises(QueryBudgetExceededError):
+        stats.check()
+
+
+def test_repeated_statement():
+    stats = QueryStats("GET /")
+
+    stats.record("SELECT 1", 0.001)
+    stats.record("SELECT 1", 0.001)
+
+    with pytest.raises(QueryBudgetExceededError):
+        stats.check()
+
+
+@pytest.mark.asyncio
+async def test_server_timing_header(async_client: AsyncClient):
+    user = UserFactory(role=UserRole.PARTICIPANT)
+    headers = utils.generate_user_auth_header(user.id)
+
+    response = await async_client.get("/events", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+    assert 'desc="3 statements"' in response.headers["Server-Timing"]
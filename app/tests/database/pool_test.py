@@ -0,0 +1,36 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+from app.database.pool import InstrumentedQueuePool, pool_metrics
+
+
+def test_pool_metrics(database_engine):
+    engine = create_engine(
+        database_engine.url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+    )
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+        metrics = pool_metrics(engine.pool)
+
+        assert metrics["in_use"] == 1
+        assert metrics["overflow"] == 0
+        assert metrics["checkout_timeouts"] == 1
+        assert metrics["connections_opened"] == 1
+        assert metrics["checkout_wait_seconds"]["count"] == 2
+
+    engine.dispose()
+
+    assert pool_metrics(engine.pool)["checkout_timeouts"] == 1
+
+    with engine.connect():
+        assert pool_metrics(engine.pool)["connections_opened"] == 2
+
+    engine.dispose()
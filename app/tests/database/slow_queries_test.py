@@ -0,0 +1,144 @@
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from sqlalchemy import NullPool, insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import Session
+from app.auth.models import RevokedToken
+from app.config import settings as app_settings
+from app.database import instrumentation
+from app.database.config import settings
+from app.database.slow_queries import REDACTED, SlowQueryLog
+from app.database.router import router as database_router
+from app.exceptions import AccessForbiddenException
+from app.users.models import User
+
+
+@pytest.fixture
+def slow_query_log(monkeypatch: pytest.MonkeyPatch) -> SlowQueryLog:
+    log = SlowQueryLog(
+        size=10,
+        explain_interval_seconds=60,
+        max_concurrent_explains=1,
+        redacted_tables=["revoked_tokens"],
+    )
+    monkeypatch.setattr(instrumentation, "slow_query_log", log)
+    monkeypatch.setattr(settings, "DATABASE_SLOW_QUERY_SECONDS", 0)
+    return log
+
+
+def _wait_for_plan(log: SlowQueryLog) -> dict:
+    deadline = time.monotonic() + 5
+    while log.entries()[-1]["explain"] == "pending" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return log.entries()[-1]
+
+
+def test_slow_statement_is_explained(db_session: Session, slow_query_log: SlowQueryLog):
+    db_session.execute(select(User).where(User.id == 1))
+
+    entry = _wait_for_plan(slow_query_log)
+
+    assert entry["statement"].startswith("SELECT users.id")
+    assert entry["parameters"] == {"id_1": 1}
+    assert entry["explain"] == "done"
+    assert entry["plan"][0]["Plan"]["Relation Name"] == "users"
+
+
+def test_repeated_slow_statement_is_sampled(
+    db_session: Session, slow_query_log: SlowQueryLog
+):
+    db_session.execute(select(User).where(User.id == 1))
+    _wait_for_plan(slow_query_log)
+    db_session.execute(select(User).where(User.id == 2))
+
+    first, second = reversed(slow_query_log.entries())
+
+    assert first["explain"] == "done"
+    assert second["explain"] == "sampled_out"
+
+
+def test_parameters_of_redacted_tables_are_not_kept(
+    db_session: Session, slow_query_log: SlowQueryLog
+):
+    db_session.execute(
+        insert(RevokedToken).values(hash=b"digest", expires_at=datetime(2030, 1, 1))
+    )
+    db_session.execute(select(User).where(User.id == 1))
+
+    users_entry, revoked_tokens_entry = slow_query_log.entries()[:2]
+
+    assert revoked_tokens_entry["statement"].startswith("INSERT INTO revoked_tokens")
+    assert set(revoked_tokens_entry["parameters"].values()) == {REDACTED}
+    assert users_entry["parameters"] == {"id_1": 1}
+
+
+def test_expired_explain_marks_are_dropped(
+    db_session: Session, slow_query_log: SlowQueryLog
+):
+    slow_query_log.explain_interval_seconds = 0
+
+    # every IN list length is a statement of its own
+    for ids in ([1], [1, 2], [1, 2, 3]):
+        db_session.execute(select(User).where(User.id.in_(ids)))
+        _wait_for_plan(slow_query_log)
+
+    assert len(slow_query_log._explained_at) <= 1
+
+
+def test_failed_dispatch_frees_its_explain_slot(
+    db_session: Session, slow_query_log: SlowQueryLog
+):
+    slow_query_log._executor.shutdown()
+
+    db_session.execute(select(User).where(User.id == 1))
+
+    assert slow_query_log.entries()[0]["explain"] == "failed"
+    assert slow_query_log._explains_in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_async_statement_is_explained(
+    database_engine, slow_query_log: SlowQueryLog
+):
+    engine = create_async_engine(
+        database_engine.url.set(drivername="postgresql+asyncpg"), poolclass=NullPool
+    )
+    async with engine.connect() as connection:
+        await connection.execute(select(User).where(User.id == 1))
+
+    for _ in range(500):
+        if slow_query_log.entries()[0]["explain"] != "pending":
+            break
+        await asyncio.sleep(0.01)
+
+    assert slow_query_log.entries()[0]["explain"] == "done"
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_endpoint_needs_internal_token(async_client: AsyncClient):
+    response = await async_client.get(database_router.prefix)
+
+    expected_exception = AccessForbiddenException("invalid internal token")
+
+    assert response.status_code == expected_exception.status_code
+    assert response.json()["detail"] == expected_exception.detail
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_endpoint(
+    async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(app_settings, "INTERNAL_API_TOKEN", "internal")
+
+    response = await async_client.get(
+        database_router.prefix, headers={"X-Internal-Token": "internal"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert isinstance(response.json(), list)
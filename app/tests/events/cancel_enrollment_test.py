@@ -91,3 +91,4 @@ async def test_everything_fine(db_session: Session, async_client: AsyncClient):
 
     assert response.status_code == status.HTTP_200_OK
     assert db_session.scalar(select(func.count()).select_from(Enrollment)) == 0
+    assert db_session.scalar(select(Event.enrolled_count)) == 0
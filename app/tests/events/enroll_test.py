@@ -1,17 +1,33 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
 import pytest
 from httpx import AsyncClient
-from sqlalchemy import func, select
+from sqlalchemy import Engine, delete, event as sqlalchemy_event, func, select
+from sqlalchemy.orm import sessionmaker
 from app.auth.exceptions import InvalidTokenException
-from app.events.exceptions import AlreadyEnrolledException, UserNotParticipantException
+from app.auth.schemas import Principal
+from app.events import services
+from app.events.exceptions import (
+    AlreadyEnrolledException,
+    EventFullException,
+    UserNotParticipantException,
+)
 from app.events.models import Event, Enrollment
 from app.exceptions import NotFoundException
 from app.tests import utils
 from app.tests.factories import EventFactory, UserFactory, EnrollmentFactory
 from app.users.enums import UserRole
+from app.users.models import User
 from sqlalchemy.orm import Session
 from fastapi import status
 
 
+CONCURRENT_ENROLLMENTS = 1000
+CONCURRENT_WORKERS = 50
+CONCURRENT_CAPACITY = 100
+
+
 def url(event_id: int) -> str:
     return f"/events/{event_id}/enroll"
 
@@ -31,8 +47,8 @@ async def test_user_unauthorized(async_client: AsyncClient):
 
 @pytest.mark.asyncio
 async def test_event_not_found(async_client: AsyncClient):
-    current_user = UserFactory()
-    event = EventFactory(organizer=current_user)
+    current_user = UserFactory(role=UserRole.PARTICIPANT)
+    event = EventFactory()
 
     headers = utils.generate_user_auth_header(current_user.id)
 
@@ -101,3 +117,144 @@ async def test_everything_is_fine(db_session: Session, async_client: AsyncClient
         )
         == 1
     )
+    assert db_session.scalar(select(Event.enrolled_count)) == 1
+
+
+@pytest.mark.asyncio
+async def test_event_full(db_session: Session, async_client: AsyncClient):
+    current_user = UserFactory(role=UserRole.PARTICIPANT)
+    event = EventFactory(max_capacity=1)
+    EnrollmentFactory(event=event)
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    response = await async_client.post(url(event.id), headers=headers)
+    response_data = response.json()
+
+    expected_exception = EventFullException()
+
+    assert response.status_code == expected_exception.status_code
+    assert response_data["detail"] == expected_exception.detail
+    assert db_session.scalar(select(func.count()).select_from(Enrollment)) == 1
+    assert db_session.scalar(select(Event.enrolled_count)) == 1
+
+
+@pytest.fixture
+def committed_event(database_engine: Engine):
+    # concurrent enrollments run in their own committed transactions, so the
+    # data lives outside the per-test rollback and is removed explicitly
+    session_factory = sessionmaker(bind=database_engine)
+
+    with session_factory() as db:
+        participants = [
+            User(
+                username=f"concurrent-{n}",
+                hashed_password="hash",
+                role=UserRole.PARTICIPANT,
+            )
+            for n in range(CONCURRENT_ENROLLMENTS)
+        ]
+        event = Event(
+            title="Concurrent",
+            description="Concurrent",
+            max_capacity=CONCURRENT_CAPACITY,
+            event_date=datetime.now(),
+            organizer=participants[0],
+        )
+        db.add_all([event, *participants])
+        db.commit()
+
+        event_id = event.id
+        participant_ids = [participant.id for participant in participants]
+
+    yield session_factory, event_id, participant_ids
+
+    with session_factory() as db:
+        db.execute(delete(Enrollment).where(Enrollment.event_id == event_id))
+        db.execute(delete(Event).where(Event.id == event_id))
+        db.execute(delete(User).where(User.id.in_(participant_ids)))
+        db.commit()
+
+
+def _enroll_concurrently(
+    committed_event: tuple[sessionmaker, int, list[int]], participant_ids: list[int]
+) -> tuple[list[bool], int, int]:
+    session_factory, event_id, _ = committed_event
+
+    def _enroll(participant_id: int) -> bool:
+        with session_factory() as db:
+            try:
+                services.enroll_for_event(
+                    event_id,
+                    db=db,
+                    current_user=Principal(
+                        id=participant_id, role=UserRole.PARTICIPANT
+                    ),
+                )
+            except (AlreadyEnrolledException, EventFullException):
+                return False
+
+        return True
+
+    with ThreadPoolExecutor(max_workers=CONCURRENT_WORKERS) as executor:
+        enrolled = list(executor.map(_enroll, participant_ids))
+
+    with session_factory() as db:
+        enrolled_count = db.scalar(
+            select(Event.enrolled_count).where(Event.id == event_id)
+        )
+        enrollments_count = db.scalar(
+            select(func.count())
+            .select_from(Enrollment)
+            .where(Enrollment.event_id == event_id)
+        )
+
+    return enrolled, enrolled_count, enrollments_count
+
+
+def test_concurrent_enrollments_never_oversell(committed_event):
+    enrolled, enrolled_count, enrollments_count = _enroll_concurrently(
+        committed_event, committed_event[2]
+    )
+
+    assert sum(enrolled) == CONCURRENT_CAPACITY
+    assert enrolled_count == CONCURRENT_CAPACITY
+    assert enrollments_count == CONCURRENT_CAPACITY
+
+
+def test_concurrent_duplicate_enrollments(committed_event):
+    participant_id = committed_event[2][1]
+
+    enrolled, enrolled_count, enrollments_count = _enroll_concurrently(
+        committed_event, [participant_id] * 20
+    )
+
+    assert sum(enrolled) == 1
+    assert enrolled_count == 1
+    assert enrollments_count == 1
+
+
+@pytest.mark.asyncio
+async def test_enrollment_takes_a_single_statement(
+    db_session: Session, async_client: AsyncClient
+):
+    current_user = UserFactory(role=UserRole.PARTICIPANT)
+    event_url = url(EventFactory().id)
+
+    headers = utils.generate_user_auth_header(current_user.id)
+    db_session.flush()
+    statements: list[str] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    # the async stack runs on engines of its own, every engine is listened to
+    sqlalchemy_event.listen(Engine, "before_cursor_execute", _capture)
+    try:
+        response = await async_client.post(event_url, headers=headers)
+    finally:
+        sqlalchemy_event.remove(Engine, "before_cursor_execute", _capture)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    # the other statements authenticate the user
+    assert len([statement for statement in statements if "events" in statement]) == 1
@@ -1,8 +1,10 @@
 import pytest
+from datetime import datetime, timedelta
 from httpx import AsyncClient
 from app.events.exceptions import UserNotParticipantException
 from app.tests import utils
 from app.auth.exceptions import InvalidTokenException
+from app.pagination.exceptions import InvalidCursorException
 from app.tests.factories import EventFactory, UserFactory
 from app.users.enums import UserRole
 from fastapi import status
@@ -125,3 +127,324 @@ async def test_everything_fine_with_all_filters(async_client: AsyncClient):
 
     assert response.status_code == status.HTTP_200_OK
     {item["id"] for item in response_data["items"]} == {event_two.id, event_four.id}
+
+
+@pytest.mark.asyncio
+async def test_date_range_in_date_order(async_client: AsyncClient):
+    current_user = UserFactory(role=UserRole.PARTICIPANT)
+
+    now = datetime.now()
+    EventFactory(event_date=now - timedelta(days=1))
+    later = EventFactory(event_date=now + timedelta(days=3))
+    sooner = EventFactory(event_date=now + timedelta(days=1))
+    same_day = EventFactory(event_date=now + timedelta(days=1))
+    EventFactory(event_date=now + timedelta(days=10))
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    params: dict[str, str | int] = {
+        "date_from": str(now),
+        "date_to": str(now + timedelta(days=5)),
+        "order": "asc",
+        "per_page": 2,
+    }
+
+    first_response = await async_client.get(URL, headers=headers, params=params)
+    first_response_data = first_response.json()
+
+    params["cursor"] = first_response_data["next_cursor"]
+
+    second_response = await async_client.get(URL, headers=headers, params=params)
+    second_response_data = second_response.json()
+
+    assert first_response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in first_response_data["items"]] == [
+        sooner.id,
+        same_day.id,
+    ]
+    assert second_response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in second_response_data["items"]] == [later.id]
+    assert second_response_data["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_lists_upcoming_events_in_date_order(async_client: AsyncClient):
+    current_user = UserFactory(role=UserRole.PARTICIPANT)
+
+    now = datetime.now()
+    EventFactory(event_date=now - timedelta(days=1))
+    later = EventFactory(event_date=now + timedelta(days=3))
+    sooner = EventFactory(event_date=now + timedelta(days=1))
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    response = await async_client.get(URL, headers=headers, params={"order": "asc"})
+    response_data = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response_data["items"]] == [sooner.id, later.id]
+
+
+@pytest.mark.asyncio
+async def test_include_past_lists_every_event_in_id_order(async_client: AsyncClient):
+    current_user = UserFactory(role=UserRole.PARTICIPANT)
+
+    now = datetime.now()
+    past = EventFactory(event_date=now - timedelta(days=1))
+    upcoming = EventFactory(event_date=now + timedelta(days=1))
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    response = await async_client.get(
+        URL, headers=headers, params={"include_past": True}
+    )
+    response_data = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response_data["items"]] == [upcoming.id, past.id]
+
+
+@pytest.mark.asyncio
+async def test_sort_by_price_counts_unpriced_events_as_free(
+    async_client: AsyncClient,
+):
+    current_user = UserFactory(role=UserRole.PARTICIPANT)
+
+    expensive = EventFactory(price=300)
+    free = EventFactory(price=None)
+    cheap = EventFactory(price=100)
+    also_cheap = EventFactory(price=100)
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    params: dict[str, str | int] = {"sort": "price", "order": "asc", "per_page": 2}
+    item_ids: list[int] = []
+    while True:
+        response = await async_client.get(URL, headers=headers, params=params)
+        response_data = response.json()
+
+        assert response.status_code == status.HTTP_200_OK
+        item_ids.extend(item["id"] for item in response_data["items"])
+
+        if response_data["next_cursor"] is None:
+            break
+        params["cursor"] = response_data["next_cursor"]
+
+    assert item_ids == [free.id, cheap.id, also_cheap.id, expensive.id]
+
+
+@pytest.mark.asyncio
+async def test_sort_by_title(async_client: AsyncClient):
+    current_user = UserFactory(role=UserRole.PARTICIPANT)
+
+    b_event = EventFactory(title="B")
+    a_event = EventFactory(title="A")
+    c_event = EventFactory(title="C")
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    response = await async_client.get(
+        URL, headers=headers, params={"sort": "title", "order": "asc"}
+    )
+    response_data = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response_data["items"]] == [
+        a_event.id,
+        b_event.id,
+        c_event.id,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sort_outside_the_whitelist(async_client: AsyncClient):
+    current_user = UserFactory(role=UserRole.PARTICIPANT)
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    response = await async_client.get(
+        URL, headers=headers, params={"sort": "description"}
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_everything_fine_with_cursor(async_client: AsyncClient):
+    current_user = UserFactory(role=UserRole.PARTICIPANT)
+
+    now = datetime.now()
+    event_one, event_two, event_three = (
+        EventFactory(event_date=now + timedelta(days=days)) for days in (1, 2, 3)
+    )
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    first_response = await async_client.get(
+        URL, headers=headers, params={"per_page": 2}
+    )
+    first_response_data = first_response.json()
+
+    params = {"per_page": 2, "cursor": first_response_data["next_cursor"]}
+
+    second_response = await async_client.get(URL, headers=headers, params=params)
+    second_response_data = second_response.json()
+
+    assert first_response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in first_response_data["items"]] == [
+        event_three.id,
+        event_two.id,
+    ]
+    assert second_response.status_code == status.HTTP_200_OK
+    assert second_response_data["page"] is None
+    assert second_response_data["next_cursor"] is None
+    assert second_response_data["prev_cursor"] is not None
+    assert [item["id"] for item in second_response_data["items"]] == [event_one.id]
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_title_matches_first(async_client: AsyncClient):
+    current_user = UserFactory(role=UserRole.PARTICIPANT)
+
+    description_match = EventFactory(
+        title="Evening meetup", description="Live jazz and a short talk"
+    )
+    title_match = EventFactory(title="Jazz night", description="Bring your friends")
+    EventFactory(title="Chess club", description="Weekly tournament")
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    response = await async_client.get(URL, headers=headers, params={"q": "jazz"})
+    response_data = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response_data["items"]] == [
+        title_match.id,
+        description_match.id,
+    ]
+    assert response_data["items"][0]["rank"] > response_data["items"][1]["rank"]
+    assert response_data["items"][0]["headline"] is None
+
+
+@pytest.mark.asyncio
+async def test_search_highlights_descriptions(async_client: AsyncClient):
+    current_user = UserFactory(role=UserRole.PARTICIPANT)
+
+    EventFactory(title="Evening meetup", description="Live jazz and a short talk")
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    response = await async_client.get(
+        URL, headers=headers, params={"q": "jazz", "highlight": True}
+    )
+    response_data = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response_data["items"][0]["headline"] == (
+        "Live <b>jazz</b> and a short talk"
+    )
+
+
+@pytest.mark.asyncio
+async def test_search_with_cursor(async_client: AsyncClient):
+    current_user = UserFactory(role=UserRole.PARTICIPANT)
+
+    # equally ranked matches are ordered by id
+    events = [
+        EventFactory(title="Jazz night", description="Live music") for _ in range(3)
+    ]
+    EventFactory(title="Chess club", description="Weekly tournament")
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    first_response = await async_client.get(
+        URL, headers=headers, params={"q": "jazz", "per_page": 2}
+    )
+    first_response_data = first_response.json()
+
+    params = {"q": "jazz", "per_page": 2, "cursor": first_response_data["next_cursor"]}
+
+    second_response = await async_client.get(URL, headers=headers, params=params)
+    second_response_data = second_response.json()
+
+    assert [item["id"] for item in first_response_data["items"]] == [
+        events[2].id,
+        events[1].id,
+    ]
+    assert second_response.status_code == status.HTTP_200_OK
+    assert second_response_data["next_cursor"] is None
+    assert [item["id"] for item in second_response_data["items"]] == [events[0].id]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "first_params, second_params",
+    [
+        ({"sort": "price"}, {"sort": "event_date"}),
+        ({"q": "jazz"}, {"q": "night"}),
+    ],
+)
+async def test_cursor_from_another_listing(
+    async_client: AsyncClient, first_params: dict, second_params: dict
+):
+    current_user = UserFactory(role=UserRole.PARTICIPANT)
+
+    for _ in range(2):
+        EventFactory(title="Jazz night", description="Live music")
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    first_response = await async_client.get(
+        URL, headers=headers, params={"per_page": 1, **first_params}
+    )
+    params = {"cursor": first_response.json()["next_cursor"], **second_params}
+
+    response = await async_client.get(URL, headers=headers, params=params)
+    response_data = response.json()
+
+    expected_exception = InvalidCursorException()
+
+    assert response.status_code == expected_exception.status_code
+    assert response_data["detail"] == expected_exception.detail
+
+
+@pytest.mark.asyncio
+async def test_listing_without_search_has_no_rank(async_client: AsyncClient):
+    current_user = UserFactory(role=UserRole.PARTICIPANT)
+
+    EventFactory()
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    response = await async_client.get(URL, headers=headers)
+    response_data = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "rank" not in response_data["items"][0]
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor(async_client: AsyncClient):
+    current_user = UserFactory(role=UserRole.PARTICIPANT)
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    response = await async_client.get(
+        URL, headers=headers, params={"cursor": "invalid"}
+    )
+    response_data = response.json()
+
+    expected_exception = InvalidCursorException()
+
+    assert response.status_code == expected_exception.status_code
+    assert response_data["detail"] == expected_exception.detail
+
+
+@pytest.mark.asyncio
+async def test_openapi_documents_response_model(async_client: AsyncClient):
+    response = await async_client.get("/openapi.json")
+    content = response.json()["paths"][URL]["get"]["responses"]["200"]["content"]
+
+    assert content["application/json"]["schema"] == {
+        "$ref": "#/components/schemas/PaginatedResponse_Union_RepresentEventMatch__RepresentEvent__"
+    }
@@ -79,3 +79,70 @@ async def test_everything_fine(async_client: AsyncClient):
         RepresentEventDetails(**response_data)
     except ValidationError as e:
         pytest.fail(str(e))
+
+
+@pytest.mark.asyncio
+async def test_unchanged_event_is_not_modified(async_client: AsyncClient):
+    current_user = UserFactory(role=UserRole.PARTICIPANT)
+    event = EventFactory()
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    response = await async_client.get(url(event.id), headers=headers)
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+
+    for precondition in ({"If-None-Match": etag}, {"If-Modified-Since": last_modified}):
+        response = await async_client.get(
+            url(event.id), headers={**headers, **precondition}
+        )
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+        # the principal is cached by now, the token's revocation check and the
+        # version are read, the event itself is never loaded
+        assert 'desc="2 statements"' in response.headers["Server-Timing"]
+
+
+@pytest.mark.asyncio
+async def test_changed_event_is_sent_again(async_client: AsyncClient):
+    current_user = UserFactory(role=UserRole.PARTICIPANT)
+    organizer = UserFactory()
+    event = EventFactory(organizer=organizer)
+
+    headers = utils.generate_user_auth_header(current_user.id)
+    organizer_headers = utils.generate_user_auth_header(organizer.id)
+
+    response = await async_client.get(url(event.id), headers=headers)
+    etag = response.headers["ETag"]
+
+    await async_client.patch(
+        f"/organizer/events/{event.id}",
+        headers=organizer_headers,
+        json={"title": "Changed"},
+    )
+    response = await async_client.get(
+        url(event.id), headers={**headers, "If-None-Match": etag}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["title"] == "Changed"
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_conditional_request_for_missing_event(async_client: AsyncClient):
+    current_user = UserFactory(role=UserRole.PARTICIPANT)
+    event = EventFactory()
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    response = await async_client.get(
+        url(event.id + 1), headers={**headers, "If-None-Match": "*"}
+    )
+
+    expected_exception = NotFoundException(Event.__name__)
+
+    assert response.status_code == expected_exception.status_code
+    assert response.json()["detail"] == expected_exception.detail
@@ -99,3 +99,86 @@ async def test_everything_fine(async_client: AsyncClient):
         RepresentEventDetails(**response_data)
     except ValidationError as e:
         pytest.fail(str(e))
+
+
+@pytest.mark.asyncio
+async def test_unchanged_event_is_not_modified(async_client: AsyncClient):
+    current_user = UserFactory()
+    event = EventFactory(organizer=current_user)
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    response = await async_client.get(url(event.id), headers=headers)
+    etag = response.headers["ETag"]
+
+    response = await async_client.get(
+        url(event.id), headers={**headers, "If-None-Match": f"W/{etag}"}
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    # the principal is cached by now, the event itself is never loaded
+    assert 'desc="2 statements"' in response.headers["Server-Timing"]
+
+
+@pytest.mark.asyncio
+async def test_conditional_request_for_foreign_event(async_client: AsyncClient):
+    current_user = UserFactory()
+    event = EventFactory(organizer=UserFactory())
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    response = await async_client.get(
+        url(event.id), headers={**headers, "If-None-Match": "*"}
+    )
+
+    expected_exception = EventNotBelongToUserException()
+
+    assert response.status_code == expected_exception.status_code
+    assert response.json()["detail"] == expected_exception.detail
+
+
+@pytest.mark.asyncio
+async def test_update_moves_the_version(async_client: AsyncClient):
+    current_user = UserFactory()
+    event = EventFactory(organizer=current_user)
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    response = await async_client.get(url(event.id), headers=headers)
+    etag = response.headers["ETag"]
+
+    response = await async_client.patch(
+        url(event.id), headers=headers, json={"title": "Changed"}
+    )
+    updated_etag = response.headers["ETag"]
+
+    assert updated_etag != etag
+
+    response = await async_client.get(
+        url(event.id), headers={**headers, "If-None-Match": updated_etag}
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.asyncio
+async def test_enrollment_keeps_the_version(async_client: AsyncClient):
+    current_user = UserFactory()
+    participant = UserFactory(role=UserRole.PARTICIPANT)
+    event = EventFactory(organizer=current_user)
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    response = await async_client.get(url(event.id), headers=headers)
+    etag = response.headers["ETag"]
+
+    await async_client.post(
+        f"/events/{event.id}/enroll",
+        headers=utils.generate_user_auth_header(participant.id),
+    )
+    response = await async_client.get(
+        url(event.id), headers={**headers, "If-None-Match": etag}
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
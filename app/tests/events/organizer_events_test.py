@@ -4,6 +4,7 @@ from app.events.exceptions import UserNotOrganizerException
 from app.tests import utils
 from app.auth.exceptions import InvalidTokenException
 from app.tests.factories import UserFactory, EventFactory
+from app.pagination.exceptions import UnsupportedSortException
 from fastapi import status
 
 from app.users.enums import UserRole
@@ -66,3 +67,40 @@ async def test_everything_fine_with_events(async_client: AsyncClient):
 
     assert response.status_code == status.HTTP_200_OK
     {item["id"] for item in response_data["items"]} == {event_one.id, event_two.id}
+
+
+@pytest.mark.asyncio
+async def test_sort_without_an_index(async_client: AsyncClient):
+    current_user = UserFactory()
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    response = await async_client.get(URL, headers=headers, params={"sort": "price"})
+    response_data = response.json()
+
+    expected_exception = UnsupportedSortException(["id"])
+
+    assert response.status_code == expected_exception.status_code
+    assert response_data["detail"] == expected_exception.detail
+
+
+@pytest.mark.asyncio
+async def test_unchanged_page_is_not_modified(async_client: AsyncClient):
+    current_user = UserFactory()
+    EventFactory(organizer=current_user)
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    response = await async_client.get(URL, headers=headers)
+    etag = response.headers["ETag"]
+
+    response = await async_client.get(URL, headers={**headers, "If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+
+    EventFactory(organizer=current_user)
+    response = await async_client.get(URL, headers={**headers, "If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()["items"]) == 2
+    assert response.headers["ETag"] != etag
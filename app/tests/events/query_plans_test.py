@@ -0,0 +1,266 @@
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+import pytest
+from sqlalchemy import event as sqlalchemy_event, func, select, text
+from sqlalchemy.orm import Session
+
+from app.auth.schemas import Principal
+from app.events import services
+from app.events.dependencies import get_event_by_id
+from app.events.models import Enrollment, Event
+from app.events.schemas import CreateEventParams, EventFilters, UpdateEventParams
+from app.pagination.dependencies import pagination_params
+from app.pagination.enums import SortEnum, SortFieldEnum
+from app.users.enums import UserRole
+from app.users.models import User
+
+USERS_COUNT = 200
+EVENTS_COUNT = 20_000
+ENROLLMENTS_COUNT = 20_000
+
+
+@pytest.fixture
+def seeded(db_session: Session) -> dict[str, int]:
+    # enough rows that the planner prefers an index whenever a usable one exists
+    db_session.execute(
+        text(
+            "INSERT INTO users (username, hashed_password, role) "
+            "SELECT 'user-' || n, 'hash', "
+            "CASE WHEN n % 2 = 0 THEN 'ORGANIZER' ELSE 'PARTICIPANT' END::user_role "
+            "FROM generate_series(1, :users) AS n"
+        ),
+        {"users": USERS_COUNT},
+    )
+    first_user_id = db_session.execute(select(func.min(User.id))).scalar_one()
+    db_session.execute(
+        text(
+            "INSERT INTO events "
+            "(title, description, price, max_capacity, event_date, organizer_id) "
+            "SELECT 'Event ' || n, repeat('description ', 20), "
+            "CASE WHEN n % 1000 = 1 THEN NULL ELSE n % 1000 END, 100, "
+            "now() + n * interval '1 minute', :first_user_id + (n % :users) "
+            "FROM generate_series(1, :events) AS n"
+        ),
+        {"first_user_id": first_user_id, "users": USERS_COUNT, "events": EVENTS_COUNT},
+    )
+    first_event_id = db_session.execute(select(func.min(Event.id))).scalar_one()
+    db_session.execute(
+        text(
+            "INSERT INTO enrollments (participant_id, event_id) "
+            "SELECT :first_user_id + (n % :users), :first_event_id + n - 1 "
+            "FROM generate_series(1, :enrollments) AS n"
+        ),
+        {
+            "first_user_id": first_user_id,
+            "first_event_id": first_event_id,
+            "users": USERS_COUNT,
+            "enrollments": ENROLLMENTS_COUNT,
+        },
+    )
+    db_session.execute(text("ANALYZE users, events, enrollments"))
+
+    event = db_session.scalars(
+        select(Event).where(Event.id == first_event_id + 1)
+    ).one()
+    enrollment = db_session.scalars(
+        select(Enrollment).where(Enrollment.event_id == event.id)
+    ).one()
+
+    return {
+        "organizer_id": event.organizer_id,
+        "participant_id": enrollment.participant_id,
+        "event_id": event.id,
+        "free_event_id": first_event_id + ENROLLMENTS_COUNT // 2,
+    }
+
+
+def _organizer(seeded: dict[str, int]) -> Principal:
+    return Principal(id=seeded["organizer_id"], role=UserRole.ORGANIZER)
+
+
+def _participant(seeded: dict[str, int]) -> Principal:
+    return Principal(id=seeded["participant_id"], role=UserRole.PARTICIPANT)
+
+
+def _event(db: Session, seeded: dict[str, int]) -> Event:
+    return get_event_by_id(seeded["event_id"], db=db)
+
+
+SERVICE_CALLS: dict[str, Callable[[Session, dict[str, int]], Any]] = {
+    "create_event": lambda db, seeded: services.create_event(
+        CreateEventParams(
+            title="Event",
+            description="Description",
+            price=10,
+            max_capacity=10,
+            event_date=datetime(2030, 1, 1),
+        ),
+        db=db,
+        current_user=_organizer(seeded),
+    ),
+    "enroll_for_event": lambda db, seeded: services.enroll_for_event(
+        seeded["free_event_id"], db=db, current_user=_participant(seeded)
+    ),
+    "get_organizer_events": lambda db, seeded: services.get_organizer_events(
+        pagination=pagination_params(),
+        db=db,
+        current_user=_organizer(seeded),
+    ),
+    "get_organizer_events_cursor": lambda db, seeded: services.get_organizer_events(
+        pagination=pagination_params(
+            cursor=services.get_organizer_events(
+                pagination=pagination_params(),
+                db=db,
+                current_user=_organizer(seeded),
+            ).next_cursor
+        ),
+        db=db,
+        current_user=_organizer(seeded),
+    ),
+    "get_participant_events": lambda db, seeded: services.get_participant_events(
+        pagination=pagination_params(),
+        db=db,
+        current_user=_participant(seeded),
+    ),
+    "get_events": lambda db, seeded: services.get_events(
+        filters=EventFilters(),
+        pagination=pagination_params(),
+        db=db,
+        current_user=_participant(seeded),
+    ),
+    "get_events_by_price": lambda db, seeded: services.get_events(
+        filters=EventFilters(min_price=500, max_price=500),
+        pagination=pagination_params(),
+        db=db,
+        current_user=_participant(seeded),
+    ),
+    "get_upcoming_events": lambda db, seeded: services.get_events(
+        filters=EventFilters(date_from=datetime.now() + timedelta(days=7)),
+        pagination=pagination_params(order=SortEnum.ASC),
+        db=db,
+        current_user=_participant(seeded),
+    ),
+    "get_upcoming_events_cursor": lambda db, seeded: services.get_events(
+        filters=EventFilters(date_from=datetime.now() + timedelta(days=7)),
+        pagination=pagination_params(
+            order=SortEnum.ASC,
+            cursor=services.get_events(
+                filters=EventFilters(date_from=datetime.now() + timedelta(days=7)),
+                pagination=pagination_params(order=SortEnum.ASC),
+                db=db,
+                current_user=_participant(seeded),
+            ).next_cursor,
+        ),
+        db=db,
+        current_user=_participant(seeded),
+    ),
+    "search_events": lambda db, seeded: services.get_events(
+        filters=EventFilters(q="1234", highlight=True),
+        pagination=pagination_params(),
+        db=db,
+        current_user=_participant(seeded),
+    ),
+    "get_organizer_event": lambda db, seeded: services.get_organizer_event(
+        current_user=_organizer(seeded), event=_event(db, seeded)
+    ),
+    "update_event": lambda db, seeded: services.update_event(
+        UpdateEventParams(title="Updated"),
+        seeded["event_id"],
+        db=db,
+        current_user=_organizer(seeded),
+    ),
+    "get_event": lambda db, seeded: services.get_event(
+        current_user=_participant(seeded), event=_event(db, seeded)
+    ),
+    "delete_event": lambda db, seeded: services.delete_event(
+        db=db, current_user=_organizer(seeded), event=_event(db, seeded)
+    ),
+    "remove_enrollment": lambda db, seeded: services.remove_enrollment(
+        db=db, current_user=_participant(seeded), event=_event(db, seeded)
+    ),
+}
+
+
+def _sorted_events(sort: SortFieldEnum) -> Callable[[Session, dict[str, int]], Any]:
+    # the first page and the page after its cursor
+    def _call(db: Session, seeded: dict[str, int]) -> Any:
+        first_page = services.get_events(
+            filters=EventFilters(),
+            pagination=pagination_params(sort=sort),
+            db=db,
+            current_user=_participant(seeded),
+        )
+        return services.get_events(
+            filters=EventFilters(),
+            pagination=pagination_params(sort=sort, cursor=first_page.next_cursor),
+            db=db,
+            current_user=_participant(seeded),
+        )
+
+    return _call
+
+
+SERVICE_CALLS.update(
+    {
+        f"get_events_sorted_by_{sort.value}": _sorted_events(sort)
+        for sort in SortFieldEnum
+    }
+)
+
+
+# queries that have an index of their own must not settle for another one
+EXPECTED_INDEXES = {
+    "get_events": "ix_events_event_date_id",
+    "get_organizer_events": "ix_events_organizer_id_id",
+    "get_organizer_events_cursor": "ix_events_organizer_id_id",
+    "get_participant_events": "unique_enrollment",
+    "get_events_by_price": "ix_events_price",
+    "get_upcoming_events": "ix_events_event_date_id",
+    "get_upcoming_events_cursor": "ix_events_event_date_id",
+    "search_events": "ix_events_search_vector",
+    "get_events_sorted_by_id": "events_pkey",
+    "get_events_sorted_by_event_date": "ix_events_event_date_id",
+    "get_events_sorted_by_price": "ix_events_sort_price_id",
+    "get_events_sorted_by_title": "ix_events_title_id",
+}
+
+
+def _nodes(plan: dict[str, Any]) -> list[dict[str, Any]]:
+    return [plan, *(node for child in plan.get("Plans", []) for node in _nodes(child))]
+
+
+@pytest.mark.parametrize("service", SERVICE_CALLS)
+def test_service_queries_use_indexes(
+    db_session: Session, seeded: dict[str, int], service: str
+):
+    statements: list[tuple[str, Any]] = []
+    # services that commit may continue on another connection of the engine
+    bind = db_session.get_bind()
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    sqlalchemy_event.listen(bind, "before_cursor_execute", _capture)
+    try:
+        SERVICE_CALLS[service](db_session, seeded)
+    finally:
+        sqlalchemy_event.remove(bind, "before_cursor_execute", _capture)
+
+    assert statements
+    used_indexes: set[str] = set()
+    for statement, parameters in statements:
+        plan = (
+            db_session.connection()
+            .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            .scalar_one()[0]["Plan"]
+        )
+        nodes = _nodes(plan)
+
+        assert all(node["Node Type"] != "Seq Scan" for node in nodes), (statement, plan)
+        used_indexes.update(
+            node["Index Name"] for node in nodes if "Index Name" in node
+        )
+
+    if service in EXPECTED_INDEXES:
+        assert EXPECTED_INDEXES[service] in used_indexes
@@ -43,7 +43,7 @@ async def test_event_not_found(async_client: AsyncClient):
 
     headers = utils.generate_user_auth_header(current_user.id)
 
-    response = await async_client.patch(url(event.id + 1), headers=headers)
+    response = await async_client.patch(url(event.id + 1), headers=headers, json={})
     response_data = response.json()
 
     expected_exception = NotFoundException(Event.__name__)
@@ -85,6 +85,42 @@ async def test_current_user_not_event_owner(async_client: AsyncClient):
     assert response_data["detail"] == expected_exception.detail
 
 
+@pytest.mark.asyncio
+async def test_foreign_event_is_left_untouched(
+    db_session: Session, async_client: AsyncClient
+):
+    current_user = UserFactory()
+    event = EventFactory(organizer=UserFactory())
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    response = await async_client.patch(
+        url(event.id), headers=headers, json={"title": "New title"}
+    )
+
+    title = db_session.scalar(select(Event.title).where(Event.id == event.id))
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert title == event.title
+
+
+@pytest.mark.asyncio
+async def test_update_is_a_single_statement(async_client: AsyncClient):
+    current_user = UserFactory()
+    event = EventFactory(organizer=current_user)
+
+    headers = utils.generate_user_auth_header(current_user.id)
+
+    response = await async_client.patch(
+        url(event.id), headers=headers, json={"title": "New title"}
+    )
+
+    # two statements authenticate the token, the UPDATE returns the event
+    assert response.status_code == status.HTTP_200_OK
+    assert 'desc="3 statements"' in response.headers["Server-Timing"]
+    assert response.json()["title"] == "New title"
+
+
 @pytest.mark.asyncio
 async def test_everything_fine_no_params(
     db_session: Session, async_client: AsyncClient
@@ -1,10 +1,11 @@
 import factory  # type: ignore[import-untyped]
 from app.users.models import User
 from app.auth.models import RevokedToken
+from app.auth.utils import token_digest
 from sqlalchemy.orm import Session
 from app.users.enums import UserRole
 from app.events.models import Enrollment, Event
-from datetime import datetime
+from datetime import datetime, timedelta
 
 
 class UserFactory(factory.alchemy.SQLAlchemyModelFactory):
@@ -21,9 +22,15 @@ class RevokedTokenFactory(factory.alchemy.SQLAlchemyModelFactory):
     class Meta:
         model = RevokedToken
 
+    class Params:
+        token: str = factory.Faker("uuid4")
+
     id: int = factory.Sequence(lambda n: n + 1)
-    hash: str = factory.Faker("uuid4")
+    hash: bytes = factory.LazyAttribute(lambda o: token_digest(o.token))
     revoked_at: str = factory.Faker("date_time")
+    expires_at: datetime = factory.LazyFunction(
+        lambda: datetime.now() + timedelta(days=1)
+    )
 
 
 class EventFactory(factory.alchemy.SQLAlchemyModelFactory):
@@ -35,7 +42,8 @@ class EventFactory(factory.alchemy.SQLAlchemyModelFactory):
     description: str = factory.Faker("paragraph", nb_sentences=3)
     price: int = factory.Faker("random_int", min=100, max=100_000_000)
     max_capacity: int = factory.Faker("random_int", min=10, max=100)
-    event_date: datetime = factory.Faker("date_time")
+    enrolled_count: int = 0
+    event_date: datetime = factory.Faker("future_datetime", end_date="+365d")
     organizer: User = factory.SubFactory(UserFactory)
 
 
@@ -46,9 +54,19 @@ class EnrollmentFactory(factory.alchemy.SQLAlchemyModelFactory):
     participant: User = factory.SubFactory(UserFactory)
     event: Event = factory.SubFactory(EventFactory)
 
+    @classmethod
+    def _create(cls, model_class, *args, **kwargs):
+        # enrollments take a seat of their event just like the enroll service
+        kwargs["event"].enrolled_count += 1
+        return super()._create(model_class, *args, **kwargs)
+
 
-def setup_factories(db: Session) -> None:
-    UserFactory._meta.sqlalchemy_session = db
-    RevokedTokenFactory._meta.sqlalchemy_session = db
-    EventFactory._meta.sqlalchemy_session = db
-    EnrollmentFactory._meta.sqlalchemy_session = db
+def setup_factories(db: Session, persistence: str | None = None) -> None:
+    for factory_class in (
+        UserFactory,
+        RevokedTokenFactory,
+        EventFactory,
+        EnrollmentFactory,
+    ):
+        factory_class._meta.sqlalchemy_session = db
+        factory_class._meta.sqlalchemy_session_persistence = persistence
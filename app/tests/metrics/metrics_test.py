@@ -0,0 +1,52 @@
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from app.config import settings
+from app.exceptions import AccessForbiddenException
+from app.metrics.collectors import Histogram
+from app.metrics.router import router as metrics_router
+
+
+def test_histogram_snapshot():
+    histogram = Histogram(buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.5, 0.7, 5.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(6.25)
+    assert snapshot["buckets"] == {"0.1": 1, "1.0": 3, "+Inf": 4}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("token", [None, "wrong"])
+async def test_metrics_endpoint_needs_internal_token(
+    async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch, token: str | None
+):
+    monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", "internal")
+    headers = {"X-Internal-Token": token} if token else {}
+
+    response = await async_client.get(metrics_router.prefix, headers=headers)
+
+    expected_exception = AccessForbiddenException("invalid internal token")
+
+    assert response.status_code == expected_exception.status_code
+    assert response.json()["detail"] == expected_exception.detail
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(
+    async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", "internal")
+
+    response = await async_client.get(
+        metrics_router.prefix, headers={"X-Internal-Token": "internal"}
+    )
+    response_data = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response_data["password_hasher"]["workers"] >= 1
+    assert set(response_data["database_pool"]) == {"sync", "async", "replicas"}
@@ -0,0 +1,188 @@
+from datetime import datetime, timedelta
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.events.models import Event
+from app.events.schemas import RepresentEvent
+from app.pagination.dependencies import pagination_params
+from app.pagination.enums import SortEnum
+from app.pagination.exceptions import InvalidCursorException
+from app.pagination.services import decode_cursor, encode_cursor, paginate_query
+from app.tests.factories import EventFactory
+
+
+def _paginate(db_session: Session, **params):
+    pagination = pagination_params(**params)
+
+    return paginate_query(
+        db_session, select(Event), pagination, RepresentEvent, (Event.id,)
+    )
+
+
+def test_page_mode_returns_cursors(db_session: Session):
+    events = sorted(EventFactory.create_batch(5), key=lambda event: event.id)
+
+    first_page = _paginate(db_session, per_page=2)
+    second_page = _paginate(db_session, per_page=2, page=2)
+    last_page = _paginate(db_session, per_page=2, page=3)
+
+    assert [item.id for item in first_page.items] == [events[4].id, events[3].id]
+    assert first_page.page == 1
+    assert first_page.prev_cursor is None
+    assert first_page.next_cursor is not None
+
+    assert [item.id for item in second_page.items] == [events[2].id, events[1].id]
+    assert second_page.prev_cursor is not None
+    assert second_page.next_cursor is not None
+
+    assert [item.id for item in last_page.items] == [events[0].id]
+    assert last_page.next_cursor is None
+
+
+def test_cursor_mode_walks_forward_and_backward(db_session: Session):
+    events = sorted(EventFactory.create_batch(5), key=lambda event: event.id)
+
+    first_page = _paginate(db_session, per_page=2)
+    second_page = _paginate(db_session, per_page=2, cursor=first_page.next_cursor)
+    third_page = _paginate(db_session, per_page=2, cursor=second_page.next_cursor)
+
+    assert second_page.page is None
+    assert [item.id for item in second_page.items] == [events[2].id, events[1].id]
+    assert [item.id for item in third_page.items] == [events[0].id]
+    assert third_page.next_cursor is None
+
+    previous_page = _paginate(db_session, per_page=2, cursor=third_page.prev_cursor)
+    assert [item.id for item in previous_page.items] == [events[2].id, events[1].id]
+    assert previous_page.next_cursor is not None
+
+    first_page_again = _paginate(
+        db_session, per_page=2, cursor=previous_page.prev_cursor
+    )
+    assert [item.id for item in first_page_again.items] == [
+        events[4].id,
+        events[3].id,
+    ]
+    assert first_page_again.prev_cursor is None
+
+
+def test_cursor_mode_ascending_order(db_session: Session):
+    events = sorted(EventFactory.create_batch(3), key=lambda event: event.id)
+
+    first_page = _paginate(db_session, per_page=2, order=SortEnum.ASC)
+    second_page = _paginate(
+        db_session, per_page=2, order=SortEnum.ASC, cursor=first_page.next_cursor
+    )
+
+    assert [item.id for item in first_page.items] == [events[0].id, events[1].id]
+    assert [item.id for item in second_page.items] == [events[2].id]
+    assert second_page.next_cursor is None
+
+
+def test_cursor_mode_with_composite_sort_keys(db_session: Session):
+    # events sharing a date are kept apart by their id
+    event_date = datetime(2030, 1, 1)
+    events = [
+        EventFactory(event_date=event_date + timedelta(days=days))
+        for days in (1, 0, 1, 0, 2)
+    ]
+    expected = sorted(events, key=lambda event: (event.event_date, event.id))
+
+    def _paginate_by_date(**params):
+        return paginate_query(
+            db_session,
+            select(Event),
+            pagination_params(per_page=2, order=SortEnum.ASC, **params),
+            RepresentEvent,
+            (Event.event_date, Event.id),
+        )
+
+    first_page = _paginate_by_date()
+    second_page = _paginate_by_date(cursor=first_page.next_cursor)
+    third_page = _paginate_by_date(cursor=second_page.next_cursor)
+    previous_page = _paginate_by_date(cursor=third_page.prev_cursor)
+
+    pages = [first_page, second_page, third_page]
+    assert [item.id for page in pages for item in page.items] == [
+        event.id for event in expected
+    ]
+    assert third_page.next_cursor is None
+    assert previous_page.items == second_page.items
+
+
+@pytest.mark.parametrize("cursor", ["invalid", "e30=", "eyJ2YWx1ZXMiOiBbXX0="])
+def test_invalid_cursor(cursor: str):
+    with pytest.raises(InvalidCursorException):
+        pagination_params(cursor=cursor)
+
+
+@pytest.mark.parametrize("values", [["invalid"], [1, 2], []])
+def test_cursor_values_do_not_match_sort_key(db_session: Session, values: list):
+    EventFactory.create_batch(2)
+    next_cursor = _paginate(db_session, per_page=1).next_cursor
+    cursor = decode_cursor(next_cursor).model_copy(update={"values": values})
+
+    with pytest.raises(InvalidCursorException):
+        _paginate(db_session, cursor=encode_cursor(cursor))
+
+
+def test_cursor_from_another_sort(db_session: Session):
+    EventFactory.create_batch(2)
+    next_cursor = _paginate(db_session, per_page=1).next_cursor
+
+    with pytest.raises(InvalidCursorException):
+        paginate_query(
+            db_session,
+            select(Event),
+            pagination_params(cursor=next_cursor),
+            RepresentEvent,
+            (Event.price, Event.id),
+        )
+
+
+def test_selects_only_representer_columns(db_session: Session):
+    EventFactory.create_batch(2)
+    db_session.flush()
+    statements = []
+
+    event.listen(
+        db_session.connection(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    page = _paginate(db_session, per_page=1)
+
+    assert len(statements) == 1
+    assert "events.title" in statements[0]
+    assert "events.description" not in statements[0]
+    assert isinstance(page.items[0], RepresentEvent)
+
+
+def test_falls_back_to_entities_for_non_column_fields(db_session: Session):
+    events = sorted(EventFactory.create_batch(2), key=lambda event: event.id)
+
+    class RepresentOrganizer(BaseModel):
+        id: int
+
+        class Config:
+            from_attributes = True
+
+    class RepresentEventWithOrganizer(BaseModel):
+        id: int
+        organizer: RepresentOrganizer
+
+        class Config:
+            from_attributes = True
+
+    page = paginate_query(
+        db_session,
+        select(Event),
+        pagination_params(per_page=1),
+        RepresentEventWithOrganizer,
+        (Event.id,),
+    )
+
+    assert [item.id for item in page.items] == [events[1].id]
+    assert page.items[0].organizer.id == events[1].organizer_id
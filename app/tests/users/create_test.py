@@ -2,6 +2,7 @@ from pydantic import ValidationError
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.orm import Session
+from app.auth.hashers import password_hasher
 from app.users.exceptions import UsernameAlreadyExistsException
 from app.users.models import User
 from app.tests.factories import UserFactory
@@ -137,6 +138,28 @@ async def test_username_already_exists(async_client: AsyncClient):
     assert response_data["detail"] == expected_exception.detail
 
 
+@pytest.mark.asyncio
+async def test_username_already_exists_skips_hashing(
+    async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    user_one = UserFactory()
+
+    async def _hash(password: str) -> str:
+        pytest.fail("a taken username must not be hashed")
+
+    monkeypatch.setattr(password_hasher, "hash", _hash)
+
+    json_data = {
+        "username": user_one.username,
+        "password": "Password100!",
+        "role": UserRole.ORGANIZER.value,
+    }
+
+    response = await async_client.post(users_router.prefix, json=json_data)
+
+    assert response.status_code == UsernameAlreadyExistsException().status_code
+
+
 @pytest.mark.asyncio
 async def test_everything_is_fine(db_session: Session, async_client: AsyncClient):
     json_data = {
@@ -0,0 +1,30 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.hashers import password_hasher
+from app.database.dependencies import get_async_db
+from .models import User
+from .schemas import CreateUserParams
+from .validators import validate_user_create
+
+
+@validate_user_create
+async def create_user(
+    params: CreateUserParams,
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    # hashed only once the username is known to be free, a duplicate signup
+    # never takes a slot of the hasher, the connection goes back to the pool
+    # while the password waits for it
+    await db.close()
+
+    user = User(
+        username=params.username,
+        hashed_password=await password_hasher.hash(params.password),
+        role=params.role,
+    )
+
+    db.add(user)
+    await db.commit()
+
+    return user
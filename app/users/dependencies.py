@@ -0,0 +1,32 @@
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from app.auth.hashers import password_hasher
+from app.database.dependencies import get_db
+from .exceptions import UsernameAlreadyExistsException
+from .schemas import CreateUserParams, HashedCreateUserParams
+from .validators import username_query
+
+
+def get_create_user_params(
+    *, params: CreateUserParams, db: Session = Depends(get_db)
+) -> CreateUserParams:
+    if db.scalar(username_query(params)):
+        raise UsernameAlreadyExistsException()
+
+    # hand the connection back to the pool before queueing for the password hasher
+    db.close()
+
+    return params
+
+
+async def hash_user_password(
+    *, params: CreateUserParams = Depends(get_create_user_params)
+) -> HashedCreateUserParams:
+    # hashed only once the username is known to be free, a duplicate signup
+    # never takes a slot of the hasher
+    return HashedCreateUserParams(
+        username=params.username,
+        role=params.role,
+        hashed_password=await password_hasher.hash(params.password),
+    )
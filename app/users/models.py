@@ -1,6 +1,8 @@
 from app.database.model import Base
 
-from sqlalchemy import Integer, String
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String
 from sqlalchemy.orm import mapped_column, Mapped, relationship
 from .enums import UserRole
 from sqlalchemy.dialects.postgresql import ENUM as PgEnum
@@ -18,8 +20,12 @@ class User(Base):
     username: Mapped[str] = mapped_column(String, unique=True)
     hashed_password: Mapped[str] = mapped_column(String)
     role: Mapped[UserRole] = mapped_column(PgEnum(UserRole, name="user_role"))
+    # tokens issued before this moment are rejected, revokes all sessions at once
+    tokens_valid_after: Mapped[datetime | None] = mapped_column(DateTime)
     events_as_organizer: Mapped[list["Event"]] = relationship(
-        back_populates="organizer"
+        back_populates="organizer",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     enrollments: Mapped[list["Enrollment"]] = relationship(
         "Enrollment", back_populates="participant", cascade="all, delete-orphan"
@@ -1,16 +1,26 @@
 from fastapi import APIRouter, status, Depends
 from .schemas import RepresentUser
-from .services import create_user
 from .models import User
+from app.database.config import settings as database_settings
+from app.database.instrumentation import query_budget
+from app.responses import RepresentationAdapter
+
+if database_settings.DATABASE_ASYNC:
+    from . import async_services as services
+else:
+    from . import services  # type: ignore[no-redef]
 
 router = APIRouter(prefix="/users", tags=["User"])
 
+user_representation = RepresentationAdapter(RepresentUser)
+
 
 @router.post(
     "",
     response_model=RepresentUser,
     status_code=status.HTTP_201_CREATED,
     summary="Create user account",
+    dependencies=[Depends(query_budget(3))],
 )
-async def create(user: User = Depends(create_user)):
-    return user
+async def create(user: User = Depends(services.create_user)):
+    return user_representation.response(user, status.HTTP_201_CREATED)
@@ -35,5 +35,9 @@ class CreateUserParams(UserBaseSchema):
         return password
 
 
+class HashedCreateUserParams(UserBaseSchema):
+    hashed_password: str
+
+
 class RepresentUser(UserBaseSchema):
     id: int
@@ -2,17 +2,20 @@ from fastapi import Depends
 from sqlalchemy.orm import Session
 
 from app.database.dependencies import get_db
+from .dependencies import hash_user_password
 from .models import User
-from .schemas import CreateUserParams
-from .validators import validate_user_create
-from app.auth.config import settings as auth_settings
+from .schemas import HashedCreateUserParams
 
 
-@validate_user_create
-def create_user(params: CreateUserParams, db: Session = Depends(get_db)) -> User:
+def create_user(
+    params: HashedCreateUserParams = Depends(hash_user_password),
+    db: Session = Depends(get_db),
+) -> User:
+    # the username check and the hashing ran in dependencies, a threadpool
+    # worker is only taken for the insert
     user = User(
         username=params.username,
-        hashed_password=auth_settings.PASSWORD_CONTEXT.hash(params.password),
+        hashed_password=params.hashed_password,
         role=params.role,
     )
 
@@ -1,4 +1,3 @@
-from sqlalchemy.orm import Session
 from .models import User
 from .schemas import CreateUserParams
 from .exceptions import UsernameAlreadyExistsException
@@ -7,11 +6,16 @@ from sqlalchemy import select
 
 
 def validate_user_create(fn):
+    # the sync stack checks the username in get_create_user_params instead
     @wraps(fn)
-    def wrapper(params: CreateUserParams, db: Session, *args, **kwargs):
-        if db.scalar(select(User).where(User.username == params.username)):
+    async def async_wrapper(params: CreateUserParams, db, *args, **kwargs):
+        if await db.scalar(username_query(params)):
             raise UsernameAlreadyExistsException()
 
-        return fn(params, db, *args, **kwargs)
+        return await fn(params, db, *args, **kwargs)
 
-    return wrapper
+    return async_wrapper
+
+
+def username_query(params: CreateUserParams):
+    return select(User).where(User.username == params.username)
@@ -0,0 +1,74 @@
+"""Compare GET /events throughput of the sync and the async database stack.
+
+Start the API twice against the same database, once per stack, e.g.
+``uvicorn app.main:app --port 8000 --timeout-keep-alive 120`` and
+``DATABASE_ASYNC=true uvicorn app.main:app --port 8001 --timeout-keep-alive 120``,
+then run
+``python -m benchmarks.async_database_benchmark --sync-url http://localhost:8000
+--async-url http://localhost:8001``. A participant is created on every run.
+Under 500 clients some connections idle past uvicorn's default 5 s keep-alive
+and are closed under the client, hence the longer one.
+"""
+
+import argparse
+import asyncio
+
+import httpx
+
+from .auth_load_benchmark import create_user, login, percentile, run_clients
+from .utils import print_table
+
+
+async def measure(
+    base_url: str, clients: int, duration: float
+) -> tuple[int, float, float, float, dict]:
+    limits = httpx.Limits(max_connections=clients)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60
+    ) as client:
+        participant = await create_user(client, "participant")
+        access_token = (await login(client, participant)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {access_token}"}
+
+        latencies, statuses = await run_clients(
+            clients, duration, lambda: client.get("/events", headers=headers)
+        )
+
+    return (
+        len(latencies),
+        len(latencies) / duration,
+        percentile(latencies, 0.5),
+        percentile(latencies, 0.95),
+        dict(statuses),
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sync-url", default="http://localhost:8000")
+    parser.add_argument("--async-url", default="http://localhost:8001")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=30.0)
+    args = parser.parse_args()
+
+    rows = []
+    for name, base_url in (("sync", args.sync_url), ("async", args.async_url)):
+        requests, throughput, p50, p95, statuses = await measure(
+            base_url, args.clients, args.duration
+        )
+        rows.append(
+            (
+                name,
+                requests,
+                f"{throughput:.1f}",
+                f"{p50:.1f}",
+                f"{p95:.1f}",
+                statuses,
+            )
+        )
+
+    print_table(("stack", "requests", "req/s", "p50 ms", "p95 ms", "statuses"), rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+"""Mix a login storm on /auth/token with GET /events traffic on a running API.
+
+Start the API first (e.g. ``docker compose up``), then run
+``python -m benchmarks.auth_load_benchmark --base-url http://localhost:8000``.
+Two users are created through the API on every run.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from collections import Counter
+from typing import Awaitable, Callable
+
+import httpx
+
+from .utils import print_table
+
+PASSWORD = "Password100!"
+
+
+async def create_user(client: httpx.AsyncClient, role: str) -> str:
+    username = f"bench-{uuid.uuid4().hex[:12]}"
+    response = await client.post(
+        "/users", json={"username": username, "password": PASSWORD, "role": role}
+    )
+    response.raise_for_status()
+    return username
+
+
+async def login(client: httpx.AsyncClient, username: str) -> httpx.Response:
+    return await client.post(
+        "/auth/token", data={"username": username, "password": PASSWORD}
+    )
+
+
+async def run_clients(
+    clients: int,
+    duration: float,
+    request: Callable[[], Awaitable[httpx.Response]],
+) -> tuple[list[float], Counter]:
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    deadline = time.perf_counter() + duration
+
+    async def _client() -> None:
+        while time.perf_counter() < deadline:
+            started_at = time.perf_counter()
+            response = await request()
+            latencies.append((time.perf_counter() - started_at) * 1000)
+            statuses[response.status_code] += 1
+
+    await asyncio.gather(*[_client() for _ in range(clients)])
+
+    return latencies, statuses
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    return sorted(values)[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--login-clients", type=int, default=50)
+    parser.add_argument("--events-clients", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=20.0)
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=args.login_clients + args.events_clients)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=60
+    ) as client:
+        organizer = await create_user(client, "organizer")
+        participant = await create_user(client, "participant")
+
+        access_token = (await login(client, participant)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {access_token}"}
+
+        (
+            (login_latencies, login_statuses),
+            (events_latencies, events_statuses),
+        ) = await asyncio.gather(
+            run_clients(
+                args.login_clients,
+                args.duration,
+                lambda: login(client, organizer),
+            ),
+            run_clients(
+                args.events_clients,
+                args.duration,
+                lambda: client.get("/events", headers=headers),
+            ),
+        )
+
+        metrics = (await client.get("/internal/metrics")).json()
+
+    rows = []
+    for name, latencies, statuses in (
+        ("POST /auth/token", login_latencies, login_statuses),
+        ("GET /events", events_latencies, events_statuses),
+    ):
+        rows.append(
+            (
+                name,
+                len(latencies),
+                f"{len(latencies) / args.duration:.1f}",
+                f"{percentile(latencies, 0.5):.1f}",
+                f"{percentile(latencies, 0.95):.1f}",
+                dict(statuses),
+            )
+        )
+
+    print_table(("endpoint", "requests", "req/s", "p50 ms", "p95 ms", "statuses"), rows)
+    print("password_hasher:", metrics.get("password_hasher"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+"""Fire concurrent enrollments at one event and check it is never oversold.
+
+Run with ``python -m benchmarks.enrollment_capacity_benchmark``; it seeds a
+scratch ``<DATABASE_NAME>_benchmark`` database on the configured Postgres server.
+"""
+
+import argparse
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.auth.schemas import Principal
+from app.events import services
+from app.events.dependencies import get_event_by_id
+from app.events.exceptions import EventFullException
+from app.events.models import Enrollment, Event
+from app.users.enums import UserRole
+
+from .utils import create_benchmark_database, print_table
+
+
+def seed(session: Session, participants: int, capacity: int) -> None:
+    session.execute(
+        text(
+            "INSERT INTO users (id, username, hashed_password, role) "
+            "SELECT n, 'user-' || n, 'hash', "
+            "CASE WHEN n = 1 THEN 'ORGANIZER' ELSE 'PARTICIPANT' END::user_role "
+            "FROM generate_series(1, :users) AS n"
+        ),
+        {"users": participants + 1},
+    )
+    session.execute(
+        text(
+            "INSERT INTO events "
+            "(id, title, description, max_capacity, event_date, organizer_id) "
+            "VALUES (1, 'Event', 'Event', :capacity, now(), 1)"
+        ),
+        {"capacity": capacity},
+    )
+    session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--participants", type=int, default=5_000)
+    parser.add_argument("--capacity", type=int, default=1_000)
+    parser.add_argument("--workers", type=int, default=32)
+    args = parser.parse_args()
+
+    engine = create_benchmark_database(pool_size=args.workers)
+    session_factory = sessionmaker(bind=engine)
+
+    with session_factory() as session:
+        seed(session, args.participants, args.capacity)
+
+    def _enroll(participant_id: int) -> str:
+        with session_factory() as db:
+            try:
+                services.enroll_for_event(
+                    db=db,
+                    current_user=Principal(
+                        id=participant_id, role=UserRole.PARTICIPANT
+                    ),
+                    event=get_event_by_id(1, db=db),
+                )
+            except EventFullException:
+                return "full"
+
+        return "enrolled"
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        outcomes = Counter(executor.map(_enroll, range(2, args.participants + 2)))
+    elapsed = time.perf_counter() - started_at
+
+    with session_factory() as session:
+        enrolled_count = session.scalar(select(Event.enrolled_count))
+        enrollments = session.scalar(select(func.count()).select_from(Enrollment))
+
+    engine.dispose()
+
+    print_table(
+        ("attempts", "enrolled", "full", "enrolled_count", "rows", "attempts/s"),
+        [
+            (
+                args.participants,
+                outcomes["enrolled"],
+                outcomes["full"],
+                enrolled_count,
+                enrollments,
+                f"{args.participants / elapsed:.0f}",
+            )
+        ],
+    )
+    assert enrolled_count == enrollments == min(args.capacity, args.participants)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Compare deleting an event through the ORM with a single DELETE statement.
+
+Run with ``python -m benchmarks.event_deletion_benchmark``; it seeds a
+scratch ``<DATABASE_NAME>_benchmark`` database on the configured Postgres server.
+Every deletion is rolled back, so each size is measured against the same rows.
+"""
+
+import argparse
+import tracemalloc
+from typing import Callable
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.events.models import Event
+
+from .utils import create_benchmark_database, median_ms, print_table
+
+
+def seed(session: Session, event_id: int, enrollments: int) -> None:
+    session.execute(
+        text(
+            "INSERT INTO users (id, username, hashed_password, role) "
+            "SELECT n, 'user-' || n, 'hash', "
+            "CASE WHEN n = 1 THEN 'ORGANIZER' ELSE 'PARTICIPANT' END::user_role "
+            "FROM generate_series(1, :users) AS n ON CONFLICT DO NOTHING"
+        ),
+        {"users": enrollments + 1},
+    )
+    session.execute(
+        text(
+            "INSERT INTO events (id, title, description, max_capacity, "
+            "enrolled_count, event_date, organizer_id) "
+            "VALUES (:event_id, 'Event', 'Event', :enrollments, :enrollments, now(), 1)"
+        ),
+        {"event_id": event_id, "enrollments": enrollments},
+    )
+    session.execute(
+        text(
+            "INSERT INTO enrollments (participant_id, event_id) "
+            "SELECT n, :event_id FROM generate_series(2, :users) AS n"
+        ),
+        {"event_id": event_id, "users": enrollments + 1},
+    )
+    session.commit()
+
+
+def orm_delete(session: Session, event_id: int) -> None:
+    # what deleting an event cost before the foreign keys cascaded
+    event = session.scalars(select(Event).where(Event.id == event_id)).one()
+    for enrollment in event.enrollments:
+        session.delete(enrollment)
+    session.delete(event)
+    session.flush()
+
+
+def statement_delete(session: Session, event_id: int) -> None:
+    session.execute(delete(Event).where(Event.id == event_id))
+
+
+def measure(
+    session_factory: sessionmaker, event_id: int, fn: Callable, repeat: int
+) -> tuple[float, float]:
+    def _run() -> None:
+        with session_factory() as session:
+            fn(session, event_id)
+            session.rollback()
+
+    tracemalloc.start()
+    _run()
+    peak_kib = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+
+    return median_ms(_run, repeat=repeat), peak_kib
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_benchmark_database()
+    session_factory = sessionmaker(bind=engine)
+    rows = []
+
+    for event_id, size in enumerate(args.sizes, start=1):
+        with session_factory() as session:
+            seed(session, event_id, size)
+
+        orm_ms, orm_kib = measure(session_factory, event_id, orm_delete, args.repeat)
+        statement_ms, statement_kib = measure(
+            session_factory, event_id, statement_delete, args.repeat
+        )
+        rows.append(
+            (
+                size,
+                f"{orm_ms:.1f}",
+                f"{statement_ms:.1f}",
+                f"{orm_ms / statement_ms:.1f}x",
+                f"{orm_kib:.0f}",
+                f"{statement_kib:.0f}",
+            )
+        )
+
+    engine.dispose()
+
+    print_table(
+        (
+            "enrollments",
+            "ORM ms",
+            "DELETE ms",
+            "speedup",
+            "ORM peak KiB",
+            "DELETE peak KiB",
+        ),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Measure full-text search on events against a substring scan.
+
+Run with ``python -m benchmarks.event_search_benchmark``; it seeds a scratch
+``<DATABASE_NAME>_benchmark`` database on the configured Postgres server with
+1M events by default, which takes a few minutes.
+"""
+
+import argparse
+from typing import cast
+
+from sqlalchemy import Label, func, or_, select, text
+from sqlalchemy.orm import Session
+
+from app.events.models import Event
+from app.events.queries import events_query
+from app.events.schemas import EventFilters, RepresentEvent, RepresentEventMatch
+from app.pagination.dependencies import pagination_params
+from app.pagination.services import paginate_query
+
+from .utils import create_benchmark_database, median_ms, print_table
+
+# the seeded texts draw from these words, the first ones are the most common
+WORDS = (
+    "music concert festival workshop meetup conference talk jazz rock yoga "
+    "painting cooking startup python database hiking cycling photography chess "
+    "theatre poetry cinema robotics"
+).split()
+
+
+def seed(session: Session, events_count: int) -> None:
+    session.execute(
+        text(
+            "INSERT INTO users (id, username, hashed_password, role) "
+            "VALUES (1, 'organizer', 'hash', 'ORGANIZER')"
+        )
+    )
+    # the index is faster to build once than to maintain row by row
+    session.execute(text("DROP INDEX ix_events_search_vector"))
+    # a skewed pick of words, plus a token unique to every event
+    session.execute(
+        text(
+            "INSERT INTO events "
+            "(title, description, price, max_capacity, event_date, organizer_id) "
+            "SELECT initcap(w[1 + n % 7]) || ' ' || w[1 + n % 23] || ' ' || "
+            "'event' || n, "
+            "'A ' || w[1 + n % 3] || ' session about ' || w[1 + (n / 7) % 23] || "
+            "' and ' || w[1 + (n / 13) % 23] || ', ' || repeat('details ', 20), "
+            "n % 1000, 100, now() + n * interval '1 minute', 1 "
+            "FROM generate_series(1, :events_count) AS n, "
+            "(SELECT :words ::text[] AS w) AS words"
+        ),
+        {"events_count": events_count, "words": WORDS},
+    )
+    session.execute(
+        text("CREATE INDEX ix_events_search_vector ON events USING gin (search_vector)")
+    )
+    session.commit()
+    session.execute(text("ANALYZE events"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--per-page", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_benchmark_database()
+    rows = []
+
+    with Session(engine) as session:
+        seed(session, args.events)
+        pagination = pagination_params(per_page=args.per_page)
+
+        def _search(q: str, highlight: bool) -> object:
+            query = events_query(EventFilters(q=q, highlight=highlight))
+            order_by = (cast(Label, query.selected_columns.rank), Event.id)
+            return paginate_query(
+                session, query, pagination, RepresentEventMatch, order_by
+            )
+
+        def _substring_scan(q: str) -> object:
+            # what filtering on keywords without the index costs
+            pattern = f"%{q}%"
+            query = select(Event).where(
+                or_(Event.title.ilike(pattern), Event.description.ilike(pattern))
+            )
+            return paginate_query(
+                session, query, pagination, RepresentEvent, (Event.id,)
+            )
+
+        for q in ("music", "robotics", "jazz rock", "event123456"):
+            matches = session.scalar(
+                select(func.count()).select_from(
+                    events_query(EventFilters(q=q)).subquery()
+                )
+            )
+            rows.append(
+                (
+                    q,
+                    matches,
+                    f"{median_ms(lambda: _search(q, False), repeat=args.repeat):.2f}",
+                    f"{median_ms(lambda: _search(q, True), repeat=args.repeat):.2f}",
+                    f"{median_ms(lambda: _substring_scan(q), repeat=args.repeat):.2f}",
+                )
+            )
+
+    engine.dispose()
+
+    print_table(("q", "matches", "search ms", "highlighted ms", "ILIKE scan ms"), rows)
+
+
+if __name__ == "__main__":
+    main()
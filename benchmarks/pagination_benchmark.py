@@ -0,0 +1,92 @@
+"""Compare offset and keyset pagination latency on a deep events table.
+
+Run with ``python -m benchmarks.pagination_benchmark``; it seeds a scratch
+``<DATABASE_NAME>_benchmark`` database on the configured Postgres server.
+"""
+
+import argparse
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.events.models import Event
+from app.events.schemas import RepresentEvent
+from app.pagination.enums import CursorDirectionEnum, SortEnum
+from app.pagination.schemas import Cursor, PaginationParams
+from app.pagination.services import paginate_query, sort_digest
+
+from .utils import create_benchmark_database, median_ms, print_table
+
+
+def seed(session: Session, events_count: int) -> None:
+    session.execute(
+        text(
+            "INSERT INTO users (id, username, hashed_password, role) "
+            "VALUES (1, 'organizer', 'hash', 'ORGANIZER')"
+        )
+    )
+    session.execute(
+        text(
+            "INSERT INTO events "
+            "(title, description, price, max_capacity, event_date, organizer_id) "
+            "SELECT 'Event ' || n, repeat('description ', 20), n % 1000, 100, "
+            "now() + n * interval '1 minute', 1 "
+            "FROM generate_series(1, :events_count) AS n"
+        ),
+        {"events_count": events_count},
+    )
+    session.commit()
+    session.execute(text("ANALYZE"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--per-page", type=int, default=10)
+    parser.add_argument("--deep-page", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_benchmark_database()
+    rows = []
+
+    with Session(engine) as session:
+        seed(session, events_count=(args.deep_page + 1) * args.per_page)
+
+        for page in (1, args.deep_page):
+            offset_params = PaginationParams(
+                page=page, per_page=args.per_page, order=SortEnum.DESC
+            )
+
+            cursor = None
+            if page > 1:
+                last_id_of_previous_page = session.scalar(
+                    select(Event.id)
+                    .order_by(Event.id.desc())
+                    .offset((page - 1) * args.per_page - 1)
+                    .limit(1)
+                )
+                cursor = Cursor(
+                    values=[last_id_of_previous_page],
+                    sort=sort_digest((Event.id,)),
+                    direction=CursorDirectionEnum.NEXT,
+                )
+            keyset_params = PaginationParams(
+                page=1, per_page=args.per_page, order=SortEnum.DESC, cursor=cursor
+            )
+
+            for mode, params in (("page", offset_params), ("cursor", keyset_params)):
+                latency = median_ms(
+                    lambda: paginate_query(
+                        session, select(Event), params, RepresentEvent, (Event.id,)
+                    ),
+                    repeat=args.repeat,
+                )
+                rows.append((mode, page, f"{latency:.2f}"))
+
+    engine.dispose()
+
+    print_table(("mode", "page", "median ms"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Compare entity loading and column projection for one page of events.
+
+Run with ``python -m benchmarks.pagination_projection_benchmark``; it seeds a
+scratch ``<DATABASE_NAME>_benchmark`` database on the configured Postgres server.
+"""
+
+import argparse
+import tracemalloc
+from typing import Callable
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.events.models import Event
+from app.events.schemas import RepresentEvent
+from app.pagination.dependencies import pagination_params
+from app.pagination.services import paginate_query
+
+from .utils import create_benchmark_database, median_ms, print_table
+
+
+def seed(session: Session, events_count: int, description_size: int) -> None:
+    session.execute(
+        text(
+            "INSERT INTO users (id, username, hashed_password, role) "
+            "VALUES (1, 'organizer', 'hash', 'ORGANIZER')"
+        )
+    )
+    session.execute(
+        text(
+            "INSERT INTO events "
+            "(title, description, price, max_capacity, event_date, organizer_id) "
+            "SELECT 'Event ' || n, repeat('x', :description_size), n % 1000, 100, "
+            "now() + n * interval '1 minute', 1 "
+            "FROM generate_series(1, :events_count) AS n"
+        ),
+        {"events_count": events_count, "description_size": description_size},
+    )
+    session.commit()
+    session.execute(text("ANALYZE"))
+
+
+def peak_kib(fn: Callable[[], object]) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=10_000)
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--description-size", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_benchmark_database()
+    rows = []
+
+    with Session(engine) as session:
+        seed(session, args.events, args.description_size)
+
+        def _entities() -> list[RepresentEvent]:
+            # the pre-projection path: whole rows loaded as ORM objects
+            events = session.scalars(
+                select(Event).order_by(Event.id.desc()).limit(args.per_page + 1)
+            ).all()
+            items = [RepresentEvent.model_validate(event) for event in events]
+            session.expunge_all()
+            return items
+
+        def _projection() -> object:
+            return paginate_query(
+                session,
+                select(Event),
+                pagination_params(per_page=args.per_page),
+                RepresentEvent,
+                (Event.id,),
+            )
+
+        for mode, fn in (("entities", _entities), ("projection", _projection)):
+            latency = median_ms(fn, repeat=args.repeat)
+            rows.append((mode, f"{latency:.2f}", f"{peak_kib(fn):.0f}"))
+
+    engine.dispose()
+
+    print_table(("mode", "median ms", "peak KiB"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Compare index size and lookup latency of raw JWT and SHA-256 digest keys.
+
+Run with ``python -m benchmarks.revoked_tokens_benchmark --rows 10000000``; it
+seeds a scratch ``<DATABASE_NAME>_benchmark`` database on the configured
+Postgres server.
+"""
+
+import argparse
+import hashlib
+import random
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.auth.utils import token_digest
+
+from .utils import create_benchmark_database, median_ms, print_table
+
+# refresh tokens embed the access token, 12 md5 hex strings is roughly their length
+TOKEN_SQL = "repeat(md5(n::text), 12)"
+# far enough out that no seeded row is purged while the benchmark runs
+EXPIRES_AT_SQL = "now() + interval '1 day'"
+
+
+def token(n: int) -> str:
+    return hashlib.md5(str(n).encode()).hexdigest() * 12
+
+
+def seed(session: Session, rows: int) -> None:
+    session.execute(
+        text(
+            "CREATE TABLE revoked_tokens_raw ("
+            "id serial PRIMARY KEY, hash varchar NOT NULL, "
+            "revoked_at timestamp NOT NULL, expires_at timestamp NOT NULL"
+            ")"
+        )
+    )
+    session.execute(
+        text(
+            "INSERT INTO revoked_tokens_raw (hash, revoked_at, expires_at) "
+            f"SELECT {TOKEN_SQL}, now(), {EXPIRES_AT_SQL} "
+            "FROM generate_series(1, :rows) AS n"
+        ),
+        {"rows": rows},
+    )
+    session.execute(
+        text(
+            "CREATE UNIQUE INDEX ix_revoked_tokens_raw_hash ON revoked_tokens_raw (hash)"
+        )
+    )
+    session.execute(
+        text(
+            "INSERT INTO revoked_tokens (hash, revoked_at, expires_at) "
+            f"SELECT sha256(convert_to({TOKEN_SQL}, 'UTF8')), now(), {EXPIRES_AT_SQL} "
+            "FROM generate_series(1, :rows) AS n"
+        ),
+        {"rows": rows},
+    )
+    session.commit()
+    session.execute(text("ANALYZE"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=1_000)
+    args = parser.parse_args()
+
+    engine = create_benchmark_database()
+
+    with Session(engine) as session:
+        seed(session, args.rows)
+
+        rows = []
+        for table, index, key in (
+            ("revoked_tokens_raw", "ix_revoked_tokens_raw_hash", token),
+            (
+                "revoked_tokens",
+                "ix_revoked_tokens_hash",
+                lambda n: token_digest(token(n)),
+            ),
+        ):
+            index_size = session.scalar(
+                text("SELECT pg_size_pretty(pg_relation_size(:index))"),
+                {"index": index},
+            )
+            lookup = text(f"SELECT id FROM {table} WHERE hash = :hash")
+            latency = median_ms(
+                lambda: session.execute(
+                    lookup, {"hash": key(random.randint(1, args.rows))}
+                ).scalar_one(),
+                repeat=args.repeat,
+            )
+            rows.append((table, index_size, f"{latency:.3f}"))
+
+    engine.dispose()
+
+    print_table(("table", "index size", "median lookup ms"), rows)
+
+
+if __name__ == "__main__":
+    main()
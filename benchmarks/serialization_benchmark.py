@@ -0,0 +1,115 @@
+"""Compare FastAPI's response_model serialization with RepresentationAdapter.
+
+Run with ``python -m benchmarks.serialization_benchmark``; it only builds
+objects in memory and needs no database.
+"""
+
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.auth.schemas import RepresentJWT
+from app.events.models import Event
+from app.events.schemas import RepresentEvent, RepresentEventDetails
+from app.pagination.schemas import PaginatedResponse
+from app.responses import RepresentationAdapter
+from app.users.enums import UserRole
+from app.users.models import User
+from app.users.schemas import RepresentUser
+
+from .utils import median_ms, print_table
+
+
+def event(n: int) -> Event:
+    return Event(
+        id=n,
+        title=f"Event {n}",
+        description="description " * 20,
+        price=n % 1000,
+        max_capacity=100,
+        event_date=datetime.now() + timedelta(minutes=n),
+        organizer_id=1,
+    )
+
+
+def cases(per_page: int) -> list[tuple[str, Any, Any]]:
+    now = datetime.now()
+    page = PaginatedResponse[RepresentEvent](
+        page=1,
+        per_page=per_page,
+        items=[RepresentEvent.model_validate(event(n)) for n in range(per_page)],
+        next_cursor="eyJ2YWx1ZXMiOiBbMV0sICJkaXJlY3Rpb24iOiAibmV4dCJ9",
+    )
+    jwt = RepresentJWT(
+        access_token="a" * 200,
+        access_token_expires_at=now,
+        refresh_token="r" * 400,
+        refresh_token_expires_at=now,
+    )
+    user = User(id=1, username="organizer", role=UserRole.ORGANIZER)
+
+    return [
+        (f"PaginatedResponse[RepresentEvent] x{per_page}", page.__class__, page),
+        ("RepresentEventDetails", RepresentEventDetails, event(1)),
+        ("RepresentUser", RepresentUser, user),
+        ("RepresentJWT", RepresentJWT, jwt),
+    ]
+
+
+async def fastapi_response(field: Any, content: Any) -> JSONResponse:
+    # what a route with response_model does with the value it returns
+    return JSONResponse(await serialize_response(field=field, response_content=content))
+
+
+async def adapter_response(
+    representation: RepresentationAdapter, content: Any
+) -> Response:
+    # awaited as well so both sides pay the same event loop overhead
+    return representation.response(content)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=1_000)
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    rows = []
+
+    for name, representer, content in cases(args.per_page):
+        field = create_model_field(
+            name="Response", type_=representer, mode="serialization"
+        )
+        representation = RepresentationAdapter(representer)
+
+        response_model_ms = median_ms(
+            lambda: loop.run_until_complete(fastapi_response(field, content)),
+            repeat=args.repeat,
+        )
+        adapter_ms = median_ms(
+            lambda: loop.run_until_complete(adapter_response(representation, content)),
+            repeat=args.repeat,
+        )
+        rows.append(
+            (
+                name,
+                f"{response_model_ms * 1000:.1f}",
+                f"{adapter_ms * 1000:.1f}",
+                f"{response_model_ms / adapter_ms:.1f}x",
+            )
+        )
+
+    loop.close()
+
+    print_table(("response model", "response_model µs", "adapter µs", "speedup"), rows)
+
+
+if __name__ == "__main__":
+    main()
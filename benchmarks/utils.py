@@ -0,0 +1,53 @@
+import statistics
+import time
+from typing import Any, Callable
+
+from sqlalchemy import Engine, create_engine, text
+
+from app.database.config import settings
+from app.database.model import Base
+from app.users import models as user_models  # noqa: F401
+from app.auth import models as auth_models  # noqa: F401
+from app.events import models as event_models  # noqa: F401
+
+BENCHMARK_DB_NAME = f"{settings.DATABASE_NAME}_benchmark"
+
+SERVER_URL = "postgresql+psycopg2://{user}:{password}@{host}:{port}".format(
+    user=settings.DATABASE_USER,
+    password=settings.DATABASE_PASSWORD,
+    host=settings.DATABASE_HOST,
+    port=settings.DATABASE_PORT,
+)
+
+
+def create_benchmark_database(**engine_options: Any) -> Engine:
+    server_engine = create_engine(SERVER_URL, isolation_level="AUTOCOMMIT")
+    with server_engine.connect() as connection:
+        connection.execute(text(f"DROP DATABASE IF EXISTS {BENCHMARK_DB_NAME}"))
+        connection.execute(text(f"CREATE DATABASE {BENCHMARK_DB_NAME}"))
+    server_engine.dispose()
+
+    engine = create_engine(f"{SERVER_URL}/{BENCHMARK_DB_NAME}", **engine_options)
+    Base.metadata.create_all(engine)
+
+    return engine
+
+
+def median_ms(fn: Callable[[], object], repeat: int = 50) -> float:
+    fn()  # warm up caches and the connection
+
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started_at) * 1000)
+
+    return statistics.median(timings)
+
+
+def print_table(header: tuple[str, ...], rows: list[tuple]) -> None:
+    widths = [
+        max(len(str(row[i])) for row in [header, *rows]) for i in range(len(header))
+    ]
+    for row in [header, *rows]:
+        print("  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)))